@@ -0,0 +1,166 @@
+"""
+Extraction Benchmark - PDF Text Extraction Backend Comparison
+
+This script generates sample documents with documents.py and measures the
+throughput of every extraction backend available in sorter.py, together
+with how closely each backend's output matches pdfplumber's.
+
+Usage:
+    python benchmarks/extraction.py --documents 300 --repeat 3
+    python benchmarks/extraction.py --json > extraction.json
+"""
+
+import argparse
+import difflib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import documents
+import sorter
+
+REFERENCE_BACKEND = "pdfplumber"
+
+
+def normalize(text: str) -> str:
+    """Collapse whitespace so backends differing only in spacing compare equal."""
+    return " ".join(text.split())
+
+
+def generate_corpus(directory: str, count: int) -> List[str]:
+    """
+    Generate sample PDFs into a directory.
+
+    Args:
+        directory: Target directory.
+        count: Total number of documents, split across the three types.
+
+    Returns:
+        Sorted paths of the generated PDFs.
+    """
+    documents.OUTPUT_DIR = directory
+    per_type = max(1, count // 3)
+    documents.generate_sample_documents(
+        num_invoices=count - 2 * per_type,
+        num_protocols=per_type,
+        num_reports=per_type
+    )
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory) if name.endswith('.pdf')
+    )
+
+
+def benchmark_backend(backend: str, paths: List[str], repeat: int) -> Dict:
+    """
+    Time one backend over the corpus, keeping the best of several runs.
+
+    Args:
+        backend: Extraction backend name.
+        paths: PDF files to extract.
+        repeat: Number of timed runs.
+
+    Returns:
+        Timing figures and the extracted text of each file.
+    """
+    best = float("inf")
+    texts: Dict[str, str] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            texts[path] = sorter.extract_text_from_pdf(path, backend)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        'backend': backend,
+        'seconds': best,
+        'docs_per_sec': len(paths) / best if best else 0.0,
+        'texts': texts,
+    }
+
+
+def compare_outputs(reference: Dict[str, str], candidate: Dict[str, str]) -> Dict:
+    """
+    Compare a backend's output with the reference backend's.
+
+    Args:
+        reference: Extracted text per path from the reference backend.
+        candidate: Extracted text per path from the compared backend.
+
+    Returns:
+        Share of documents with identical (whitespace-normalized) text and
+        the mean character-level similarity ratio.
+    """
+    identical = 0
+    similarity = 0.0
+    for path, expected in reference.items():
+        expected = normalize(expected)
+        actual = normalize(candidate.get(path, ""))
+        identical += expected == actual
+        similarity += difflib.SequenceMatcher(None, expected, actual).ratio()
+
+    total = len(reference) or 1
+    return {'identical': identical / total, 'similarity': similarity / total}
+
+
+def main() -> None:
+    """Run the benchmark and print a table or JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=90, help="number of PDFs to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per backend")
+    parser.add_argument(
+        "--backends", nargs="+", default=list(sorter.PAGE_BACKENDS),
+        help="backends to compare"
+    )
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = generate_corpus(tmpdir, args.documents)
+
+        backends = [REFERENCE_BACKEND] + [b for b in args.backends if b != REFERENCE_BACKEND]
+        runs = {}
+        for backend in backends:
+            if backend == "pypdfium2" and sorter.pypdfium2 is None:
+                print(f"Skipping {backend}: not installed", file=sys.stderr)
+                continue
+            runs[backend] = benchmark_backend(backend, paths, args.repeat)
+
+    reference = runs[REFERENCE_BACKEND]
+    report = []
+    for backend, run in runs.items():
+        entry = {
+            'backend': backend,
+            'documents': len(paths),
+            'seconds': round(run['seconds'], 4),
+            'docs_per_sec': round(run['docs_per_sec'], 1),
+            'speedup': round(reference['seconds'] / run['seconds'], 2),
+        }
+        entry.update({
+            key: round(value, 4)
+            for key, value in compare_outputs(reference['texts'], run['texts']).items()
+        })
+        report.append(entry)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'backend':<12} {'docs/s':>9} {'speedup':>8} {'identical':>10} {'similarity':>11}")
+    for entry in report:
+        print(
+            f"{entry['backend']:<12} {entry['docs_per_sec']:>9.1f} {entry['speedup']:>7.2f}x "
+            f"{entry['identical']:>9.0%} {entry['similarity']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Model Benchmark - Zero-Shot Model Load Time and Latency Comparison
+
+This script classifies documents generated by documents.py with several
+zero-shot models and reports how long each model takes to load, its
+per-document latency, and how often it agrees with the first model.
+
+Usage:
+    python benchmarks/models.py --models facebook/bart-large-mnli \\
+        valhalla/distilbart-mnli-12-1 --documents 30
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sorter
+from extraction import generate_corpus
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value below which the given fraction of values fall."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def benchmark_model(model: str, engine: str, texts: List[str]) -> Dict:
+    """
+    Load one model and classify every text with it.
+
+    Args:
+        model: Hub id or local directory of the zero-shot model.
+        engine: Inference engine passed to load_classifier.
+        texts: Extracted document texts.
+
+    Returns:
+        Load time, latency figures and the predicted label of each text.
+    """
+    sorter.MODEL_NAME = model
+
+    start = time.perf_counter()
+    classifier = sorter.load_classifier(engine)
+    load_seconds = time.perf_counter() - start
+
+    latencies = []
+    labels = []
+    for text in texts:
+        start = time.perf_counter()
+        result = classifier(text, sorter.CANDIDATE_LABELS)
+        latencies.append(time.perf_counter() - start)
+        labels.append(result['labels'][0])
+
+    return {
+        'model': model,
+        'engine': engine,
+        'load_seconds': round(load_seconds, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'docs_per_sec': round(len(texts) / sum(latencies), 2),
+        'labels': labels,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a table or JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--models", nargs="+", default=[sorter.DEFAULT_MODEL],
+        help="hub ids or local directories; the first one is the reference"
+    )
+    parser.add_argument("--engine", default=sorter.INFERENCE_ENGINE, help="inference engine")
+    parser.add_argument("--documents", type=int, default=30, help="number of PDFs to generate")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        texts = [sorter.extract_text_from_pdf(path) for path in generate_corpus(tmpdir, args.documents)]
+    texts = [text for text in texts if text]
+
+    report = [benchmark_model(model, args.engine, texts) for model in args.models]
+
+    reference = report[0]['labels']
+    for entry in report:
+        labels = entry.pop('labels')
+        agreement = sum(a == b for a, b in zip(reference, labels)) / (len(labels) or 1)
+        entry['agreement'] = round(agreement, 3)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'model':<40} {'load s':>7} {'mean ms':>8} {'p95 ms':>8} {'docs/s':>7} {'agree':>6}")
+    for entry in report:
+        print(
+            f"{entry['model']:<40} {entry['load_seconds']:>7.2f} {entry['mean_ms']:>8.1f} "
+            f"{entry['p95_ms']:>8.1f} {entry['docs_per_sec']:>7.2f} {entry['agreement']:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
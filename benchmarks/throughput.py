@@ -0,0 +1,236 @@
+"""
+Throughput Benchmark - End-to-End process_files Performance
+
+This script generates sample documents with documents.py, sorts them with
+sorter.process_files, and reports documents per second, p50/p95/p99
+latency of the extract, classify and move stages, and the peak resident
+set size of the process and of its largest child. A stub classifier
+isolates the pipeline from model cost; pass --classifier model to run the
+configured zero-shot model instead.
+
+Usage:
+    python benchmarks/throughput.py --documents 300
+    python benchmarks/throughput.py --pipeline --extract-workers 4 --json > run.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sorter
+from extraction import generate_corpus
+from models import percentile
+
+STAGES = ("extract", "classify", "move")
+
+# Markers the stub classifier looks for, as printed by documents.py
+STUB_KEYWORDS = {
+    "Invoice": "фактура",
+    "Protocol": "протокол",
+    "Report": "отчет",
+}
+
+
+class StubClassifier:
+    """Zero-shot-compatible classifier that answers from keywords instantly."""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Create the stub.
+
+        Args:
+            latency: Seconds to sleep per classified text, to simulate a model.
+        """
+        self.latency = latency
+
+    def __call__(self, sequences, candidate_labels, **kwargs):
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        results = []
+        for text in texts:
+            if self.latency:
+                time.sleep(self.latency)
+            lowered = text.lower()
+            best = next(
+                (label for label in candidate_labels
+                 if STUB_KEYWORDS.get(label, label.lower()) in lowered),
+                candidate_labels[0]
+            )
+            others = [label for label in candidate_labels if label != best]
+            results.append({
+                'sequence': text,
+                'labels': [best] + others,
+                'scores': [0.9] + [0.1 / max(1, len(others))] * len(others),
+            })
+        return results[0] if single else results
+
+
+def summarize(latencies: List[float]) -> Dict:
+    """Return the count, mean and p50/p95/p99 of stage latencies in milliseconds."""
+    if not latencies:
+        return {'count': 0}
+    return {
+        'count': len(latencies),
+        'mean_ms': round(1000 * sum(latencies) / len(latencies), 3),
+        'p50_ms': round(1000 * percentile(latencies, 0.50), 3),
+        'p95_ms': round(1000 * percentile(latencies, 0.95), 3),
+        'p99_ms': round(1000 * percentile(latencies, 0.99), 3),
+    }
+
+
+def peak_rss_mb() -> Dict[str, float]:
+    """
+    Return the peak resident set size of this process and of its children.
+
+    The children figure is the largest peak of any waited-for subprocess,
+    extraction worker or not; a forked child starts out sharing the
+    parent's pages, so it is not memory added by extraction workers.
+    """
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    scale = 1 / 1024 if sys.platform != "darwin" else 1 / (1024 * 1024)
+    return {
+        'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale, 1),
+    }
+
+
+def run_benchmark(input_dir: str, output_dir: str, classifier) -> Dict:
+    """
+    Sort every PDF in input_dir once, timing each stage.
+
+    Args:
+        input_dir: Directory holding the generated PDFs.
+        output_dir: Archive directory for the sorted files.
+        classifier: Classifier passed to process_files.
+
+    Returns:
+        Processed count, wall time, throughput and per-stage latencies.
+    """
+    latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    record_extraction = sorter.record_extraction
+    move_file = sorter.move_file_to_correct_directory
+
+    def timed_record_extraction(file_path, text, seconds):
+        latencies['extract'].append(seconds)
+        return record_extraction(file_path, text, seconds)
+
+    def timed_classifier(texts, labels, **kwargs):
+        start = time.perf_counter()
+        result = classifier(texts, labels, **kwargs)
+        elapsed = time.perf_counter() - start
+        count = 1 if isinstance(texts, str) else max(1, len(texts))
+        # One entry per document, so batching shows up as per-document cost
+        latencies['classify'].extend([elapsed / count] * count)
+        return result
+
+    def timed_move(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return move_file(*args, **kwargs)
+        finally:
+            latencies['move'].append(time.perf_counter() - start)
+
+    sorter.INPUT_DIR = input_dir
+    sorter.OUTPUT_DIR = output_dir
+    sorter.record_extraction = timed_record_extraction
+    sorter.move_file_to_correct_directory = timed_move
+    try:
+        start = time.perf_counter()
+        processed = sorter.process_files(timed_classifier)
+        seconds = time.perf_counter() - start
+    finally:
+        sorter.record_extraction = record_extraction
+        sorter.move_file_to_correct_directory = move_file
+        # Reap the extraction workers so their peak RSS is counted
+        sorter.shutdown_extract_executor()
+
+    return {
+        'processed': processed,
+        'seconds': round(seconds, 4),
+        'docs_per_sec': round(processed / seconds, 1) if seconds else 0.0,
+        'stages': {stage: summarize(values) for stage, values in latencies.items()},
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a summary or JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=90, help="number of PDFs to generate")
+    parser.add_argument(
+        "--classifier", choices=("stub", "model"), default="stub",
+        help="stub keyword classifier or the configured zero-shot model"
+    )
+    parser.add_argument(
+        "--stub-latency", type=float, default=0.0,
+        help="seconds the stub sleeps per document"
+    )
+    parser.add_argument("--pipeline", action="store_true", help="use the staged pipeline")
+    parser.add_argument("--extract-workers", type=int, default=sorter.EXTRACT_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=sorter.BATCH_SIZE)
+    parser.add_argument("--backend", default=sorter.EXTRACT_BACKEND, help="extraction backend")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    sorter.PIPELINE_ENABLED = args.pipeline
+    sorter.EXTRACT_WORKERS = max(1, args.extract_workers)
+    sorter.BATCH_SIZE = max(1, args.batch_size)
+    sorter.EXTRACT_BACKEND = args.backend
+    sorter.LAZY_DIRECTORIES = True
+    sorter.display_sorting_progress = lambda *args: None
+
+    if args.classifier == "model":
+        classifier = sorter.load_classifier()
+    else:
+        classifier = StubClassifier(args.stub_latency)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_dir = os.path.join(tmpdir, "incoming")
+        os.makedirs(input_dir)
+        generate_corpus(input_dir, args.documents)
+        result = run_benchmark(input_dir, os.path.join(tmpdir, "sorted"), classifier)
+
+    report = {
+        'documents': args.documents,
+        'config': {
+            'classifier': args.classifier,
+            'engine': sorter.INFERENCE_ENGINE if args.classifier == "model" else "stub",
+            'pipeline': sorter.PIPELINE_ENABLED,
+            'extract_workers': sorter.EXTRACT_WORKERS,
+            'batch_size': sorter.BATCH_SIZE,
+            'backend': sorter.EXTRACT_BACKEND,
+        },
+        **result,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"{report['processed']}/{report['documents']} documents in {report['seconds']:.2f}s "
+        f"({report['docs_per_sec']:.1f} docs/s), peak RSS "
+        f"{report['peak_rss_mb']['self']:.0f} MB, largest child "
+        f"{report['peak_rss_mb']['children']:.0f} MB"
+    )
+    print(f"{'stage':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, stats in report['stages'].items():
+        if stats['count']:
+            print(
+                f"{stage:<10} {stats['count']:>6} {stats['p50_ms']:>9.2f} "
+                f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
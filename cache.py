@@ -0,0 +1,146 @@
+"""
+Classification Cache - Persistent Store of Classifier Results
+
+This module keeps zero-shot classification results in a SQLite database
+keyed by a content hash, so documents that are dropped again (or whose
+processing crashed before the move) do not pay for another model call.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ClassificationCache:
+    """Size-bounded, least-recently-used SQLite cache of classifier results."""
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file path (":memory:" for a private cache).
+            max_entries: Number of results kept before the least recently
+                used ones are evicted.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+            sqlite3.Error: If the database cannot be opened.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)"
+        )
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @staticmethod
+    def make_key(text: str, labels: List[str], model: str = "") -> str:
+        """
+        Build the cache key for a text classified against a label set.
+
+        Args:
+            text: Extracted document text.
+            labels: Candidate labels the text is classified against.
+            model: Identifier of the model/engine producing the scores.
+
+        Returns:
+            Hex SHA-256 digest of the model, the labels and the text.
+        """
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update("\x1f".join(labels).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached result and mark it as recently used.
+
+        Args:
+            key: Cache key from make_key.
+
+        Returns:
+            The cached result dict, or None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict) -> None:
+        """
+        Store a classifier result, evicting the oldest entries if needed.
+
+        Args:
+            key: Cache key from make_key.
+            result: Classifier output with 'labels' and 'scores'.
+        """
+        payload = json.dumps({
+            'labels': list(result['labels']),
+            'scores': [float(score) for score in result['scores']],
+        })
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO results (key, result, last_used) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            if cursor.rowcount > 0:
+                self._entries += 1
+            else:
+                self._conn.execute(
+                    "UPDATE results SET result = ?, last_used = ? WHERE key = ?",
+                    (payload, time.time(), key)
+                )
+
+            overflow = self._entries - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    "SELECT key FROM results ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self._entries -= overflow
+                logger.debug("Evicted %d cached classification(s)", overflow)
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': self._entries}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
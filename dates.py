@@ -0,0 +1,136 @@
+"""
+Document Dates - Find the Date a Document Refers To
+
+This module finds the date printed in a document's extracted text with
+precompiled regular expressions for the formats used in Bulgarian
+paperwork ("Дата: 15-06-2024", "15.06.2024 г.", "15 юни 2024") and ISO
+dates, and parses PDF date strings ("D:20240615...") from document
+metadata. The sorter files documents under this date rather than under the
+time they happened to be processed.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Month names in the nominative case, as written in dates ("15 юни 2024")
+BULGARIAN_MONTHS: Dict[str, int] = {
+    "януари": 1, "февруари": 2, "март": 3, "април": 4, "май": 5, "юни": 6,
+    "юли": 7, "август": 8, "септември": 9, "октомври": 10, "ноември": 11, "декември": 12,
+}
+
+_NUMERIC = r"(?P<day>\d{1,2})[-./](?P<month>\d{1,2})[-./](?P<year>\d{4})"
+
+# Named date formats, each a compiled pattern with day, month and year groups
+DATE_PATTERNS: Dict[str, Pattern] = {
+    # "Дата: 15-06-2024", the field printed by documents.py
+    'labeled': re.compile(r"\bдата\s*:\s*" + _NUMERIC, re.IGNORECASE),
+    # "15.06.2024 г.", "15-06-2024", "15/06/2024"
+    'numeric': re.compile(r"(?<!\d)" + _NUMERIC + r"(?!\d)"),
+    # "2024-06-15"
+    'iso': re.compile(r"(?<!\d)(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})(?!\d)"),
+    # "15 юни 2024 г." or "юни 2024" (the first of the month)
+    'month_name': re.compile(
+        r"(?<!\w)(?:(?P<day>\d{1,2})\s+)?(?P<month>" + "|".join(BULGARIAN_MONTHS) + r")"
+        r"\s+(?P<year>\d{4})(?!\d)",
+        re.IGNORECASE
+    ),
+}
+
+DEFAULT_PRECEDENCE: Tuple[str, ...] = ('labeled', 'numeric', 'iso', 'month_name')
+
+_PDF_DATE = re.compile(r"^(?:D:)?(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?")
+
+
+def parse_precedence(value: str) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated list of date format names.
+
+    Args:
+        value: Format names in order of preference, e.g. "iso,labeled".
+
+    Returns:
+        The format names.
+
+    Raises:
+        ValueError: If a name is not a key of DATE_PATTERNS.
+    """
+    names = tuple(name.strip().lower() for name in value.split(",") if name.strip())
+    unknown = [name for name in names if name not in DATE_PATTERNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown date format(s) {', '.join(unknown)}; "
+            f"choose from {', '.join(DATE_PATTERNS)}"
+        )
+    return names
+
+
+def _month_number(value: str) -> int:
+    return BULGARIAN_MONTHS.get(value.lower()) or int(value)
+
+
+def extract_date(
+    text: str,
+    precedence: Iterable[str] = DEFAULT_PRECEDENCE,
+    valid: Optional[Callable[[datetime], bool]] = None
+) -> Optional[datetime]:
+    """
+    Find the first valid date in a text.
+
+    Formats are tried in order of precedence; within a format, the earliest
+    match in the text that is a real calendar date wins.
+
+    Args:
+        text: Extracted document text.
+        precedence: Names of the formats to try (keys of DATE_PATTERNS).
+        valid: Optional extra check a date must pass (e.g. a year range).
+
+    Returns:
+        The date, or None if no format matches.
+    """
+    for name in precedence:
+        for match in DATE_PATTERNS[name].finditer(text):
+            try:
+                date = datetime(
+                    int(match.group('year')),
+                    _month_number(match.group('month')),
+                    int(match.group('day') or 1)
+                )
+            except ValueError:
+                continue  # e.g. 31.02.2024 or a month number above 12
+            if valid is None or valid(date):
+                return date
+    return None
+
+
+def parse_pdf_date(value) -> Optional[datetime]:
+    """
+    Parse a PDF date string such as "D:20240615093000+02'00'".
+
+    The time zone is ignored, since only the calendar date is used for filing.
+
+    Args:
+        value: Date string (or bytes) from the document information dictionary.
+
+    Returns:
+        The date, or None if the value is not a PDF date.
+    """
+    if isinstance(value, bytes):
+        value = value.decode('latin-1', errors='ignore')
+    if not isinstance(value, str):
+        return None
+
+    match = _PDF_DATE.match(value.strip())
+    if match is None:
+        return None
+    year, month, day, hour, minute, second = (
+        int(part) if part else default
+        for part, default in zip(match.groups(), (0, 1, 1, 0, 0, 0))
+    )
+    try:
+        return datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        return None
@@ -5,13 +5,19 @@ This module generates sample PDF documents (invoices, protocols, reports)
 for testing the Smart File Organizer.
 """
 
+import argparse
+import math
 import os
 import random
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 # Configure logging
@@ -24,6 +30,29 @@ logger = logging.getLogger(__name__)
 # Output directory for generated documents
 OUTPUT_DIR = "./incoming_documents"
 
+# TrueType fonts with Cyrillic glyphs, tried in order (DOCUMENTS_FONT first).
+# The standard Helvetica font has no Cyrillic, so text drawn with it cannot
+# be extracted again; it is only used when none of these exist.
+FONT_CANDIDATES: List[str] = [
+    path for path in (
+        os.environ.get("DOCUMENTS_FONT"),
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/Library/Fonts/Arial Unicode.ttf",
+        "C:\\Windows\\Fonts\\arial.ttf",
+    ) if path
+]
+FALLBACK_FONT = "Helvetica"
+_font_name: Optional[str] = None
+
+# Page layout in points
+LEFT_MARGIN = 100
+RIGHT_MARGIN = 72
+BOTTOM_MARGIN = 72
+BODY_FONT_SIZE = 11
+LINE_HEIGHT = 15
+
 # Sample document content (Bulgarian text)
 INVOICES: List[str] = [
     "Фактура за предоставените услуги по проект XYZ. Общо за плащане: 1500 лв.",
@@ -50,13 +79,43 @@ REPORTS: List[str] = [
     "Завършени етапи: основи, стени, покрив."
 ]
 
+# Document type, content pool and default share of a bulk corpus
+DOCUMENT_KINDS: List[Tuple[str, List[str], int]] = [
+    ("Фактура", INVOICES, 4),
+    ("Протокол", PROTOCOLS, 3),
+    ("Отчет", REPORTS, 3),
+]
+
+PAGE_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+# Column headers of the table printed on every page of each document type
+TABLE_HEADERS: Dict[str, List[str]] = {
+    "Фактура": ["№", "Описание", "Количество", "Ед. цена", "Сума"],
+    "Протокол": ["№", "Точка от дневния ред", "Отговорник", "Срок"],
+    "Отчет": ["№", "Показател", "Стойност", "Промяна"],
+}
+
+TABLE_ITEMS: List[str] = [
+    "Консултантски услуги", "Транспортни услуги", "Ремонт на офис",
+    "Софтуерен лиценз", "Обучение на персонала", "Маркетингова кампания",
+]
+
+PEOPLE: List[str] = ["Иван Петров", "Мария Георгиева", "Георги Иванов", "Елена Димитрова"]
 
-def generate_random_date(year: int) -> datetime:
+# Sentences grouped into one paragraph of generated content
+SENTENCES_PER_PARAGRAPH = 3
+
+# Documents created per process-pool task in bulk mode
+BULK_CHUNK_SIZE = 250
+
+
+def generate_random_date(year: int, rng: Optional[random.Random] = None) -> datetime:
     """
     Generate a random date within the specified year.
 
     Args:
         year: The year for which to generate a random date.
+        rng: Random generator to draw from (defaults to the random module).
 
     Returns:
         A datetime object with a random date in the specified year.
@@ -70,25 +129,94 @@ def generate_random_date(year: int) -> datetime:
     start_date = datetime(year, 1, 1)
     end_date = datetime(year, 12, 31)
     delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
+    random_days = (rng or random).randint(0, delta.days)
     random_date = start_date + timedelta(days=random_days)
     return random_date
 
 
+def document_font() -> str:
+    """
+    Register the first available Cyrillic TrueType font with ReportLab.
+
+    Returns:
+        The font name to draw with; FALLBACK_FONT if no candidate exists.
+    """
+    global _font_name
+    if _font_name is not None:
+        return _font_name
+
+    for path in FONT_CANDIDATES:
+        if not os.path.isfile(path):
+            continue
+        name = os.path.splitext(os.path.basename(path))[0].replace(" ", "")
+        try:
+            pdfmetrics.registerFont(TTFont(name, path))
+        except Exception as e:
+            logger.warning("Cannot load font %s: %s", path, e)
+            continue
+        _font_name = name
+        return _font_name
+
+    logger.warning(
+        "No Cyrillic TrueType font found (set DOCUMENTS_FONT); "
+        "text drawn with %s cannot be extracted.", FALLBACK_FONT
+    )
+    _font_name = FALLBACK_FONT
+    return _font_name
+
+
+def _draw_paragraph(c, text: str, y: float, font: str, width: float) -> float:
+    """Draw wrapped text from y downwards; return the y below it."""
+    for line in simpleSplit(text, font, BODY_FONT_SIZE, width):
+        if y < BOTTOM_MARGIN:
+            break
+        c.drawString(LEFT_MARGIN, y, line)
+        y -= LINE_HEIGHT
+    return y - LINE_HEIGHT / 2
+
+
+def _draw_table(c, rows: List[List[str]], y: float, font: str, width: float) -> float:
+    """Draw a ruled table, header row first, from y downwards; return the y below it."""
+    column_width = width / len(rows[0])
+    for index, row in enumerate(rows):
+        if y - LINE_HEIGHT < BOTTOM_MARGIN:
+            break
+        c.setFont(font, BODY_FONT_SIZE - 1)
+        for column, cell in enumerate(row):
+            lines = simpleSplit(cell, font, BODY_FONT_SIZE - 1, column_width - 6)
+            c.drawString(LEFT_MARGIN + column * column_width + 3, y - 11, lines[0] if lines else "")
+        if index == 0:
+            c.line(LEFT_MARGIN, y, LEFT_MARGIN + width, y)
+        y -= LINE_HEIGHT + 2
+        c.line(LEFT_MARGIN, y, LEFT_MARGIN + width, y)
+    c.setFont(font, BODY_FONT_SIZE)
+    return y - LINE_HEIGHT
+
+
 def create_pdf(
     doc_type: str,
     content: str,
     file_name: str,
-    date: datetime
+    date: datetime,
+    pages: int = 1,
+    output_dir: Optional[str] = None,
+    table: Optional[List[List[str]]] = None
 ) -> str:
     """
     Create a PDF document with the specified content.
 
+    The first page starts with the document header. Every page then carries
+    the content, wrapped into paragraphs (separated by blank lines), and the
+    table if one is given; whatever does not fit on a page is cut off.
+
     Args:
         doc_type: Type of document (e.g., "Фактура", "Протокол", "Отчет").
         content: The main content text for the document.
         file_name: Base name for the file (without extension).
         date: Date to include in the document.
+        pages: Number of pages.
+        output_dir: Directory to write to (defaults to OUTPUT_DIR).
+        table: Rows of a table to print on every page, header row first.
 
     Returns:
         The generated file name with date suffix.
@@ -97,11 +225,16 @@ def create_pdf(
         IOError: If the file cannot be created.
         OSError: If there are permission or disk space issues.
     """
-    file_path = os.path.join(OUTPUT_DIR, f"{file_name}.pdf")
+    file_path = os.path.join(output_dir or OUTPUT_DIR, f"{file_name}.pdf")
+
+    font = document_font()
+    body_width = letter[0] - LEFT_MARGIN - RIGHT_MARGIN
 
     try:
         c = canvas.Canvas(file_path, pagesize=letter)
-        c.setFont("Helvetica", 12)
+        c.setFont(font, 12)
+        c.setTitle(f"{doc_type} от {date.strftime('%d.%m.%Y')}")
+        c.setKeywords([doc_type])
 
         # Extract month and week information
         month = date.strftime("%B")
@@ -109,13 +242,27 @@ def create_pdf(
 
         # Add document information
         c.drawString(100, 750, f"Документ: {doc_type}")
-        c.drawString(100, 730, f"Съдържание: {content[:80]}...")  # Truncate long content
+        summary = " ".join(content.split())[:80]  # Truncate long content
+        c.drawString(100, 730, f"Съдържание: {summary}...")
         c.drawString(100, 710, f"Дата: {date.strftime('%d-%m-%Y')}")
         c.drawString(100, 690, f"Месец: {month}")
         c.drawString(100, 670, f"Седмица: {week_number}")
 
+        for page in range(1, pages + 1):
+            if page > 1:
+                c.showPage()
+            c.setFont(font, BODY_FONT_SIZE)
+            y = 640 if page == 1 else 750
+            if pages > 1:
+                c.drawString(LEFT_MARGIN, y, f"Страница {page} от {pages}")
+                y -= 2 * LINE_HEIGHT
+            for paragraph in content.split("\n\n"):
+                y = _draw_paragraph(c, paragraph, y, font, body_width)
+            if table:
+                y = _draw_table(c, table, y, font, body_width)
+
         c.save()
-        logger.info("Created document: %s", file_path)
+        logger.debug("Created document: %s", file_path)
 
     except (IOError, OSError) as e:
         logger.error("Failed to create PDF %s: %s", file_path, e)
@@ -197,11 +344,216 @@ def generate_sample_documents(
     return total
 
 
+def sample_page_count(
+    rng: random.Random,
+    distribution: str = "fixed",
+    min_pages: int = 1,
+    max_pages: int = 1
+) -> int:
+    """
+    Draw a page count from a distribution.
+
+    Args:
+        rng: Random generator to draw from.
+        distribution: "fixed" (always min_pages), "uniform" (any count in
+            range equally likely) or "lognormal" (mostly short documents
+            with a long tail, median min_pages).
+        min_pages: Smallest page count.
+        max_pages: Largest page count.
+
+    Returns:
+        A page count between min_pages and max_pages.
+
+    Raises:
+        ValueError: If the distribution is unknown or the range is invalid.
+    """
+    if min_pages < 1 or max_pages < min_pages:
+        raise ValueError(f"Invalid page range: {min_pages}-{max_pages}")
+
+    if distribution == "fixed":
+        return min_pages
+    if distribution == "uniform":
+        return rng.randint(min_pages, max_pages)
+    if distribution == "lognormal":
+        pages = round(rng.lognormvariate(math.log(min_pages), 1.0))
+        return max(min_pages, min(max_pages, pages))
+    raise ValueError(f"Unknown page distribution: {distribution}")
+
+
+def generate_table_rows(doc_type: str, rng: random.Random, rows: int) -> List[List[str]]:
+    """
+    Generate a table matching a document type.
+
+    Args:
+        doc_type: Type of document (a key of TABLE_HEADERS).
+        rng: Random generator to draw from.
+        rows: Number of rows below the header.
+
+    Returns:
+        The header row followed by the generated rows.
+    """
+    table = [TABLE_HEADERS[doc_type]]
+    for number in range(1, rows + 1):
+        item = rng.choice(TABLE_ITEMS)
+        if doc_type == "Фактура":
+            quantity, price = rng.randint(1, 20), rng.randint(10, 500)
+            row = [item, str(quantity), f"{price:.2f} лв.", f"{quantity * price:.2f} лв."]
+        elif doc_type == "Протокол":
+            row = [item, rng.choice(PEOPLE), f"{rng.randint(1, 30)} дни"]
+        else:
+            row = [item, f"{rng.randint(1, 999) * 1000} лв.", f"{rng.uniform(-20, 20):+.1f}%"]
+        table.append([str(number)] + row)
+    return table
+
+
+def plan_document(
+    index: int,
+    seed: int = 0,
+    year: int = 2024,
+    page_distribution: str = "fixed",
+    min_pages: int = 1,
+    max_pages: int = 1,
+    min_sentences: int = 1,
+    max_sentences: int = 1,
+    table_rows: int = 0
+) -> Dict:
+    """
+    Choose the type, content, date and size of one bulk document.
+
+    Each document draws from its own generator seeded with the pair
+    "seed:index", so a corpus is reproducible however it is split across
+    worker processes, and corpora of different seeds do not overlap.
+
+    Args:
+        index: Position of the document in the corpus.
+        seed: Seed of the corpus.
+        year: Year for random dates.
+        page_distribution: Distribution of page counts (see sample_page_count).
+        min_pages: Smallest page count.
+        max_pages: Largest page count.
+        min_sentences: Fewest content sentences per page.
+        max_sentences: Most content sentences per page.
+        table_rows: Rows of the table printed on every page (0 for none).
+
+    Returns:
+        Keyword arguments for create_pdf.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    doc_type, pool, _ = rng.choices(
+        DOCUMENT_KINDS, weights=[weight for _, _, weight in DOCUMENT_KINDS]
+    )[0]
+    date = generate_random_date(year, rng)
+    count = rng.randint(min_sentences, max(min_sentences, max_sentences))
+    sentences = [rng.choice(pool) for _ in range(count)]
+    paragraphs = [
+        " ".join(sentences[start:start + SENTENCES_PER_PARAGRAPH])
+        for start in range(0, count, SENTENCES_PER_PARAGRAPH)
+    ]
+    return {
+        'doc_type': doc_type,
+        'content': "\n\n".join(paragraphs),
+        'file_name': f"{doc_type}_{date.strftime('%Y-%m-%d')}_{index:06d}",
+        'date': date,
+        'pages': sample_page_count(rng, page_distribution, min_pages, max_pages),
+        'table': generate_table_rows(doc_type, rng, table_rows) if table_rows else None,
+    }
+
+
+def _create_documents(start: int, stop: int, output_dir: str, options: Dict) -> int:
+    """Create the bulk documents with indexes in [start, stop)."""
+    for index in range(start, stop):
+        create_pdf(**plan_document(index, **options), output_dir=output_dir)
+    return stop - start
+
+
+def generate_bulk_documents(
+    count: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    **options
+) -> int:
+    """
+    Generate a large, reproducible corpus on a process pool.
+
+    Args:
+        count: Number of documents to generate.
+        seed: Seed of the corpus; the same seed yields the same documents.
+        workers: Number of worker processes (defaults to the CPU count);
+            1 generates in this process.
+        **options: Year, page and size distribution passed to plan_document.
+
+    Returns:
+        Total number of documents generated.
+    """
+    setup_output_directory()
+    options = dict(options, seed=seed)
+    workers = workers or os.cpu_count() or 1
+    chunks = [
+        (start, min(start + BULK_CHUNK_SIZE, count))
+        for start in range(0, count, BULK_CHUNK_SIZE)
+    ]
+
+    total = 0
+    if workers == 1:
+        for start, stop in chunks:
+            total += _create_documents(start, stop, OUTPUT_DIR, options)
+            logger.info("Generated %d/%d documents", total, count)
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_create_documents, start, stop, OUTPUT_DIR, options)
+            for start, stop in chunks
+        ]
+        for future in futures:
+            total += future.result()
+            logger.info("Generated %d/%d documents", total, count)
+    return total
+
+
 def main() -> None:
     """Main entry point for document generation."""
+    global OUTPUT_DIR
+
+    parser = argparse.ArgumentParser(description="Generate sample PDF documents.")
+    parser.add_argument(
+        "--count", type=int,
+        help="generate this many documents in bulk mode (default: a small sample set)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the bulk corpus")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--year", type=int, default=2024, help="year of the document dates")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="output directory")
+    parser.add_argument("--pages", choices=PAGE_DISTRIBUTIONS, default="fixed",
+                        help="page count distribution")
+    parser.add_argument("--min-pages", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=1)
+    parser.add_argument("--min-sentences", type=int, default=1,
+                        help="fewest content sentences per page")
+    parser.add_argument("--max-sentences", type=int, default=1,
+                        help="most content sentences per page")
+    parser.add_argument("--table-rows", type=int, default=0,
+                        help="rows of the table on every page (0 for none)")
+    args = parser.parse_args()
+    OUTPUT_DIR = args.output
+
     logger.info("Starting document generation...")
 
-    total = generate_sample_documents()
+    if args.count is None:
+        total = generate_sample_documents(year=args.year)
+    else:
+        total = generate_bulk_documents(
+            args.count,
+            seed=args.seed,
+            workers=args.workers,
+            year=args.year,
+            page_distribution=args.pages,
+            min_pages=args.min_pages,
+            max_pages=max(args.min_pages, args.max_pages),
+            min_sentences=args.min_sentences,
+            max_sentences=args.max_sentences,
+            table_rows=args.table_rows,
+        )
 
     logger.info(
         "PDF documents created in '%s'. Total: %d",
@@ -0,0 +1,123 @@
+"""
+Embedding Classifier - Label Prototype Classification
+
+This module classifies documents by embedding them once and comparing the
+embedding with cached prototype embeddings of each candidate label. The
+prototypes come from label descriptions or from example documents, so the
+cost per document stays nearly constant as the label set grows.
+"""
+
+import logging
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingClassifier:
+    """Zero-shot-compatible classifier backed by a sentence embedding model."""
+
+    def __init__(
+        self,
+        encoder,
+        label_descriptions: Optional[Dict[str, str]] = None,
+        label_examples: Optional[Dict[str, List[str]]] = None,
+        temperature: float = 0.05
+    ):
+        """
+        Create the classifier.
+
+        Args:
+            encoder: Object with a sentence-transformers style
+                ``encode(texts, batch_size=..., normalize_embeddings=True)``.
+            label_descriptions: Text describing each label. Labels without
+                a description are embedded by name.
+            label_examples: Example document texts per label. When present
+                they take precedence over the description.
+            temperature: Softmax temperature turning cosine similarities
+                into scores; lower values give more confident scores.
+
+        Raises:
+            ValueError: If temperature is not positive.
+        """
+        if temperature <= 0:
+            raise ValueError(f"temperature must be positive: {temperature}")
+
+        self.encoder = encoder
+        self.label_descriptions = label_descriptions or {}
+        self.label_examples = label_examples or {}
+        self.temperature = temperature
+        self._prototypes: Dict[str, np.ndarray] = {}
+
+    def prototype(self, label: str) -> np.ndarray:
+        """
+        Return the unit-length prototype embedding of a label.
+
+        Prototypes are computed once and cached until clear_prototypes is called.
+
+        Args:
+            label: Candidate label.
+
+        Returns:
+            The normalized mean embedding of the label's examples, or the
+            embedding of its description.
+        """
+        if label not in self._prototypes:
+            texts = self.label_examples.get(label) or [
+                self.label_descriptions.get(label, label)
+            ]
+            embeddings = np.asarray(self.encoder.encode(texts, normalize_embeddings=True))
+            mean = embeddings.mean(axis=0)
+            self._prototypes[label] = mean / (np.linalg.norm(mean) or 1.0)
+            logger.debug("Computed prototype for %s from %d text(s)", label, len(texts))
+        return self._prototypes[label]
+
+    def clear_prototypes(self) -> None:
+        """Forget cached prototypes, e.g. after label descriptions change."""
+        self._prototypes.clear()
+
+    def __call__(
+        self,
+        sequences: Union[str, List[str]],
+        candidate_labels: List[str],
+        batch_size: int = 32,
+        **kwargs
+    ) -> Union[Dict, List[Dict]]:
+        """
+        Classify one or more texts against the candidate labels.
+
+        Args:
+            sequences: A text or a list of texts.
+            candidate_labels: Labels to score.
+            batch_size: Encoder batch size.
+
+        Returns:
+            A dict (for a single text) or a list of dicts with 'sequence',
+            'labels' and 'scores', labels ordered from best to worst, in
+            the same shape as the transformers zero-shot pipeline.
+        """
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        if not texts:
+            return []
+
+        embeddings = np.asarray(
+            self.encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+        )
+        prototypes = np.stack([self.prototype(label) for label in candidate_labels])
+
+        logits = embeddings @ prototypes.T / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        results = []
+        for text, row in zip(texts, probabilities):
+            order = np.argsort(row)[::-1]
+            results.append({
+                'sequence': text,
+                'labels': [candidate_labels[i] for i in order],
+                'scores': [float(row[i]) for i in order],
+            })
+        return results[0] if single else results
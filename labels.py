@@ -0,0 +1,198 @@
+"""
+Label Registry - Single Source of Truth for Document Labels
+
+This module holds the candidate labels the classifier chooses from, the
+archive directory of each label and the description used for label
+prototypes. The registry can be loaded from a JSON file and reloaded at
+runtime; the lists and dicts it exposes are updated in place so every
+holder of a reference sees the new labels.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LabelSpec:
+    """One document label and where its documents are archived."""
+
+    def __init__(
+        self,
+        name: str,
+        directory: Optional[str] = None,
+        description: Optional[str] = None
+    ):
+        """
+        Describe a label.
+
+        Args:
+            name: Label offered to the classifier (e.g. "Invoice").
+            directory: Archive folder name (defaults to name + "s").
+            description: Text describing the label (defaults to name).
+
+        Raises:
+            ValueError: If the name is empty.
+        """
+        if not name:
+            raise ValueError("Label name must not be empty")
+
+        self.name = name
+        self.directory = directory or name + "s"
+        self.description = description or name
+
+    def __repr__(self) -> str:
+        return f"LabelSpec({self.name!r}, {self.directory!r})"
+
+
+def load_label_specs(path: str) -> List[LabelSpec]:
+    """
+    Read label definitions from a JSON file.
+
+    The file holds a list of objects with a "name" and optional
+    "directory" and "description".
+
+    Args:
+        path: Path to the JSON labels file.
+
+    Returns:
+        The label definitions, in file order.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid, non-empty label list.
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of labels")
+
+    specs = []
+    for entry in entries:
+        try:
+            specs.append(LabelSpec(
+                entry["name"], entry.get("directory"), entry.get("description")
+            ))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"{path}: invalid label {entry!r}") from e
+
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: duplicate label names")
+    return specs
+
+
+class LabelRegistry:
+    """Candidate labels, their archive directories and descriptions."""
+
+    def __init__(self, specs: List[LabelSpec], path: Optional[str] = None):
+        """
+        Create the registry.
+
+        Args:
+            specs: Initial label definitions.
+            path: JSON file the labels are reloaded from, if any.
+        """
+        self.path = path
+        self.version = 0
+        self._mtime: Optional[float] = None
+        self.names: List[str] = []
+        self.directories: List[str] = []
+        self.label_to_dir: Dict[str, str] = {}
+        self.descriptions: Dict[str, str] = {}
+        self._hypotheses: Dict[str, List[str]] = {}
+        self._encodings: Dict[Tuple[int, str], List] = {}
+        self._apply(specs)
+
+    @classmethod
+    def from_file(cls, path: str, defaults: List[LabelSpec]) -> "LabelRegistry":
+        """
+        Build a registry from a labels file, falling back to defaults.
+
+        Args:
+            path: JSON labels file.
+            defaults: Labels used if the file cannot be loaded.
+
+        Returns:
+            The registry, watching path for later reloads.
+        """
+        registry = cls(defaults, path)
+        registry.reload()
+        return registry
+
+    def _apply(self, specs: List[LabelSpec]) -> None:
+        self.names[:] = [spec.name for spec in specs]
+        self.directories[:] = list(dict.fromkeys(spec.directory for spec in specs))
+        self.label_to_dir.clear()
+        self.label_to_dir.update((spec.name, spec.directory) for spec in specs)
+        self.descriptions.clear()
+        self.descriptions.update((spec.name, spec.description) for spec in specs)
+        self._hypotheses.clear()
+        self._encodings.clear()
+        self.version += 1
+
+    def reload(self) -> bool:
+        """
+        Reload the labels file if it changed since it was last read.
+
+        Invalid files are logged and the current labels are kept.
+
+        Returns:
+            True if the labels were replaced.
+        """
+        if not self.path:
+            return False
+
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return False
+            specs = load_label_specs(self.path)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load labels from %s: %s", self.path, e)
+            return False
+
+        self._mtime = mtime
+        self._apply(specs)
+        logger.info("Loaded %d labels from %s", len(specs), self.path)
+        return True
+
+    def directory_for(self, label: str) -> str:
+        """Return the archive directory of a label."""
+        return self.label_to_dir.get(label, label + "s")
+
+    def hypotheses(self, template: str) -> List[str]:
+        """
+        Return the NLI hypothesis of every label for a template.
+
+        Args:
+            template: Format string with one "{}" for the label.
+
+        Returns:
+            Formatted hypotheses, cached until the labels change.
+        """
+        if template not in self._hypotheses:
+            self._hypotheses[template] = [template.format(name) for name in self.names]
+        return self._hypotheses[template]
+
+    def hypothesis_encodings(self, backend, template: str) -> List:
+        """
+        Return the tokenized hypotheses, without special tokens.
+
+        Args:
+            backend: ``tokenizers.Tokenizer`` of the NLI model.
+            template: Format string with one "{}" for the label.
+
+        Returns:
+            One tokenizers Encoding per label, cached per tokenizer and
+            template until the labels change.
+        """
+        key = (id(backend), template)
+        if key not in self._encodings:
+            self._encodings[key] = backend.encode_batch(
+                self.hypotheses(template), add_special_tokens=False
+            )
+        return self._encodings[key]
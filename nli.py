@@ -0,0 +1,187 @@
+"""
+NLI Classifier - Zero-Shot Classification with Reused Hypothesis Encodings
+
+This module wraps a transformers zero-shot classification pipeline. The
+pipeline tokenizes every (document, hypothesis) pair from scratch, so each
+document is tokenized once per candidate label and the unchanging label
+hypotheses are tokenized again for every document. The wrapper tokenizes
+each document once, reuses cached hypothesis encodings from the label
+registry, and only joins the two with the model's special tokens.
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple, Union
+
+from labels import LabelRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HYPOTHESIS_TEMPLATE = "This example is {}."
+
+
+class NLIClassifier:
+    """Drop-in replacement for a zero-shot pipeline that reuses hypothesis encodings."""
+
+    def __init__(
+        self,
+        zero_shot_pipeline,
+        registry: LabelRegistry,
+        hypothesis_template: str = DEFAULT_HYPOTHESIS_TEMPLATE
+    ):
+        """
+        Wrap a zero-shot classification pipeline.
+
+        Args:
+            zero_shot_pipeline: A transformers zero-shot classification
+                pipeline with a fast tokenizer.
+            registry: Label registry caching the hypothesis encodings.
+            hypothesis_template: Format string with one "{}" for the label.
+
+        Raises:
+            ValueError: If the pipeline's tokenizer is not a fast tokenizer.
+        """
+        if not self.supports(zero_shot_pipeline):
+            raise ValueError("NLIClassifier needs a pipeline with a fast tokenizer")
+
+        from tokenizers import Tokenizer
+
+        self.pipeline = zero_shot_pipeline
+        self.model = zero_shot_pipeline.model
+        self.tokenizer = zero_shot_pipeline.tokenizer
+        self.entailment_id = zero_shot_pipeline.entailment_id
+        self.registry = registry
+        self.hypothesis_template = hypothesis_template
+
+        # Private copy of the backend so truncation/padding settings left
+        # behind by other callers never leak into the cached encodings
+        self.backend = Tokenizer.from_str(self.tokenizer.backend_tokenizer.to_str())
+        self.backend.no_truncation()
+        self.backend.no_padding()
+
+        self.max_length = self.tokenizer.model_max_length
+        if self.max_length > 100000:  # tokenizer without a configured limit
+            self.max_length = getattr(self.model.config, "max_position_embeddings", 512)
+        self.pair_special_tokens = self.tokenizer.num_special_tokens_to_add(pair=True)
+        self.use_token_types = "token_type_ids" in self.tokenizer.model_input_names
+        self._other_hypotheses: Dict[Tuple[str, Tuple[str, ...]], List] = {}
+
+    @staticmethod
+    def supports(zero_shot_pipeline) -> bool:
+        """Return whether a pipeline's tokenizer exposes a tokenizers backend."""
+        tokenizer = getattr(zero_shot_pipeline, "tokenizer", None)
+        return getattr(tokenizer, "is_fast", False) is True and hasattr(
+            tokenizer, "backend_tokenizer"
+        )
+
+    def hypothesis_encodings(self, candidate_labels: Sequence[str], template: str) -> List:
+        """
+        Return the encoded hypotheses for the candidate labels.
+
+        Encodings for the registry's labels come from (and are cached in)
+        the registry; any other label set is cached locally.
+
+        Args:
+            candidate_labels: Labels to build hypotheses for.
+            template: Format string with one "{}" for the label.
+
+        Returns:
+            One tokenizers Encoding per label, without special tokens.
+        """
+        if list(candidate_labels) == self.registry.names:
+            return self.registry.hypothesis_encodings(self.backend, template)
+
+        key = (template, tuple(candidate_labels))
+        if key not in self._other_hypotheses:
+            self._other_hypotheses[key] = self.backend.encode_batch(
+                [template.format(label) for label in candidate_labels],
+                add_special_tokens=False
+            )
+        return self._other_hypotheses[key]
+
+    def _encode_pairs(self, texts: List[str], hypotheses: List) -> List:
+        """
+        Join every document with every hypothesis, truncating the document.
+
+        Each document is truncated once so that it fits next to the longest
+        hypothesis, rather than separately for every pair.
+        """
+        budget = (
+            self.max_length - self.pair_special_tokens
+            - max(len(hypothesis.ids) for hypothesis in hypotheses)
+        )
+        pairs = []
+        for premise in self.backend.encode_batch(texts, add_special_tokens=False):
+            if len(premise.ids) > budget:
+                premise.truncate(max(budget, 1))
+            for hypothesis in hypotheses:
+                pairs.append(self.backend.post_process(premise, hypothesis))
+        return pairs
+
+    def _entailment_logits(self, pairs: List, batch_size: int):
+        """Run the model over the encoded pairs and return entailment logits."""
+        import torch
+
+        pad_id = self.tokenizer.pad_token_id or 0
+        logits = []
+        with torch.inference_mode():
+            for start in range(0, len(pairs), batch_size):
+                batch = pairs[start:start + batch_size]
+                width = max(len(pair.ids) for pair in batch)
+                input_ids = torch.full((len(batch), width), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+                token_type_ids = torch.zeros((len(batch), width), dtype=torch.long)
+                for row, pair in enumerate(batch):
+                    length = len(pair.ids)
+                    input_ids[row, :length] = torch.tensor(pair.ids)
+                    attention_mask[row, :length] = 1
+                    token_type_ids[row, :length] = torch.tensor(pair.type_ids)
+
+                inputs = {'input_ids': input_ids, 'attention_mask': attention_mask}
+                if self.use_token_types:
+                    inputs['token_type_ids'] = token_type_ids
+                outputs = self.model(**inputs)
+                logits.append(outputs.logits[:, self.entailment_id])
+        return torch.cat(logits)
+
+    def __call__(
+        self,
+        sequences: Union[str, List[str]],
+        candidate_labels: List[str],
+        batch_size: int = 8,
+        hypothesis_template: str = None,
+        **kwargs
+    ) -> Union[Dict, List[Dict]]:
+        """
+        Classify one or more texts against the candidate labels.
+
+        Args:
+            sequences: A text or a list of texts.
+            candidate_labels: Labels to score.
+            batch_size: Number of (document, hypothesis) pairs per forward pass.
+            hypothesis_template: Overrides the template given at construction.
+
+        Returns:
+            A dict (for a single text) or a list of dicts with 'sequence',
+            'labels' and 'scores', like the wrapped pipeline.
+        """
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        if not texts:
+            return []
+
+        template = hypothesis_template or self.hypothesis_template
+        hypotheses = self.hypothesis_encodings(candidate_labels, template)
+        pairs = self._encode_pairs(texts, hypotheses)
+
+        entailment = self._entailment_logits(pairs, max(1, batch_size))
+        scores = entailment.reshape(len(texts), len(candidate_labels)).softmax(dim=-1)
+
+        results = []
+        for text, row in zip(texts, scores.tolist()):
+            order = sorted(range(len(row)), key=lambda i: row[i], reverse=True)
+            results.append({
+                'sequence': text,
+                'labels': [candidate_labels[i] for i in order],
+                'scores': [row[i] for i in order],
+            })
+        return results[0] if single else results
@@ -0,0 +1,157 @@
+"""
+Rule Pre-Classifier - Keyword and Regex Fast Path
+
+This module classifies documents whose opening text carries an obvious
+marker (such as "Фактура" or "Протокол") without running the model.
+Only documents that match no rule, or rules of several labels, are left
+for the transformer.
+"""
+
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordRule:
+    """A regular expression that marks a document as one label."""
+
+    def __init__(self, name: str, label: str, pattern: str, score: float = 0.95):
+        """
+        Compile a rule.
+
+        Args:
+            name: Unique rule name used by the hit counters.
+            label: Candidate label assigned when the pattern matches.
+            pattern: Regular expression searched case-insensitively.
+            score: Confidence reported for a match (0-1].
+
+        Raises:
+            ValueError: If the pattern is invalid or the score out of range.
+        """
+        if not 0 < score <= 1:
+            raise ValueError(f"Rule {name}: score must be in (0, 1]: {score}")
+        try:
+            self.pattern = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Rule {name}: invalid pattern {pattern!r}: {e}") from e
+
+        self.name = name
+        self.label = label
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"KeywordRule({self.name!r}, {self.label!r}, {self.pattern.pattern!r})"
+
+
+# Markers printed by documents.py in the header of each document type
+DEFAULT_RULES: List[KeywordRule] = [
+    KeywordRule("invoice-keyword", "Invoice", r"\bфактура\b"),
+    KeywordRule("protocol-keyword", "Protocol", r"\bпротокол\b"),
+    KeywordRule("report-keyword", "Report", r"\bотчет\b"),
+]
+
+
+def load_rules(path: str) -> List[KeywordRule]:
+    """
+    Load rules from a JSON file.
+
+    The file holds a list of objects with "name", "label", "pattern" and
+    an optional "score".
+
+    Args:
+        path: Path to the JSON rules file.
+
+    Returns:
+        The compiled rules.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid rule list.
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: expected a list of rules")
+
+    rules = []
+    for entry in entries:
+        try:
+            rules.append(KeywordRule(
+                entry["name"], entry["label"], entry["pattern"], entry.get("score", 0.95)
+            ))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path}: invalid rule {entry!r}") from e
+    return rules
+
+
+class RulePreClassifier:
+    """Short-circuit classification for documents matched by a confident rule."""
+
+    def __init__(
+        self,
+        rules: List[KeywordRule],
+        threshold: float = 0.9,
+        scan_chars: int = 300
+    ):
+        """
+        Create the pre-classifier.
+
+        Args:
+            rules: Rules to evaluate, in priority order.
+            threshold: Minimum rule score that may bypass the model.
+            scan_chars: Number of leading characters searched.
+        """
+        self.rules = rules
+        self.threshold = threshold
+        self.scan_chars = scan_chars
+        self.checked = 0
+        self.rule_hits: Dict[str, int] = {rule.name: 0 for rule in rules}
+
+    def classify(self, text: str, candidate_labels: List[str]) -> Optional[Dict]:
+        """
+        Classify a text by rules alone if exactly one label matches.
+
+        Args:
+            text: Extracted document text.
+            candidate_labels: Labels the document may receive.
+
+        Returns:
+            A result dict shaped like the pipeline output, plus the name of
+            the matching 'rule', or None if the model should decide.
+        """
+        self.checked += 1
+        head = text[:self.scan_chars]
+
+        matched: Dict[str, KeywordRule] = {}
+        for rule in self.rules:
+            if rule.label not in candidate_labels or rule.score < self.threshold:
+                continue
+            best = matched.get(rule.label)
+            if (best is None or rule.score > best.score) and rule.pattern.search(head):
+                matched[rule.label] = rule
+
+        if len(matched) != 1:
+            return None
+
+        rule = next(iter(matched.values()))
+        self.rule_hits[rule.name] += 1
+
+        others = [label for label in candidate_labels if label != rule.label]
+        remainder = (1.0 - rule.score) / len(others) if others else 0.0
+        return {
+            'labels': [rule.label] + others,
+            'scores': [rule.score] + [remainder] * len(others),
+            'rule': rule.name,
+        }
+
+    def stats(self) -> Dict:
+        """Return how many texts were checked and short-circuited, per rule."""
+        return {
+            'checked': self.checked,
+            'short_circuited': sum(self.rule_hits.values()),
+            'rule_hits': dict(self.rule_hits),
+        }
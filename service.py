@@ -0,0 +1,282 @@
+"""
+Sorter Service - Asyncio Entry Point for the Document Sorter
+
+This module runs the sorter on an asyncio event loop instead of the
+blocking loops in sorter.py. Extraction and inference run in executors,
+file moves are awaitable, and SIGINT/SIGTERM stop the intake of new files
+while documents already being processed are finished and filed.
+
+Usage:
+    python service.py
+"""
+
+import asyncio
+import itertools
+import logging
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import sorter
+from stages import Stage, StagedPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class SorterService:
+    """Watch INPUT_DIR and sort documents on an asyncio event loop."""
+
+    def __init__(self, classifier):
+        """
+        Create the service.
+
+        Args:
+            classifier: The classification pipeline.
+        """
+        self.classifier = classifier
+        self.processed = 0
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._pending_names: Set[str] = set()
+        self._rescan = False
+        self._extract_executor: Optional[Executor] = None
+        self._inference_executor: Optional[Executor] = None
+        self._io_executor: Optional[Executor] = None
+
+    @property
+    def stopping(self) -> bool:
+        """Whether shutdown was requested."""
+        return self._stopping.is_set()
+
+    def request_shutdown(self) -> None:
+        """Stop taking new files; documents in flight are still filed."""
+        if not self.stopping:
+            logger.info("Shutdown requested; draining in-flight documents...")
+        self._stopping.set()
+        self._wakeup.set()
+
+    def _open_executors(self) -> None:
+        if sorter.EXTRACT_WORKERS > 1:
+            self._extract_executor = ProcessPoolExecutor(max_workers=sorter.EXTRACT_WORKERS)
+        else:
+            self._extract_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="extract"
+            )
+        self._inference_executor = ThreadPoolExecutor(
+            max_workers=sorter.CLASSIFY_WORKERS, thread_name_prefix="classify"
+        )
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=sorter.MOVE_WORKERS, thread_name_prefix="move"
+        )
+
+    def _close_executors(self) -> None:
+        for executor in (self._extract_executor, self._inference_executor, self._io_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    async def extract(self, file_path: str) -> str:
+        """Extract a PDF's text in the extraction executor."""
+        loop = asyncio.get_running_loop()
+        try:
+            text, seconds = await loop.run_in_executor(
+                self._extract_executor, sorter.extract_text_timed, file_path
+            )
+        except Exception as e:
+            logger.error("Error extracting text from %s: %s", file_path, e)
+            text, seconds = "", 0.0
+        return sorter.record_extraction(file_path, text, seconds)
+
+    async def document_date(self, file_path: str, text: str) -> datetime:
+        """Resolve a document's filing date; may read the PDF's metadata."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_executor, sorter.resolve_document_date, file_path, text
+        )
+
+    async def classify(self, texts: List[str]) -> List[Optional[Dict]]:
+        """Classify texts in the inference executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._inference_executor, sorter.classify_texts, texts, self.classifier
+        )
+
+    async def move(self, file_path: str, result: Dict, document_date: datetime) -> bool:
+        """File a classified document without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_executor, sorter.file_document, file_path, result, document_date
+        )
+
+    async def process_files(self, file_names: Optional[List[str]] = None) -> int:
+        """
+        Extract, classify and move the waiting files concurrently.
+
+        The stages run as coroutines connected by bounded queues. Once
+        shutdown is requested no further files enter the extraction stage,
+        but files already past it are classified and moved.
+
+        Args:
+            file_names: Names of the files inside INPUT_DIR to process. When
+                omitted, the whole input directory is scanned.
+
+        Returns:
+            Number of files successfully processed.
+        """
+        file_paths = await asyncio.to_thread(sorter.list_input_files, file_names)
+        if not file_paths:
+            return 0
+
+        filed, file_paths = await asyncio.to_thread(sorter.file_by_metadata, file_paths)
+        if not file_paths:
+            return filed
+
+        async def extract(paths: List[str]) -> List[Tuple[str, str, datetime]]:
+            extracted = []
+            for file_path in paths:
+                text = await self.extract(file_path)
+                if text:
+                    document_date = await self.document_date(file_path, text)
+                    extracted.append((file_path, text, document_date))
+            return extracted
+
+        async def classify(
+            items: List[Tuple[str, str, datetime]]
+        ) -> List[Tuple[str, Dict, datetime]]:
+            results = await self.classify([text for _, text, _ in items])
+            return [
+                (file_path, result, document_date)
+                for (file_path, _, document_date), result in zip(items, results)
+                if result is not None
+            ]
+
+        async def move(items: List[Tuple[str, Dict, datetime]]) -> List[str]:
+            return [
+                file_path for file_path, result, document_date in items
+                if await self.move(file_path, result, document_date)
+            ]
+
+        pipeline_stages = StagedPipeline([
+            Stage(
+                "extract", extract, workers=sorter.EXTRACT_WORKERS,
+                queue_size=sorter.QUEUE_SIZE
+            ),
+            Stage(
+                "classify", classify, workers=sorter.CLASSIFY_WORKERS,
+                queue_size=sorter.QUEUE_SIZE, batch_size=sorter.BATCH_SIZE
+            ),
+            Stage("move", move, workers=sorter.MOVE_WORKERS, queue_size=sorter.QUEUE_SIZE),
+        ])
+        intake = itertools.takewhile(lambda _: not self.stopping, file_paths)
+        moved = await pipeline_stages.run_async(intake)
+
+        sorter.log_stage_metrics(pipeline_stages)
+        return filed + len(moved)
+
+    async def _cycle(self, file_names: Optional[List[str]] = None) -> None:
+        await asyncio.to_thread(sorter.reload_labels, self.classifier)
+        start_time = time.time()
+        processed = await self.process_files(file_names)
+        self.processed += processed
+        sorter.log_cycle(processed, start_time)
+
+    def _watch(self) -> Optional["sorter.InotifyWatcher"]:
+        """Register an inotify watch on the event loop, if events mode is on."""
+        if sorter.WATCH_MODE != "events":
+            return None
+        try:
+            watcher = sorter.InotifyWatcher(sorter.INPUT_DIR)
+        except OSError as e:
+            logger.warning(
+                "Cannot watch %s for events (%s); falling back to polling.",
+                sorter.INPUT_DIR, e
+            )
+            return None
+
+        def on_readable() -> None:
+            names, overflowed = watcher.read_events()
+            self._pending_names.update(names)
+            self._rescan = self._rescan or overflowed
+            self._wakeup.set()
+
+        asyncio.get_running_loop().add_reader(watcher.fd, on_readable)
+        return watcher
+
+    async def run(self) -> None:
+        """
+        Sort documents until shutdown is requested.
+
+        Files already waiting are processed first. After that each cycle
+        starts when inotify reports files (events mode) or every
+        CHECK_INTERVAL seconds (poll mode). In events mode the whole
+        directory is rescanned after an inotify queue overflow and every
+        RESCAN_INTERVAL seconds.
+        """
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.request_shutdown)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not the main thread, or no signal support on this platform
+
+        self._open_executors()
+        watcher = self._watch()
+        try:
+            last_scan = time.time()
+            if not self.stopping:
+                await self._cycle()
+            while not self.stopping:
+                if watcher is None:
+                    timeout = sorter.CHECK_INTERVAL
+                elif sorter.RESCAN_INTERVAL:
+                    timeout = max(0.0, last_scan + sorter.RESCAN_INTERVAL - time.time())
+                else:
+                    timeout = None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                if self.stopping:
+                    break
+
+                rescan_due = (
+                    sorter.RESCAN_INTERVAL
+                    and time.time() - last_scan >= sorter.RESCAN_INTERVAL
+                )
+                if watcher is None or self._rescan or rescan_due:
+                    self._pending_names.clear()
+                    self._rescan = False
+                    last_scan = time.time()
+                    await self._cycle()
+                elif self._pending_names:
+                    names, self._pending_names = sorted(self._pending_names), set()
+                    await self._cycle(names)
+        finally:
+            if watcher is not None:
+                loop.remove_reader(watcher.fd)
+                watcher.close()
+            self._close_executors()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.remove_signal_handler(signum)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+            logger.info("Sorter service stopped after %d document(s).", self.processed)
+
+
+def main() -> None:
+    """Run the document sorter as an asyncio service."""
+    logger.info("Starting Smart File Organizer (asyncio service)...")
+
+    sorter.setup_directory_structure()
+    sorter.start_metrics()
+    classifier = sorter.load_classifier()
+
+    logger.info("Monitoring %s for incoming documents...", sorter.INPUT_DIR)
+    asyncio.run(SorterService(classifier).run())
+
+
+if __name__ == "__main__":
+    main()
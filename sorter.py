@@ -5,15 +5,51 @@ This module provides functionality to automatically classify PDF documents
 using zero-shot classification and organize them into a structured directory tree.
 """
 
+import ctypes
+import ctypes.util
+import errno
+import io
+import json
 import os
+import select
 import shutil
+import socket
+import sqlite3
+import struct
+import tempfile
 import time
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import pdfplumber
-from transformers import pipeline
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LTAnno, LTChar
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+try:
+    import pypdfium2
+except ImportError:  # optional fast extraction backend
+    pypdfium2 = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; claim directories are not locked
+    fcntl = None
+
+from cache import ClassificationCache
+from dates import DEFAULT_PRECEDENCE, extract_date, parse_pdf_date, parse_precedence
+from embeddings import EmbeddingClassifier
+from labels import LabelRegistry, LabelSpec
+from metrics import REGISTRY as METRICS, start_metrics_server
+from nli import DEFAULT_HYPOTHESIS_TEMPLATE, NLIClassifier
+from rules import DEFAULT_RULES, RulePreClassifier, load_rules
+from stages import Stage, StagedPipeline
 
 # Configure logging
 logging.basicConfig(
@@ -26,25 +62,264 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 # Parameters for the directories
 INPUT_DIR = os.environ.get("SORTER_INPUT_DIR", "./incoming_documents")
 OUTPUT_DIR = os.environ.get("SORTER_OUTPUT_DIR", "./sorted_documents")
 CHECK_INTERVAL = int(os.environ.get("SORTER_CHECK_INTERVAL", "30"))
 
-# Document types for classification
-DOCUMENT_TYPES = ["Invoices", "Protocols", "Reports"]
-CANDIDATE_LABELS = ["Invoice", "Protocol", "Report"]
+# Let several workers share INPUT_DIR: each file is claimed by atomically
+# renaming it into INPUT_DIR/processing/<WORKER_ID>/ before it is processed.
+# WORKER_ID must be unique per worker and stable across restarts; a worker
+# holds a lock on its claim directory and refuses to start if it is taken
+CLAIM_FILES = _env_flag("SORTER_CLAIM")
+WORKER_ID = os.environ.get("SORTER_WORKER_ID") or socket.gethostname()
+PROCESSING_DIR_NAME = "processing"
+CLAIM_LOCK_NAME = ".lock"
 
-# Mapping from classification labels to directory names
-LABEL_TO_DIR = {
-    "Invoice": "Invoices",
-    "Protocol": "Protocols",
-    "Report": "Reports"
-}
+# Zero-shot NLI model (hub id or local directory), whether it may only be
+# loaded from local files, and the engine that runs it: "pytorch" (default
+# fp32), "quantized" (dynamic int8 quantization of the PyTorch model) or
+# "onnx" (ONNX Runtime export through optimum). The "embedding" engine
+# replaces NLI with a sentence embedding model compared against label
+# prototypes built from LABEL_DESCRIPTIONS or from example documents in
+# PROTOTYPE_DIR/<Label>/
+DEFAULT_MODEL = "facebook/bart-large-mnli"
+MODEL_NAME = os.environ.get("SORTER_MODEL", DEFAULT_MODEL)
+OFFLINE = _env_flag("SORTER_OFFLINE")
+INFERENCE_ENGINE = os.environ.get("SORTER_INFERENCE_ENGINE", "pytorch").lower()
+EMBEDDING_MODEL = os.environ.get(
+    "SORTER_EMBEDDING_MODEL",
+    "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+PROTOTYPE_DIR = os.environ.get("SORTER_PROTOTYPE_DIR", "")
+
+# Where the "onnx" engine saves its export of MODEL_NAME, so only the first
+# start pays for the export (unused when MODEL_NAME already holds model.onnx)
+ONNX_CACHE_DIR = os.environ.get("SORTER_ONNX_CACHE_DIR", "./onnx_models")
+
+# Hypothesis each label is inserted into for NLI engines, and whether label
+# hypotheses are tokenized once and reused instead of per document
+HYPOTHESIS_TEMPLATE = os.environ.get(
+    "SORTER_HYPOTHESIS_TEMPLATE", DEFAULT_HYPOTHESIS_TEMPLATE
+)
+HYPOTHESIS_CACHE = _env_flag("SORTER_HYPOTHESIS_CACHE", default=True)
+
+# Documents whose top score is below MIN_CONFIDENCE are moved to
+# QUARANTINE_DIR with their scores instead of the dated archive (0 = off)
+MIN_CONFIDENCE = float(os.environ.get("SORTER_MIN_CONFIDENCE", "0"))
+QUARANTINE_DIR = os.environ.get("SORTER_QUARANTINE_DIR", "./review_documents")
+
+# Create archive folders on demand instead of pre-creating 2020-2030
+LAZY_DIRECTORIES = _env_flag("SORTER_LAZY_DIRECTORIES")
+
+# PDF text extraction backend: "pdfplumber" (default, full layout analysis),
+# "pdfminer" (raw text without layout analysis) or "pypdfium2" (PDFium)
+EXTRACT_BACKEND = os.environ.get("SORTER_EXTRACT_BACKEND", "pdfplumber").lower()
+
+# Stop extracting a PDF after this many pages / characters (0 = no limit)
+MAX_EXTRACT_PAGES = max(0, int(os.environ.get("SORTER_MAX_EXTRACT_PAGES", "0")))
+MAX_EXTRACT_CHARS = max(0, int(os.environ.get("SORTER_MAX_EXTRACT_CHARS", "0")))
+
+# How extracted text is shaped before classification: "full" (unchanged),
+# "head" (first MAX_INPUT_TOKENS words), "head_tail" (beginning and end of
+# the document) or "chunks" (score MAX_INPUT_TOKENS-word chunks and
+# average the scores across at most MAX_CHUNKS chunks)
+INPUT_STRATEGY = os.environ.get("SORTER_INPUT_STRATEGY", "full").lower()
+MAX_INPUT_TOKENS = max(1, int(os.environ.get("SORTER_MAX_INPUT_TOKENS", "400")))
+MAX_CHUNKS = max(1, int(os.environ.get("SORTER_MAX_CHUNKS", "8")))
+
+# Persistent classification cache (disabled when the path is empty)
+CACHE_PATH = os.environ.get("SORTER_CACHE_PATH", "")
+CACHE_MAX_ENTRIES = int(os.environ.get("SORTER_CACHE_MAX_ENTRIES", "10000"))
+
+# Keyword/regex pre-classifier that skips the model for obvious documents.
+# Enabled by SORTER_RULES=1 or by pointing SORTER_RULES_PATH at a JSON file
+# of rules (DEFAULT_RULES from rules.py are used otherwise)
+RULES_PATH = os.environ.get("SORTER_RULES_PATH", "")
+RULES_ENABLED = _env_flag("SORTER_RULES", bool(RULES_PATH))
+RULE_THRESHOLD = float(os.environ.get("SORTER_RULE_THRESHOLD", "0.9"))
+RULE_SCAN_CHARS = int(os.environ.get("SORTER_RULE_SCAN_CHARS", "300"))
+
+# Metadata fast path: file PDFs whose /Title, /Subject or /Keywords match a
+# rule without extracting any text. Enabled by SORTER_METADATA_RULES=1 or by
+# SORTER_METADATA_RULES_PATH (same JSON format as SORTER_RULES_PATH)
+METADATA_RULES_PATH = os.environ.get("SORTER_METADATA_RULES_PATH", "")
+METADATA_RULES_ENABLED = _env_flag("SORTER_METADATA_RULES", bool(METADATA_RULES_PATH))
+METADATA_FIELDS = ("Title", "Subject", "Keywords", "CreationDate")
+
+# How new files are detected: "poll" (rescan every CHECK_INTERVAL) or
+# "events" (react to Linux inotify events on INPUT_DIR)
+WATCH_MODE = os.environ.get("SORTER_WATCH_MODE", "poll").lower()
+
+# In events mode, rescan the whole INPUT_DIR every RESCAN_INTERVAL seconds
+# (0 = never) so files whose extraction or classification failed, or whose
+# events were lost, are retried
+RESCAN_INTERVAL = max(0, int(os.environ.get("SORTER_RESCAN_INTERVAL", "300")))
+
+# Number of documents sent through the classifier in a single call
+BATCH_SIZE = max(1, int(os.environ.get("SORTER_BATCH_SIZE", "1")))
+
+# Number of processes used for PDF text extraction (1 = main thread only)
+EXTRACT_WORKERS = max(1, int(os.environ.get("SORTER_EXTRACT_WORKERS", "1")))
+
+# Run extraction, classification and moves as concurrent stages connected
+# by bounded queues, with a worker count per stage
+PIPELINE_ENABLED = _env_flag("SORTER_PIPELINE")
+CLASSIFY_WORKERS = max(1, int(os.environ.get("SORTER_CLASSIFY_WORKERS", "1")))
+MOVE_WORKERS = max(1, int(os.environ.get("SORTER_MOVE_WORKERS", "2")))
+QUEUE_SIZE = max(1, int(os.environ.get("SORTER_QUEUE_SIZE", "16")))
+
+# Date formats searched in the extracted text, in order of precedence (see
+# dates.py). Documents without a date in their first DATE_SCAN_CHARS
+# characters are filed by PDF creation date, then by file modification time.
+DATE_FORMATS = parse_precedence(
+    os.environ.get("SORTER_DATE_FORMATS", ",".join(DEFAULT_PRECEDENCE))
+)
+DATE_SCAN_CHARS = max(0, int(os.environ.get("SORTER_DATE_SCAN_CHARS", "2000")))
+DATE_MIN_YEAR = int(os.environ.get("SORTER_DATE_MIN_YEAR", "1990"))
+
+# Local HTTP port serving Prometheus-style metrics at /metrics (0 = off)
+METRICS_PORT = int(os.environ.get("SORTER_METRICS_PORT", "0"))
+METRICS_HOST = os.environ.get("SORTER_METRICS_HOST", "127.0.0.1")
+
+EXTRACT_SECONDS = METRICS.histogram(
+    "sorter_extract_seconds", "Time spent extracting the text of one PDF."
+)
+CLASSIFY_SECONDS = METRICS.histogram(
+    "sorter_classify_seconds", "Time spent in one classifier call (one batch)."
+)
+MOVE_SECONDS = METRICS.histogram(
+    "sorter_move_seconds", "Time spent moving one document into the archive."
+)
+DOCUMENTS_FILED = METRICS.counter(
+    "sorter_documents_total", "Documents filed into the archive, by label.", ["label"]
+)
+DOCUMENTS_QUARANTINED = METRICS.counter(
+    "sorter_quarantined_total", "Documents moved to the review directory, by top label.",
+    ["label"]
+)
+EMPTY_TEXT_SKIPPED = METRICS.counter(
+    "sorter_empty_text_skipped_total", "PDFs skipped because no text was extracted."
+)
+MOVE_FAILURES = METRICS.counter(
+    "sorter_move_failures_total", "Documents that could not be moved."
+)
+DUPLICATE_RENAMES = METRICS.counter(
+    "sorter_duplicate_renames_total", "Documents renamed because the target name was taken."
+)
+DOCUMENT_DATES = METRICS.counter(
+    "sorter_document_dates_total",
+    "Filing dates resolved, by source (text, metadata or mtime).", ["source"]
+)
+
+# Built-in document labels, used unless SORTER_LABELS_PATH points at a
+# JSON list of {"name", "directory", "description"} objects
+DEFAULT_LABELS = [
+    LabelSpec(
+        "Invoice", "Invoices",
+        "Фактура за предоставени услуги и сума за плащане. Invoice with an amount due."
+    ),
+    LabelSpec(
+        "Protocol", "Protocols",
+        "Протокол от проведено заседание и взети решения. Minutes of a meeting."
+    ),
+    LabelSpec(
+        "Report", "Reports",
+        "Отчет за резултати, изпълнение и финансово състояние. Report on results."
+    ),
+]
+LABELS_PATH = os.environ.get("SORTER_LABELS_PATH", "")
+LABEL_REGISTRY = (
+    LabelRegistry.from_file(LABELS_PATH, DEFAULT_LABELS)
+    if LABELS_PATH else LabelRegistry(DEFAULT_LABELS)
+)
+
+# Views of the label registry, updated in place when the labels reload:
+# labels offered to the classifier, archive folders, label -> folder
+# mapping and the descriptions used as embedding prototypes
+CANDIDATE_LABELS = LABEL_REGISTRY.names
+DOCUMENT_TYPES = LABEL_REGISTRY.directories
+LABEL_TO_DIR = LABEL_REGISTRY.label_to_dir
+LABEL_DESCRIPTIONS = LABEL_REGISTRY.descriptions
+
+# inotify event masks (see inotify(7)) and the fixed event header layout
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+# renameat2() arguments for renames that must not replace an existing file,
+# and the errors meaning renameat2 or hard links are not supported
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+_UNSUPPORTED_ERRNOS = {errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP}
+_NO_LINK_ERRNOS = {errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+# Lazily loaded libc renameat2 (False if unavailable), see _load_renameat2()
+_renameat2 = None
+
+# Descriptor holding the lock on this worker's claim directory, see
+# lock_claim_directory(), and how long to wait for it at startup
+_claim_lock: Optional[int] = None
+_CLAIM_LOCK_WAIT = 5.0
+
+# Lazily opened classification cache, see get_classification_cache()
+_classification_cache: Optional[ClassificationCache] = None
+
+# Lazily built rule pre-classifier, see get_rule_classifier()
+_rule_classifier: Optional[RulePreClassifier] = None
+
+# Lazily built metadata rule classifier, see get_metadata_rule_classifier()
+_metadata_rule_classifier: Optional[RulePreClassifier] = None
+
+# Extraction process pool shared by every cycle, see get_extract_executor()
+_extract_executor: Optional[ProcessPoolExecutor] = None
+
+# Archive directories known to exist, so moves skip repeated makedirs calls
+_created_directories: Set[str] = set()
+
+
+def ensure_directory(path: str) -> None:
+    """
+    Create a directory (and its parents) unless it is already known to exist.
+
+    Args:
+        path: Directory to create.
+
+    Raises:
+        OSError: If the directory cannot be created.
+    """
+    if path in _created_directories:
+        return
+    os.makedirs(path, exist_ok=True)
+    _created_directories.add(path)
 
 
 def setup_directory_structure() -> None:
-    """Create the directory structure for sorted documents."""
+    """
+    Create the directory structure for sorted documents.
+
+    In lazy mode only the input and output roots are created; archive
+    folders are created by move_file_to_correct_directory when needed.
+    """
+    os.makedirs(INPUT_DIR, exist_ok=True)
+    if CLAIM_FILES:
+        lock_claim_directory()
+
+    if LAZY_DIRECTORIES:
+        ensure_directory(OUTPUT_DIR)
+        logger.info("Directory structure initialized (lazy)")
+        return
+
     for doc_type in DOCUMENT_TYPES:
         for year in range(2020, 2031):
             for month in range(1, 13):
@@ -53,41 +328,323 @@ def setup_directory_structure() -> None:
                         OUTPUT_DIR, doc_type, str(year),
                         f"Month_{month}", f"Week_{week}"
                     )
-                    os.makedirs(path, exist_ok=True)
+                    ensure_directory(path)
 
-    os.makedirs(INPUT_DIR, exist_ok=True)
     logger.info("Directory structure initialized")
 
 
-def load_classifier():
-    """Load the zero-shot classification pipeline."""
+def _load_pytorch_pipeline():
+    """Build the zero-shot pipeline on the PyTorch model."""
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, local_files_only=OFFLINE)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        MODEL_NAME, local_files_only=OFFLINE
+    )
+    return pipeline(
+        "zero-shot-classification", model=model, tokenizer=tokenizer, device=-1
+    )
+
+
+def _load_quantized_pipeline():
+    """Build the zero-shot pipeline with int8 dynamically quantized Linear layers."""
+    import torch
+
+    clf = _load_pytorch_pipeline()
+    clf.model = torch.quantization.quantize_dynamic(
+        clf.model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return clf
+
+
+def onnx_export_dir() -> str:
+    """Return the directory the ONNX export of MODEL_NAME is saved to."""
+    safe_name = MODEL_NAME.strip("/\\").replace("/", "--").replace("\\", "--").replace(":", "")
+    return os.path.join(ONNX_CACHE_DIR, safe_name)
+
+
+def _has_onnx_model(directory: str) -> bool:
+    return os.path.isfile(os.path.join(directory, "model.onnx"))
+
+
+def _load_onnx_pipeline():
+    """
+    Build the zero-shot pipeline on an ONNX Runtime export of the model.
+
+    A MODEL_NAME directory that already holds model.onnx (for example made
+    with optimum-cli export onnx) is loaded as it is. Otherwise the model is
+    exported once and saved to onnx_export_dir(), which later starts load.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    source = MODEL_NAME if _has_onnx_model(MODEL_NAME) else onnx_export_dir()
+    if _has_onnx_model(source):
+        model = ORTModelForSequenceClassification.from_pretrained(source, local_files_only=True)
+        tokenizer = AutoTokenizer.from_pretrained(source, local_files_only=True)
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+
+    logger.info("Exporting %s to ONNX (first start only)...", MODEL_NAME)
+    model = ORTModelForSequenceClassification.from_pretrained(
+        MODEL_NAME, export=True, local_files_only=OFFLINE
+    )
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, local_files_only=OFFLINE)
+
+    # Save next to the target and rename, so a crash never leaves a partial export
+    temp_dir = f"{source}.tmp-{os.getpid()}"
+    try:
+        model.save_pretrained(temp_dir)
+        tokenizer.save_pretrained(temp_dir)
+        os.replace(temp_dir, source)
+        logger.info("Saved the ONNX export to %s", source)
+    except OSError as e:
+        logger.warning("Cannot save the ONNX export to %s: %s", source, e)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+
+
+def load_label_examples(directory: str) -> Dict[str, List[str]]:
+    """
+    Read example documents for each candidate label.
+
+    Args:
+        directory: Directory containing one sub-directory per label name
+            with example PDF or text files.
+
+    Returns:
+        Example texts per label; labels without examples are omitted.
+    """
+    examples: Dict[str, List[str]] = {}
+    for label in CANDIDATE_LABELS:
+        label_dir = os.path.join(directory, label)
+        if not os.path.isdir(label_dir):
+            continue
+        texts = []
+        for file_name in sorted(os.listdir(label_dir)):
+            file_path = os.path.join(label_dir, file_name)
+            if file_name.endswith('.pdf'):
+                texts.append(extract_text_from_pdf(file_path))
+            elif file_name.endswith('.txt'):
+                with open(file_path, encoding='utf-8') as f:
+                    texts.append(f.read().strip())
+        texts = [text for text in texts if text]
+        if texts:
+            examples[label] = texts
+            logger.info("Loaded %d example(s) for label %s", len(texts), label)
+    return examples
+
+
+def _load_embedding_classifier() -> EmbeddingClassifier:
+    """Build the label-prototype classifier on a sentence embedding model."""
+    from sentence_transformers import SentenceTransformer
+
+    encoder = SentenceTransformer(EMBEDDING_MODEL, device="cpu", local_files_only=OFFLINE)
+    examples = load_label_examples(PROTOTYPE_DIR) if PROTOTYPE_DIR else None
+    return EmbeddingClassifier(encoder, LABEL_DESCRIPTIONS, examples)
+
+
+def classifier_signature() -> str:
+    """Identify the model configuration whose scores the cache stores."""
+    if INFERENCE_ENGINE == "embedding":
+        return f"{EMBEDDING_MODEL}:{INFERENCE_ENGINE}:{PROTOTYPE_DIR}"
+    return f"{MODEL_NAME}:{INFERENCE_ENGINE}:{HYPOTHESIS_TEMPLATE}"
+
+
+def load_classifier(engine: Optional[str] = None):
+    """
+    Load the zero-shot classification pipeline.
+
+    Args:
+        engine: Inference engine name (defaults to INFERENCE_ENGINE).
+
+    Returns:
+        A pipeline returning 'labels' and 'scores' for each input.
+
+    Raises:
+        ValueError: If the engine is unknown.
+        ImportError: If the engine's optional dependencies are missing.
+    """
+    engine = engine or INFERENCE_ENGINE
     try:
-        logger.info("Loading classification model...")
-        clf = pipeline("zero-shot-classification")
-        logger.info("Classification model loaded successfully")
+        logger.info(
+            "Loading classification model %s (engine: %s%s)...",
+            EMBEDDING_MODEL if engine == "embedding" else MODEL_NAME,
+            engine, ", offline" if OFFLINE else ""
+        )
+        start_time = time.time()
+        if engine == "pytorch":
+            clf = _load_pytorch_pipeline()
+        elif engine == "quantized":
+            clf = _load_quantized_pipeline()
+        elif engine == "onnx":
+            clf = _load_onnx_pipeline()
+        elif engine == "embedding":
+            clf = _load_embedding_classifier()
+        else:
+            raise ValueError(f"Unknown inference engine: {engine}")
+        if engine != "embedding" and HYPOTHESIS_CACHE and NLIClassifier.supports(clf):
+            clf = NLIClassifier(clf, LABEL_REGISTRY, HYPOTHESIS_TEMPLATE)
+        logger.info(
+            "Classification model loaded successfully in %.2f seconds",
+            time.time() - start_time
+        )
         return clf
     except Exception as e:
         logger.error("Failed to load classification model: %s", e)
         raise
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def _iter_pages_pdfplumber(file_path: str) -> Iterator[str]:
+    """Yield page texts using pdfplumber's layout-aware extraction."""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            try:
+                text = page.extract_text() or ""
+            finally:
+                # Drop the page's cached layout objects so memory stays flat
+                # on long documents instead of growing with every page
+                page.close()
+            yield text
+
+
+class _SeparatingTextConverter(TextConverter):
+    """
+    TextConverter that keeps word and line breaks without layout analysis.
+
+    Without layout analysis pdfminer writes the characters of consecutive
+    text-showing operators back to back, fusing the last word of one line
+    with the first word of the next. This converter compares where each
+    operator's text starts with where the previous one ended and inserts a
+    newline when it starts on another line, or a space after a gap.
+    """
+
+    # Fraction of the character size that counts as a gap between words
+    # (LAParams.word_margin) and vertical offset that starts a new line
+    WORD_MARGIN = 0.1
+    LINE_OFFSET = 0.5
+
+    def begin_page(self, page, ctm) -> None:
+        super().begin_page(page, ctm)
+        self._last_char: Optional[LTChar] = None
+
+    def render_string(self, textstate, seq, ncs, graphicstate) -> None:
+        objs = self.cur_item._objs
+        start = len(objs)
+        super().render_string(textstate, seq, ncs, graphicstate)
+
+        chars = [item for item in objs[start:] if isinstance(item, LTChar)]
+        if not chars:
+            return
+        last, first = self._last_char, chars[0]
+        self._last_char = chars[-1]
+        if last is None:
+            return
+
+        size = max(last.width, last.height)
+        if abs(first.y0 - last.y0) > last.height * self.LINE_OFFSET:
+            objs.insert(start, LTAnno("\n"))
+        elif first.x0 - last.x1 > size * self.WORD_MARGIN:
+            objs.insert(start, LTAnno(" "))
+
+
+def _iter_pages_pdfminer(file_path: str) -> Iterator[str]:
+    """Yield page texts from pdfminer without running layout analysis."""
+    with open(file_path, 'rb') as fp:
+        resource_manager = PDFResourceManager()
+        output = io.StringIO()
+        device = _SeparatingTextConverter(resource_manager, output, laparams=None)
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        try:
+            for page in PDFPage.get_pages(fp):
+                interpreter.process_page(page)
+                yield output.getvalue().strip("\x0c")
+                output.seek(0)
+                output.truncate()
+        finally:
+            device.close()
+
+
+def _iter_pages_pypdfium2(file_path: str) -> Iterator[str]:
+    """Yield page texts using the PDFium text engine."""
+    if pypdfium2 is None:
+        raise ImportError("pypdfium2 is not installed")
+
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        for page in pdf:
+            text_page = page.get_textpage()
+            try:
+                yield text_page.get_text_range().replace("\r\n", "\n")
+            finally:
+                text_page.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+# Page-text generators by EXTRACT_BACKEND name
+PAGE_BACKENDS = {
+    "pdfplumber": _iter_pages_pdfplumber,
+    "pdfminer": _iter_pages_pdfminer,
+    "pypdfium2": _iter_pages_pypdfium2,
+}
+
+
+def iter_pdf_pages(file_path: str, backend: Optional[str] = None) -> Iterator[str]:
+    """
+    Lazily yield the text of each page of a PDF document.
+
+    Pages are only parsed when the consumer asks for them, so callers
+    can stop early without parsing the rest of the file. The document is
+    closed when the generator is exhausted or closed.
+
+    Args:
+        file_path: Path to the PDF file.
+        backend: Extraction backend name (defaults to EXTRACT_BACKEND).
+
+    Yields:
+        The text of each page, or an empty string for pages without text.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        FileNotFoundError: If the file does not exist.
+        Exception: Any error raised by the backend while parsing.
+    """
+    backend = backend or EXTRACT_BACKEND
+    try:
+        iter_pages = PAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown extraction backend: {backend}") from None
+
+    yield from iter_pages(file_path)
+
+
+def extract_text_from_pdf(file_path: str, backend: Optional[str] = None) -> str:
     """
     Extract text content from a PDF document.
 
+    Parsing stops early once MAX_EXTRACT_PAGES pages have been read or
+    MAX_EXTRACT_CHARS characters collected, when those limits are set.
+
     Args:
         file_path: Path to the PDF file.
+        backend: Extraction backend name (defaults to EXTRACT_BACKEND).
 
     Returns:
         Extracted text as a string, or empty string if extraction fails.
     """
     try:
-        with pdfplumber.open(file_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text
+        parts: List[str] = []
+        length = 0
+        with closing(iter_pdf_pages(file_path, backend)) as pages:
+            for page_number, page_text in enumerate(pages, start=1):
+                parts.append(page_text)
+                length += len(page_text)
+                if MAX_EXTRACT_CHARS and length >= MAX_EXTRACT_CHARS:
+                    break
+                if MAX_EXTRACT_PAGES and page_number >= MAX_EXTRACT_PAGES:
+                    break
+        text = "".join(parts)
+        if MAX_EXTRACT_CHARS:
+            text = text[:MAX_EXTRACT_CHARS]
         return text.strip()
     except FileNotFoundError:
         logger.error("File not found: %s", file_path)
@@ -97,187 +654,1351 @@ def extract_text_from_pdf(file_path: str) -> str:
         return ""
 
 
-def classify_document(file_path: str, classifier) -> Optional[str]:
+def extract_text_timed(file_path: str) -> Tuple[str, float]:
     """
-    Classify a document using zero-shot classification.
+    Extract a PDF's text and measure how long it took.
+
+    Runs in extraction worker processes, where metrics cannot be recorded;
+    the caller records the duration with record_extraction.
 
     Args:
         file_path: Path to the PDF file.
-        classifier: The classification pipeline.
 
     Returns:
-        The document type label, or None if classification fails.
+        The extracted text and the extraction time in seconds.
     """
+    start_time = time.perf_counter()
     text = extract_text_from_pdf(file_path)
+    return text, time.perf_counter() - start_time
+
 
+def record_extraction(file_path: str, text: str, seconds: float) -> str:
+    """
+    Record an extraction in the metrics and warn about empty documents.
+
+    Args:
+        file_path: Path to the PDF file.
+        text: Extracted text.
+        seconds: Extraction time.
+
+    Returns:
+        The text, unchanged.
+    """
+    EXTRACT_SECONDS.observe(seconds)
     if not text:
+        EMPTY_TEXT_SKIPPED.inc()
         logger.warning("No text extracted from %s. Skipping classification.", file_path)
-        return None
+    return text
 
-    try:
-        result = classifier(text, CANDIDATE_LABELS)
-        doc_type = result['labels'][0]
-        confidence = result['scores'][0]
-        logger.debug(
-            "Classified %s as %s with confidence %.2f",
-            file_path, doc_type, confidence
-        )
-        return doc_type
-    except Exception as e:
-        logger.error("Classification failed for %s: %s", file_path, e)
-        return None
 
-
-def get_week_of_month(date: datetime) -> int:
+def iter_extracted_texts(file_paths: List[str]) -> Iterator[Tuple[str, str]]:
     """
-    Calculate the week number within a month (1-5).
+    Extract text from several PDFs, yielding each result as soon as it is ready.
+
+    With EXTRACT_WORKERS > 1 the files are parsed in a process pool and
+    yielded in completion order; otherwise they are parsed serially.
 
     Args:
-        date: The datetime object.
+        file_paths: Paths of the PDF files to extract.
 
-    Returns:
-        Week number (1-5).
+    Yields:
+        (file_path, text) tuples. Text is empty if extraction failed.
     """
-    day_of_month = date.day
-    week_of_month = (day_of_month - 1) // 7 + 1
-    return min(week_of_month, 5)  # Cap at 5 weeks
+    if EXTRACT_WORKERS <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            yield file_path, record_extraction(file_path, *extract_text_timed(file_path))
+        return
 
+    executor = get_extract_executor()
+    futures = {
+        executor.submit(extract_text_timed, file_path): file_path
+        for file_path in file_paths
+    }
+    for future in as_completed(futures):
+        file_path = futures[future]
+        try:
+            text, seconds = future.result()
+        except BrokenProcessPool as e:
+            logger.error("Error extracting text from %s: %s", file_path, e)
+            shutdown_extract_executor()
+            text, seconds = "", 0.0
+        except Exception as e:
+            logger.error("Error extracting text from %s: %s", file_path, e)
+            text, seconds = "", 0.0
+        yield file_path, record_extraction(file_path, text, seconds)
 
-def move_file_to_correct_directory(
-    file_path: str,
-    doc_type: str,
-    document_date: datetime
-) -> Optional[str]:
+
+def get_extract_executor() -> ProcessPoolExecutor:
     """
-    Move a file to the appropriate directory based on classification.
+    Return the extraction process pool, starting it on first use.
 
-    Args:
-        file_path: Source file path.
-        doc_type: Document type classification label.
-        document_date: Date to use for organizing.
+    The pool lives as long as the process, so its EXTRACT_WORKERS workers
+    are forked once instead of on every cycle. A pool broken by a crashed
+    worker is dropped and replaced on the next call.
 
     Returns:
-        The target file path if successful, None otherwise.
+        The shared process pool.
     """
-    if doc_type is None:
-        return None
+    global _extract_executor
+    if _extract_executor is None:
+        _extract_executor = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _extract_executor
 
-    # Map classification label to directory name
-    dir_name = LABEL_TO_DIR.get(doc_type, doc_type + "s")
 
-    week_of_month = get_week_of_month(document_date)
+def shutdown_extract_executor() -> None:
+    """Stop the extraction process pool, if it was started."""
+    global _extract_executor
+    executor, _extract_executor = _extract_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
 
-    target_dir = os.path.join(
-        OUTPUT_DIR, dir_name, str(document_date.year),
-        f"Month_{document_date.month}", f"Week_{week_of_month}"
-    )
 
-    try:
-        os.makedirs(target_dir, exist_ok=True)
-    except OSError as e:
-        logger.error("Failed to create directory %s: %s", target_dir, e)
-        return None
+def reload_labels(classifier=None) -> bool:
+    """
+    Pick up changes to the labels file between processing cycles.
 
-    target_file_path = os.path.join(target_dir, os.path.basename(file_path))
+    Args:
+        classifier: The loaded classifier; label prototypes it caches are
+            dropped when the labels change.
 
-    # Handle duplicate files
-    if os.path.exists(target_file_path):
-        logger.info("Found duplicate file: %s. Renaming.", target_file_path)
-        base_name, ext = os.path.splitext(target_file_path)
-        counter = 1
-        while os.path.exists(f"{base_name}_{counter}{ext}"):
-            counter += 1
-        target_file_path = f"{base_name}_{counter}{ext}"
+    Returns:
+        True if the labels were reloaded.
+    """
+    if not LABEL_REGISTRY.reload():
+        return False
 
-    try:
-        shutil.move(file_path, target_file_path)
-        logger.info("Moved %s to %s", file_path, target_file_path)
-        return target_file_path
-    except (OSError, shutil.Error) as e:
-        logger.error("Failed to move file %s: %s", file_path, e)
-        return None
+    if isinstance(classifier, EmbeddingClassifier):
+        classifier.clear_prototypes()
+    if not LAZY_DIRECTORIES:
+        setup_directory_structure()
+    logger.info("Candidate labels: %s", ", ".join(CANDIDATE_LABELS))
+    return True
 
 
-def display_sorting_progress(
-    file_name: str,
-    doc_type: str,
-    remaining_time: int
-) -> None:
+def get_classification_cache() -> Optional[ClassificationCache]:
     """
-    Display sorting progress in the console.
+    Return the persistent classification cache, opening it on first use.
 
-    Args:
-        file_name: Name of the file being processed.
-        doc_type: Document type classification.
-        remaining_time: Seconds remaining until next check.
+    Returns:
+        The cache, or None if caching is disabled or the database cannot
+        be opened.
     """
-    print(
-        f"\rSorting document: {file_name} | Classified as: {doc_type} | "
-        f"Remaining time: {remaining_time}s",
-        end=""
-    )
+    global _classification_cache
+
+    if _classification_cache is None and CACHE_PATH:
+        try:
+            _classification_cache = ClassificationCache(CACHE_PATH, CACHE_MAX_ENTRIES)
+        except (sqlite3.Error, ValueError) as e:
+            logger.error("Failed to open classification cache %s: %s", CACHE_PATH, e)
+            return None
+    return _classification_cache
 
 
-def process_files(classifier) -> int:
+def shape_text(text: str) -> List[str]:
     """
-    Process all files in the input directory.
+    Cut a document's text down to the input sent to the classifier.
+
+    Tokens are approximated by whitespace-separated words, which keeps the
+    shaping independent of the model's tokenizer.
 
     Args:
-        classifier: The classification pipeline.
+        text: Extracted document text.
 
     Returns:
-        Number of files successfully processed.
+        One or more text segments to classify, according to INPUT_STRATEGY.
     """
-    try:
-        files = [f for f in os.listdir(INPUT_DIR) if f.endswith('.pdf')]
-    except OSError as e:
-        logger.error("Failed to list input directory: %s", e)
-        return 0
+    if INPUT_STRATEGY == "full":
+        return [text]
 
-    if not files:
-        logger.info("No PDF files to sort. Checking again in %d seconds.", CHECK_INTERVAL)
-        return 0
+    words = text.split()
+    if len(words) <= MAX_INPUT_TOKENS:
+        return [text]
 
-    processed = 0
-    for file_name in files:
-        file_path = os.path.join(INPUT_DIR, file_name)
+    if INPUT_STRATEGY == "head":
+        return [" ".join(words[:MAX_INPUT_TOKENS])]
+    if INPUT_STRATEGY == "head_tail":
+        head = MAX_INPUT_TOKENS // 2
+        tail = MAX_INPUT_TOKENS - head
+        return [" ".join(words[:head] + words[-tail:])]
+    if INPUT_STRATEGY == "chunks":
+        chunks = [
+            " ".join(words[start:start + MAX_INPUT_TOKENS])
+            for start in range(0, len(words), MAX_INPUT_TOKENS)
+        ]
+        return chunks[:MAX_CHUNKS]
 
-        doc_type = classify_document(file_path, classifier)
+    logger.warning("Unknown input strategy %r; using full text.", INPUT_STRATEGY)
+    return [text]
 
-        if doc_type is None:
-            continue
 
-        logger.info("Document %s classified as: %s", file_name, doc_type)
+def aggregate_chunk_results(results: List[Dict]) -> Dict:
+    """
+    Combine the results of several chunks of one document.
 
-        display_sorting_progress(file_name, doc_type, CHECK_INTERVAL)
+    Args:
+        results: Classifier results, one per chunk.
 
-        result = move_file_to_correct_directory(file_path, doc_type, datetime.now())
-        if result:
-            processed += 1
+    Returns:
+        A single result whose scores are the mean score of each label
+        across chunks, ordered from best to worst.
+    """
+    totals: Dict[str, float] = {}
+    for result in results:
+        for label, score in zip(result['labels'], result['scores']):
+            totals[label] = totals.get(label, 0.0) + score
 
-    return processed
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return {
+        'labels': [label for label, _ in ranked],
+        'scores': [total / len(results) for _, total in ranked],
+    }
 
 
-def main() -> None:
-    """Main entry point for the document sorter service."""
-    logger.info("Starting Smart File Organizer...")
+def get_rule_classifier() -> Optional[RulePreClassifier]:
+    """
+    Return the rule pre-classifier, building it on first use.
 
-    setup_directory_structure()
-    classifier = load_classifier()
+    Returns:
+        The pre-classifier, or None if rules are disabled or the rules
+        file cannot be loaded.
+    """
+    global _rule_classifier
 
-    logger.info("Monitoring %s for incoming documents...", INPUT_DIR)
+    if _rule_classifier is None and RULES_ENABLED:
+        try:
+            rules = load_rules(RULES_PATH) if RULES_PATH else DEFAULT_RULES
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load classification rules %s: %s", RULES_PATH, e)
+            return None
+        _rule_classifier = RulePreClassifier(rules, RULE_THRESHOLD, RULE_SCAN_CHARS)
+    return _rule_classifier
 
-    while True:
-        start_time = time.time()
 
-        processed = process_files(classifier)
+def get_metadata_rule_classifier() -> Optional[RulePreClassifier]:
+    """
+    Return the rule classifier applied to PDF metadata, building it on first use.
 
-        elapsed_time = time.time() - start_time
-        if processed > 0:
-            logger.info(
-                "Processed %d files in %.2f seconds.",
-                processed, elapsed_time
-            )
+    Returns:
+        The classifier, or None if the metadata fast path is disabled or
+        the rules file cannot be loaded.
+    """
+    global _metadata_rule_classifier
+
+    if _metadata_rule_classifier is None and METADATA_RULES_ENABLED:
+        try:
+            rules = load_rules(METADATA_RULES_PATH) if METADATA_RULES_PATH else DEFAULT_RULES
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load metadata rules %s: %s", METADATA_RULES_PATH, e)
+            return None
+        _metadata_rule_classifier = RulePreClassifier(rules, RULE_THRESHOLD, RULE_SCAN_CHARS)
+    return _metadata_rule_classifier
+
+
+def classify_by_metadata(file_path: str) -> Optional[Tuple[Dict, datetime]]:
+    """
+    Classify and date a PDF from its metadata alone.
+
+    Args:
+        file_path: Path to the PDF file.
+
+    Returns:
+        The rule result and the filing date, or None if the fast path is
+        disabled or no single label's rule matches the title, subject or
+        keywords.
+    """
+    rules = get_metadata_rule_classifier()
+    if rules is None:
+        return None
+
+    metadata = read_pdf_metadata(file_path)
+    text = metadata_text(metadata)
+    if not text:
+        return None
+
+    result = rules.classify(text, CANDIDATE_LABELS)
+    if result is None:
+        return None
+
+    logger.debug("Classified %s from its metadata by rule %s", file_path, result['rule'])
+    # A date in the title or subject wins over the creation date
+    return result, resolve_document_date(file_path, text, metadata)
+
+
+def file_by_metadata(file_paths: List[str]) -> Tuple[int, List[str]]:
+    """
+    File every document the metadata fast path can classify.
+
+    Args:
+        file_paths: Paths of the PDF files to process.
+
+    Returns:
+        Number of files filed, and the paths that still need text
+        extraction and classification.
+    """
+    if get_metadata_rule_classifier() is None:
+        return 0, file_paths
+
+    filed = 0
+    remaining = []
+    for file_path in file_paths:
+        shortcut = classify_by_metadata(file_path)
+        if shortcut is None:
+            remaining.append(file_path)
+        elif file_document(file_path, *shortcut):
+            filed += 1
+    return filed, remaining
+
+
+def classify_texts(texts: List[str], classifier) -> List[Optional[Dict]]:
+    """
+    Classify several extracted texts with one batched pipeline call.
+
+    Texts matched by a confident rule are classified without the model.
+    The rest are shaped with shape_text and looked up in the
+    classification cache; only the remaining ones are sent to the
+    classifier.
+
+    Args:
+        texts: Extracted document texts.
+        classifier: The classification pipeline.
+
+    Returns:
+        One result dict (with 'labels' and 'scores') per text, in input
+        order. Entries are None for texts whose classification failed.
+    """
+    if not texts:
+        return []
+
+    results: List[Optional[Dict]] = [None] * len(texts)
+
+    rules = get_rule_classifier()
+    if rules is not None:
+        results = [rules.classify(text, CANDIDATE_LABELS) for text in texts]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    segments = {i: shape_text(texts[i]) for i in missing}
+
+    cache = get_classification_cache()
+    if cache is not None:
+        keys = {
+            i: ClassificationCache.make_key(
+                "\x1e".join(parts), CANDIDATE_LABELS, classifier_signature()
+            )
+            for i, parts in segments.items()
+        }
+        for i in missing:
+            results[i] = cache.get(keys[i])
+        missing = [i for i in missing if results[i] is None]
+        if not missing:
+            return results
+
+    inputs: List[str] = []
+    owners: List[int] = []
+    for i in missing:
+        inputs.extend(segments[i])
+        owners.extend([i] * len(segments[i]))
+
+    try:
+        start_time = time.time()
+        fresh = classifier(
+            inputs, CANDIDATE_LABELS,
+            batch_size=BATCH_SIZE, hypothesis_template=HYPOTHESIS_TEMPLATE
+        )
+        elapsed_time = time.time() - start_time
+        CLASSIFY_SECONDS.observe(elapsed_time)
+        logger.debug("Classified %d sequence(s) in %.3f seconds", len(inputs), elapsed_time)
+    except Exception as e:
+        logger.error("Classification of %d document(s) failed: %s", len(missing), e)
+        return results
+
+    # The pipeline unwraps single-element inputs into a bare dict
+    if isinstance(fresh, dict):
+        fresh = [fresh]
+
+    grouped: Dict[int, List[Dict]] = {}
+    for i, result in zip(owners, fresh):
+        grouped.setdefault(i, []).append(result)
+
+    for i, parts in grouped.items():
+        result = parts[0] if len(parts) == 1 else aggregate_chunk_results(parts)
+        results[i] = result
+        if cache is not None:
+            cache.put(keys[i], result)
+
+    return results
+
+
+def classify_document(file_path: str, classifier) -> Optional[str]:
+    """
+    Classify a document using zero-shot classification.
+
+    Args:
+        file_path: Path to the PDF file.
+        classifier: The classification pipeline.
+
+    Returns:
+        The document type label, or None if classification fails.
+    """
+    text = record_extraction(file_path, *extract_text_timed(file_path))
+    if not text:
+        return None
+
+    result = classify_texts([text], classifier)[0]
+    if result is None:
+        return None
+
+    doc_type = result['labels'][0]
+    logger.debug(
+        "Classified %s as %s with confidence %.2f",
+        file_path, doc_type, result['scores'][0]
+    )
+    return doc_type
+
+
+def _plausible_date(date: datetime) -> bool:
+    """Whether a date found in a document can be its filing date."""
+    return DATE_MIN_YEAR <= date.year <= datetime.now().year + 1
+
+
+def read_pdf_metadata(file_path: str) -> Dict[str, str]:
+    """
+    Read the METADATA_FIELDS of a PDF's document information dictionary.
+
+    Only the trailer and the information dictionary are parsed; no page is
+    laid out, so this costs a fraction of a text extraction.
+
+    Args:
+        file_path: Path to the PDF file.
+
+    Returns:
+        The non-empty fields as strings; empty if the file cannot be read.
+    """
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            info = pdf.metadata
+    except Exception as e:
+        logger.debug("Cannot read metadata of %s: %s", file_path, e)
+        return {}
+
+    metadata = {}
+    for field in METADATA_FIELDS:
+        value = info.get(field)
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', errors='ignore')
+        if value and isinstance(value, str) and value.strip():
+            metadata[field] = value.strip()
+    return metadata
+
+
+def metadata_text(metadata: Dict[str, str]) -> str:
+    """Join the descriptive metadata fields into text that rules can search."""
+    return "\n".join(
+        metadata[field] for field in ("Title", "Subject", "Keywords") if field in metadata
+    )
+
+
+def pdf_creation_date(
+    file_path: str,
+    metadata: Optional[Dict[str, str]] = None
+) -> Optional[datetime]:
+    """
+    Read the creation date from a PDF's document information dictionary.
+
+    Args:
+        file_path: Path to the PDF file.
+        metadata: Metadata already read with read_pdf_metadata, if any.
+
+    Returns:
+        The creation date, or None if it is missing, unreadable or implausible.
+    """
+    if metadata is None:
+        metadata = read_pdf_metadata(file_path)
+    date = parse_pdf_date(metadata.get('CreationDate'))
+    return date if date is not None and _plausible_date(date) else None
+
+
+def resolve_document_date(
+    file_path: str,
+    text: str = "",
+    metadata: Optional[Dict[str, str]] = None
+) -> datetime:
+    """
+    Choose the date a document is filed under.
+
+    The first date found in the extracted text (formats tried in
+    DATE_FORMATS order) wins; otherwise the PDF creation date, and as a
+    last resort the file's modification time.
+
+    Args:
+        file_path: Path to the PDF file.
+        text: Extracted text of the document.
+        metadata: Metadata already read with read_pdf_metadata, if any.
+
+    Returns:
+        The filing date.
+    """
+    head = text[:DATE_SCAN_CHARS] if DATE_SCAN_CHARS else text
+    date = extract_date(head, DATE_FORMATS, _plausible_date)
+    source = "text"
+    if date is None:
+        date, source = pdf_creation_date(file_path, metadata), "metadata"
+    if date is None:
+        try:
+            date, source = datetime.fromtimestamp(os.path.getmtime(file_path)), "mtime"
+        except OSError:
+            date, source = datetime.now(), "now"
+
+    DOCUMENT_DATES.inc(source=source)
+    logger.debug("Filing date of %s: %s (from %s)", file_path, date.date(), source)
+    return date
+
+
+def get_week_of_month(date: datetime) -> int:
+    """
+    Calculate the week number within a month (1-5).
+
+    Args:
+        date: The datetime object.
+
+    Returns:
+        Week number (1-5).
+    """
+    day_of_month = date.day
+    week_of_month = (day_of_month - 1) // 7 + 1
+    return min(week_of_month, 5)  # Cap at 5 weeks
+
+
+def move_file_to_correct_directory(
+    file_path: str,
+    doc_type: str,
+    document_date: datetime
+) -> Optional[str]:
+    """
+    Move a file to the appropriate directory based on classification.
+
+    Args:
+        file_path: Source file path.
+        doc_type: Document type classification label.
+        document_date: Date to use for organizing.
+
+    Returns:
+        The target file path if successful, None otherwise.
+    """
+    if doc_type is None:
+        return None
+
+    # Map classification label to directory name
+    dir_name = LABEL_REGISTRY.directory_for(doc_type)
+
+    week_of_month = get_week_of_month(document_date)
+
+    target_dir = os.path.join(
+        OUTPUT_DIR, dir_name, str(document_date.year),
+        f"Month_{document_date.month}", f"Week_{week_of_month}"
+    )
+
+    with MOVE_SECONDS.time():
+        return _move_into_directory(file_path, target_dir)
+
+
+def _move_into_directory(file_path: str, target_dir: str) -> Optional[str]:
+    """
+    Move a file into a directory, renaming it if the name is taken.
+
+    Args:
+        file_path: Source file path.
+        target_dir: Destination directory, created if needed.
+
+    Returns:
+        The target file path if successful, None otherwise.
+    """
+    try:
+        ensure_directory(target_dir)
+    except OSError as e:
+        logger.error("Failed to create directory %s: %s", target_dir, e)
+        MOVE_FAILURES.inc()
+        return None
+
+    desired_path = os.path.join(target_dir, os.path.basename(file_path))
+    staged_path = None
+    try:
+        try:
+            target_file_path = _link_free_name(file_path, desired_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV and e.errno not in _NO_LINK_ERRNOS:
+                raise
+            # Another filesystem, or a file we may not link (another user's
+            # file under fs.protected_hardlinks, or no hard links at all):
+            # copy it under a hidden name first, so the archive name only
+            # ever appears with the complete content. The copy is ours, so
+            # it can be linked, or renamed where links are unsupported
+            fd, staged_path = tempfile.mkstemp(
+                dir=target_dir, prefix=f".{os.path.basename(file_path)}.", suffix=".part"
+            )
+            os.close(fd)
+            shutil.copy2(file_path, staged_path)
+            target_file_path = _link_free_name(staged_path, desired_path, rename=True)
+    except (OSError, shutil.Error) as e:
+        logger.error("Failed to move file %s: %s", file_path, e)
+        MOVE_FAILURES.inc()
+        # The directory may have been removed behind our back; recheck next time
+        _created_directories.discard(target_dir)
+        return None
+    finally:
+        if staged_path is not None:
+            _remove_quietly(staged_path)
+
+    try:
+        os.remove(file_path)
+    except OSError as e:
+        logger.error("Failed to remove %s after filing it: %s", file_path, e)
+        MOVE_FAILURES.inc()
+        _remove_quietly(target_file_path)
+        return None
+
+    logger.info("Moved %s to %s", file_path, target_file_path)
+    return target_file_path
+
+
+def _link_free_name(source_path: str, target_file_path: str, rename: bool = False) -> str:
+    """
+    Hard-link a file under a free name without overwriting anything.
+
+    Linking fails atomically if the name exists, so concurrent moves into
+    the same directory never pick the same name, and the name is never
+    visible before the file is complete. A crash leaves at worst the
+    source still in place, never an empty file in the archive.
+
+    Args:
+        source_path: File to link; must be on the same filesystem.
+        target_file_path: Preferred destination path.
+        rename: Rename the source with rename_no_replace instead, for a
+            staged copy that may not be linked.
+
+    Returns:
+        The linked path, with a "_<n>" suffix if the name was taken.
+
+    Raises:
+        OSError: If the link cannot be created (errno EXDEV across
+            filesystems, EPERM or ENOTSUP where it is not allowed).
+    """
+    base_name, ext = os.path.splitext(target_file_path)
+    candidate = target_file_path
+    counter = 0
+    while True:
+        try:
+            if rename:
+                rename_no_replace(source_path, candidate)
+            else:
+                os.link(source_path, candidate)
+        except FileExistsError:
+            if counter == 0:
+                logger.info("Found duplicate file: %s. Renaming.", target_file_path)
+                DUPLICATE_RENAMES.inc()
+            counter += 1
+            candidate = f"{base_name}_{counter}{ext}"
+            continue
+        return candidate
+
+
+def _remove_quietly(path: str) -> None:
+    """Delete a file, ignoring errors."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def quarantine_file(file_path: str, result: Dict) -> Optional[str]:
+    """
+    Move a low-confidence document to the review directory.
+
+    The classifier scores are written next to the file as
+    ``<name>.scores.json`` so a reviewer can see what the model proposed.
+
+    Args:
+        file_path: Source file path.
+        result: Classifier result with 'labels' and 'scores'.
+
+    Returns:
+        The quarantined file path if successful, None otherwise.
+    """
+    target_file_path = _move_into_directory(file_path, QUARANTINE_DIR)
+    if target_file_path is None:
+        return None
+
+    scores = {
+        'source': file_path,
+        'quarantined_at': datetime.now().isoformat(timespec='seconds'),
+        'min_confidence': MIN_CONFIDENCE,
+        'labels': list(result['labels']),
+        'scores': [float(score) for score in result['scores']],
+    }
+    try:
+        with open(target_file_path + ".scores.json", 'w', encoding='utf-8') as f:
+            json.dump(scores, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        logger.error("Failed to write scores for %s: %s", target_file_path, e)
+    return target_file_path
+
+
+def display_sorting_progress(
+    file_name: str,
+    doc_type: str,
+    remaining_time: int
+) -> None:
+    """
+    Display sorting progress in the console.
+
+    Args:
+        file_name: Name of the file being processed.
+        doc_type: Document type classification.
+        remaining_time: Seconds remaining until next check.
+    """
+    print(
+        f"\rSorting document: {file_name} | Classified as: {doc_type} | "
+        f"Remaining time: {remaining_time}s",
+        end=""
+    )
+
+
+def list_input_files(file_names: Optional[List[str]] = None) -> List[str]:
+    """
+    List the PDF files waiting in the input directory.
+
+    With CLAIM_FILES every file is claimed for this worker first, and only
+    the claimed paths are returned. A full scan also hands files this
+    worker claimed earlier but did not file back to INPUT_DIR, so they are
+    retried like any other waiting file.
+
+    Args:
+        file_names: Names of the files inside INPUT_DIR to consider. When
+            omitted, the whole input directory is scanned.
+
+    Returns:
+        Paths of the PDF files to process.
+    """
+    if file_names is not None:
+        files = [
+            f for f in file_names
+            if f.endswith('.pdf') and os.path.isfile(os.path.join(INPUT_DIR, f))
+        ]
+    else:
+        if CLAIM_FILES:
+            release_claims()
+        try:
+            files = [f for f in os.listdir(INPUT_DIR) if f.endswith('.pdf')]
+        except OSError as e:
+            logger.error("Failed to list input directory: %s", e)
+            return []
+
+        if not files:
+            logger.info("No PDF files to sort. Checking again in %d seconds.", CHECK_INTERVAL)
+
+    file_paths = [os.path.join(INPUT_DIR, file_name) for file_name in files]
+    if not CLAIM_FILES:
+        return file_paths
+
+    claimed = [claim_file(file_path) for file_path in file_paths]
+    return [file_path for file_path in claimed if file_path is not None]
+
+
+def claim_directory() -> str:
+    """Return the directory holding the files claimed by this worker."""
+    return os.path.join(INPUT_DIR, PROCESSING_DIR_NAME, WORKER_ID)
+
+
+def claim_file(file_path: str) -> Optional[str]:
+    """
+    Claim a waiting file for this worker.
+
+    The file is renamed into the worker's claim directory. The rename is
+    atomic, so when several workers try to claim the same file exactly one
+    of them succeeds. It never replaces a file already in the claim
+    directory: if an unfiled document of the same name is still there, the
+    new one is claimed as "<name>_<n>.pdf".
+
+    Args:
+        file_path: Path of the file inside INPUT_DIR.
+
+    Returns:
+        The claimed path, or None if another worker claimed it first.
+    """
+    try:
+        return rename_to_free_name(
+            file_path, os.path.join(claim_directory(), os.path.basename(file_path))
+        )
+    except FileNotFoundError:
+        if not os.path.isdir(claim_directory()):
+            os.makedirs(claim_directory(), exist_ok=True)
+            return claim_file(file_path)
+        logger.debug("%s was claimed by another worker", file_path)
+        return None
+    except OSError as e:
+        logger.error("Failed to claim %s: %s", file_path, e)
+        return None
+
+
+def _try_lock_directory(directory: str) -> Optional[int]:
+    """
+    Take the exclusive lock on a claim directory without waiting.
+
+    Returns:
+        The descriptor holding the lock, or None if another process holds it.
+        Closing the descriptor releases the lock.
+    """
+    fd = os.open(os.path.join(directory, CLAIM_LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def lock_claim_directory() -> None:
+    """
+    Lock this worker's claim directory for the life of the process.
+
+    The lock shows other workers that the claimed files are in flight, and
+    stops a second worker with the same WORKER_ID from sharing (and
+    releasing) them. Another worker may hold the lock for a moment while it
+    releases the directory's files, so the lock is retried for a few seconds.
+
+    Raises:
+        RuntimeError: If a running process with the same WORKER_ID holds it.
+        OSError: If the directory or lock file cannot be created.
+    """
+    global _claim_lock
+    os.makedirs(claim_directory(), exist_ok=True)
+    if fcntl is None or _claim_lock is not None:
+        return
+
+    deadline = time.monotonic() + _CLAIM_LOCK_WAIT
+    while True:
+        _claim_lock = _try_lock_directory(claim_directory())
+        if _claim_lock is not None:
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(
+                f"Worker ID {WORKER_ID!r} is in use by another running sorter; "
+                "set SORTER_WORKER_ID to a value unique to this worker"
+            )
+        time.sleep(0.2)
+
+
+def release_claims() -> int:
+    """
+    Return unfinished claimed files to INPUT_DIR.
+
+    Such files were claimed but not filed, because extraction or
+    classification failed or the worker stopped before moving them. This
+    worker's own claim directory is always released; other workers'
+    directories are released only when their lock is free, i.e. their
+    worker is no longer running. A file whose name was dropped into
+    INPUT_DIR again in the meantime is released as "<name>_<n>.pdf"
+    rather than replacing the new file.
+
+    Returns:
+        Number of files released.
+    """
+    released = _release_directory(claim_directory())
+    if fcntl is None:
+        return released
+
+    processing_dir = os.path.join(INPUT_DIR, PROCESSING_DIR_NAME)
+    try:
+        worker_ids = os.listdir(processing_dir)
+    except OSError:
+        return released
+
+    for worker_id in worker_ids:
+        directory = os.path.join(processing_dir, worker_id)
+        if worker_id == WORKER_ID or not os.path.isdir(directory):
+            continue
+        try:
+            fd = _try_lock_directory(directory)
+        except OSError as e:
+            logger.error("Failed to lock claim directory %s: %s", directory, e)
+            continue
+        if fd is None:
+            continue  # its worker is running
+        try:
+            orphaned = _release_directory(directory)
+        finally:
+            os.close(fd)
+        if orphaned:
+            logger.info("Recovered %d file(s) claimed by stopped worker %s", orphaned, worker_id)
+        released += orphaned
+    return released
+
+
+def _release_directory(directory: str) -> int:
+    """Move the claimed files in one claim directory back to INPUT_DIR."""
+    try:
+        names = [name for name in os.listdir(directory) if name != CLAIM_LOCK_NAME]
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        logger.error("Failed to list claimed files: %s", e)
+        return 0
+
+    released = 0
+    for name in names:
+        try:
+            rename_to_free_name(os.path.join(directory, name), os.path.join(INPUT_DIR, name))
+            released += 1
+        except OSError as e:
+            logger.error("Failed to release claimed %s: %s", name, e)
+    if released:
+        logger.info("Released %d unfinished claimed file(s) back to %s", released, INPUT_DIR)
+    return released
+
+
+def _load_renameat2():
+    """Return libc's renameat2, or None where it is unavailable."""
+    global _renameat2
+    if _renameat2 is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            _renameat2 = libc.renameat2
+        except (OSError, AttributeError):
+            _renameat2 = False
+    return _renameat2 or None
+
+
+def rename_no_replace(source: str, target: str) -> None:
+    """
+    Rename a file unless the target name already exists.
+
+    Uses renameat2(RENAME_NOREPLACE) where the kernel and filesystem
+    support it, then a hard link followed by unlinking the source, and
+    only on filesystems with neither an existence check before a plain
+    rename.
+
+    Args:
+        source: File to rename.
+        target: New path; must be on the same filesystem.
+
+    Raises:
+        FileExistsError: If the target exists.
+        OSError: If the rename fails for another reason.
+    """
+    renameat2 = _load_renameat2()
+    if renameat2 is not None:
+        if renameat2(
+            _AT_FDCWD, os.fsencode(source), _AT_FDCWD, os.fsencode(target), _RENAME_NOREPLACE
+        ) == 0:
+            return
+        error = ctypes.get_errno()
+        if error not in _UNSUPPORTED_ERRNOS:
+            raise OSError(error, os.strerror(error), source, None, target)
+
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno not in _NO_LINK_ERRNOS:
+            raise
+        if os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), target) from None
+        os.rename(source, target)
+        return
+    os.unlink(source)
+
+
+def rename_to_free_name(source: str, target: str) -> str:
+    """
+    Rename a file to target, or to "<name>_<n><ext>" if target is taken.
+
+    Args:
+        source: File to rename.
+        target: Preferred new path.
+
+    Returns:
+        The path the file was renamed to.
+
+    Raises:
+        OSError: If the rename fails for a reason other than a taken name.
+    """
+    base_name, ext = os.path.splitext(target)
+    candidate = target
+    counter = 0
+    while True:
+        try:
+            rename_no_replace(source, candidate)
+        except FileExistsError:
+            counter += 1
+            candidate = f"{base_name}_{counter}{ext}"
+            continue
+        return candidate
+
+
+def process_files(classifier, file_names: Optional[List[str]] = None) -> int:
+    """
+    Process all files in the input directory.
+
+    Documents the metadata fast path can classify are filed first; only
+    the rest have their text extracted and classified.
+
+    Args:
+        classifier: The classification pipeline.
+        file_names: Names of the files inside INPUT_DIR to process. When
+            omitted, the whole input directory is scanned.
+
+    Returns:
+        Number of files successfully processed.
+    """
+    file_paths = list_input_files(file_names)
+    if not file_paths:
+        return 0
+
+    processed, file_paths = file_by_metadata(file_paths)
+    if not file_paths:
+        return processed
+
+    if PIPELINE_ENABLED:
+        return processed + _process_files_pipelined(file_paths, classifier)
+
+    batch_paths: List[str] = []
+    batch_texts: List[str] = []
+
+    for file_path, text in iter_extracted_texts(file_paths):
+        if not text:
+            continue
+
+        batch_paths.append(file_path)
+        batch_texts.append(text)
+
+        if len(batch_texts) >= BATCH_SIZE:
+            processed += _classify_and_move_batch(batch_paths, batch_texts, classifier)
+            batch_paths, batch_texts = [], []
+
+    if batch_texts:
+        processed += _classify_and_move_batch(batch_paths, batch_texts, classifier)
+
+    return processed
+
+
+def _process_files_pipelined(file_paths: List[str], classifier) -> int:
+    """
+    Process files through concurrent extract, classify and move stages.
+
+    Extraction of later files overlaps with classification and moves of
+    earlier ones. The classify stage batches whatever extracted texts are
+    queued, up to BATCH_SIZE, and the queue-depth metrics of every stage
+    are logged when the files are done.
+
+    Args:
+        file_paths: Paths of the PDF files to process.
+        classifier: The classification pipeline.
+
+    Returns:
+        Number of files successfully processed.
+    """
+    executor = None
+    if EXTRACT_WORKERS > 1 and len(file_paths) > 1:
+        executor = get_extract_executor()
+
+    def extract(paths: List[str]) -> List[Tuple[str, str, datetime]]:
+        extracted = []
+        for file_path in paths:
+            if executor is not None:
+                try:
+                    text, seconds = executor.submit(extract_text_timed, file_path).result()
+                except BrokenProcessPool:
+                    shutdown_extract_executor()
+                    raise
+            else:
+                text, seconds = extract_text_timed(file_path)
+            if record_extraction(file_path, text, seconds):
+                extracted.append((file_path, text, resolve_document_date(file_path, text)))
+        return extracted
+
+    def classify(items: List[Tuple[str, str, datetime]]) -> List[Tuple[str, Dict, datetime]]:
+        results = classify_texts([text for _, text, _ in items], classifier)
+        return [
+            (file_path, result, document_date)
+            for (file_path, _, document_date), result in zip(items, results)
+            if result is not None
+        ]
+
+    def move(items: List[Tuple[str, Dict, datetime]]) -> List[str]:
+        return [
+            file_path for file_path, result, document_date in items
+            if file_document(file_path, result, document_date)
+        ]
+
+    pipeline_stages = StagedPipeline([
+        Stage("extract", extract, workers=EXTRACT_WORKERS, queue_size=QUEUE_SIZE),
+        Stage(
+            "classify", classify, workers=CLASSIFY_WORKERS,
+            queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE
+        ),
+        Stage("move", move, workers=MOVE_WORKERS, queue_size=QUEUE_SIZE),
+    ])
+    moved = pipeline_stages.run(file_paths)
+
+    log_stage_metrics(pipeline_stages)
+    return len(moved)
+
+
+def log_stage_metrics(pipeline_stages: StagedPipeline) -> None:
+    """Log the counters and queue depth of every stage of a pipeline run."""
+    for name, stats in pipeline_stages.metrics().items():
+        logger.info(
+            "Stage %s: %d item(s), %d failed, %d worker(s), busy %.2fs, "
+            "max queue depth %d/%d",
+            name, stats['processed'], stats['failed'], stats['workers'],
+            stats['busy_seconds'], stats['max_queue_depth'], stats['queue_size']
+        )
+
+
+def _classify_and_move_batch(
+    file_paths: List[str],
+    texts: List[str],
+    classifier
+) -> int:
+    """
+    Classify a batch of extracted texts and move each file into the archive.
+
+    Args:
+        file_paths: Source file paths, aligned with texts.
+        texts: Extracted text of each file.
+        classifier: The classification pipeline.
+
+    Returns:
+        Number of files successfully moved.
+    """
+    results = classify_texts(texts, classifier)
+    return sum(
+        1 for file_path, text, result in zip(file_paths, texts, results)
+        if result is not None
+        and file_document(file_path, result, resolve_document_date(file_path, text))
+    )
+
+
+def file_document(
+    file_path: str,
+    result: Dict,
+    document_date: Optional[datetime] = None
+) -> bool:
+    """
+    Move a classified file into the archive, or quarantine it.
+
+    Args:
+        file_path: Source file path.
+        result: Classifier output with 'labels' and 'scores'.
+        document_date: Date to file the document under; resolved from the
+            PDF metadata or modification time when omitted.
+
+    Returns:
+        True if the file was moved.
+    """
+    doc_type = result['labels'][0]
+    file_name = os.path.basename(file_path)
+
+    if result['scores'][0] < MIN_CONFIDENCE:
+        logger.warning(
+            "Document %s classified as %s with low confidence %.2f. Quarantining.",
+            file_name, doc_type, result['scores'][0]
+        )
+        if quarantine_file(file_path, result) is None:
+            return False
+        DOCUMENTS_QUARANTINED.inc(label=doc_type)
+        return True
+
+    logger.info("Document %s classified as: %s", file_name, doc_type)
+
+    display_sorting_progress(file_name, doc_type, CHECK_INTERVAL)
+
+    if document_date is None:
+        document_date = resolve_document_date(file_path)
+
+    if not move_file_to_correct_directory(file_path, doc_type, document_date):
+        return False
+    DOCUMENTS_FILED.inc(label=doc_type)
+    return True
+
+
+def parse_inotify_events(buffer: bytes) -> List[Tuple[int, str]]:
+    """
+    Decode a buffer of raw inotify events.
+
+    Args:
+        buffer: Bytes read from an inotify file descriptor.
+
+    Returns:
+        The mask and file name of each event, in the order they were
+        reported. The name is empty for events without one, such as
+        IN_Q_OVERFLOW.
+    """
+    events = []
+    offset = 0
+    while offset + _INOTIFY_EVENT_HEADER.size <= len(buffer):
+        _, mask, _, name_len = _INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+        offset += _INOTIFY_EVENT_HEADER.size
+        raw_name = buffer[offset:offset + name_len].rstrip(b"\0")
+        offset += name_len
+        events.append((mask, os.fsdecode(raw_name)))
+    return events
+
+
+class InotifyWatcher:
+    """Watch a directory for files closed after writing or moved into it."""
+
+    def __init__(self, directory: str):
+        """
+        Start watching a directory.
+
+        Args:
+            directory: Directory to watch (not recursive).
+
+        Raises:
+            OSError: If inotify is unavailable or the watch cannot be added.
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            inotify_init1 = libc.inotify_init1
+            inotify_add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise OSError("inotify is not available on this platform") from e
+
+        self.fd = inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        wd = inotify_add_watch(
+            self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), directory)
+
+    def read_events(self, timeout: Optional[float] = None) -> Tuple[List[str], bool]:
+        """
+        Block until files land, then return every name queued so far.
+
+        Args:
+            timeout: Seconds to wait at most; None waits indefinitely.
+
+        Returns:
+            Names of the files that were written or moved in (empty on
+            timeout), and whether the kernel queue overflowed. After an
+            overflow events were lost and the directory must be rescanned.
+        """
+        if timeout is not None:
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+            if not readable:
+                return [], False
+
+        events = parse_inotify_events(os.read(self.fd, 64 * 1024))
+        overflowed = any(mask & IN_Q_OVERFLOW for mask, _ in events)
+        if overflowed:
+            logger.warning("inotify queue overflowed; rescanning %s.", INPUT_DIR)
+        return [name for _, name in events if name], overflowed
+
+    def close(self) -> None:
+        """Stop watching and release the inotify descriptor."""
+        os.close(self.fd)
+
+
+def log_cycle(processed: int, start_time: float) -> None:
+    """Log the throughput of one processing cycle."""
+    elapsed_time = time.time() - start_time
+    if processed > 0:
+        logger.info(
+            "Processed %d files in %.2f seconds.",
+            processed, elapsed_time
+        )
+        if _classification_cache is not None:
+            logger.info(
+                "Classification cache: %(hits)d hits, %(misses)d misses, "
+                "%(entries)d entries.", _classification_cache.stats()
+            )
+        if _rule_classifier is not None:
+            stats = _rule_classifier.stats()
+            logger.info(
+                "Rules short-circuited %d of %d documents: %s",
+                stats['short_circuited'], stats['checked'], stats['rule_hits']
+            )
+        if _metadata_rule_classifier is not None:
+            stats = _metadata_rule_classifier.stats()
+            logger.info(
+                "Metadata rules filed %d of %d tagged documents: %s",
+                stats['short_circuited'], stats['checked'], stats['rule_hits']
+            )
+
+
+def watch_input_directory(classifier) -> None:
+    """
+    Classify files as soon as inotify reports them in INPUT_DIR.
+
+    Files already waiting in the directory are processed first. After that
+    the loop blocks in the kernel until files land, and every file reported
+    by one read is processed (and batched) together. The whole directory is
+    rescanned when the inotify queue overflows and every RESCAN_INTERVAL
+    seconds, so files that failed or were missed are retried. Falls back to
+    polling when inotify is unavailable.
+
+    Args:
+        classifier: The classification pipeline.
+    """
+    try:
+        watcher = InotifyWatcher(INPUT_DIR)
+    except OSError as e:
+        logger.warning(
+            "Cannot watch %s for events (%s); falling back to polling.",
+            INPUT_DIR, e
+        )
+        poll_input_directory(classifier)
+        return
+
+    try:
+        last_scan = start_time = time.time()
+        log_cycle(process_files(classifier), start_time)
+
+        while True:
+            timeout = None
+            if RESCAN_INTERVAL:
+                timeout = max(0.0, last_scan + RESCAN_INTERVAL - time.time())
+            names, overflowed = watcher.read_events(timeout)
+
+            file_names: Optional[List[str]] = sorted(set(names))
+            if overflowed or (RESCAN_INTERVAL and time.time() - last_scan >= RESCAN_INTERVAL):
+                file_names = None
+                last_scan = time.time()
+            elif not file_names:
+                continue
+
+            reload_labels(classifier)
+            start_time = time.time()
+            log_cycle(process_files(classifier, file_names), start_time)
+    finally:
+        watcher.close()
+
+
+def poll_input_directory(classifier) -> None:
+    """
+    Rescan INPUT_DIR every CHECK_INTERVAL seconds.
+
+    Args:
+        classifier: The classification pipeline.
+    """
+    while True:
+        reload_labels(classifier)
+        start_time = time.time()
+
+        processed = process_files(classifier)
+
+        log_cycle(processed, start_time)
 
         for remaining_time in range(CHECK_INTERVAL, 0, -1):
             display_sorting_progress("Waiting...", "", remaining_time)
@@ -285,5 +2006,34 @@ def main() -> None:
         print()  # New line after countdown
 
 
+def start_metrics() -> None:
+    """Serve the metrics endpoint when METRICS_PORT is set."""
+    if not METRICS_PORT:
+        return
+    try:
+        start_metrics_server(METRICS_PORT, METRICS_HOST)
+    except OSError as e:
+        logger.error("Failed to start metrics endpoint on port %d: %s", METRICS_PORT, e)
+
+
+def main() -> None:
+    """Main entry point for the document sorter service."""
+    logger.info("Starting Smart File Organizer...")
+
+    setup_directory_structure()
+    start_metrics()
+    classifier = load_classifier()
+
+    logger.info("Monitoring %s for incoming documents...", INPUT_DIR)
+
+    try:
+        if WATCH_MODE == "events":
+            watch_input_directory(classifier)
+        else:
+            poll_input_directory(classifier)
+    finally:
+        shutdown_extract_executor()
+
+
 if __name__ == "__main__":
     main()
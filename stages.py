@@ -0,0 +1,298 @@
+"""
+Staged Pipeline - Concurrent Stages Connected by Bounded Queues
+
+This module runs a chain of processing stages (for the sorter: extract,
+classify and move) concurrently. Each stage reads from a bounded queue and
+feeds the next one, so disk, CPU and model work overlap while a slow stage
+holds back the stages before it instead of letting work pile up in memory.
+Stages run either on worker threads (run) or as coroutines on an asyncio
+event loop (run_async).
+"""
+
+import asyncio
+import inspect
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the input on a stage queue
+_DONE = object()
+
+
+def _take_batch(first, get_nowait: Callable, batch_size: int) -> Tuple[List, bool]:
+    """
+    Complete a batch with items that are already queued.
+
+    Args:
+        first: Item already taken from the queue.
+        get_nowait: Non-blocking getter of the stage queue.
+        batch_size: Maximum batch length.
+
+    Returns:
+        The batch, and whether the end marker was taken from the queue
+        (the caller must put it back for its next read).
+    """
+    batch = [first]
+    while len(batch) < batch_size:
+        try:
+            item = get_nowait()
+        except (queue.Empty, asyncio.QueueEmpty):
+            break
+        if item is _DONE:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+class Stage:
+    """One step of a StagedPipeline and its counters."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List], Iterable],
+        workers: int = 1,
+        queue_size: int = 16,
+        batch_size: int = 1
+    ):
+        """
+        Describe a stage.
+
+        Args:
+            name: Stage name used in logs and metrics.
+            handler: Called with a list of up to batch_size items; returns
+                the items passed on to the next stage. With run_async the
+                handler may be a coroutine function.
+            workers: Number of threads (or coroutines) running the handler.
+            queue_size: Capacity of the queue in front of the stage.
+            batch_size: Maximum number of queued items handed to the
+                handler at once. Batches never wait for items to arrive.
+
+        Raises:
+            ValueError: If workers, queue_size or batch_size is not positive.
+        """
+        if workers < 1 or queue_size < 1 or batch_size < 1:
+            raise ValueError(
+                f"Stage {name}: workers, queue_size and batch_size must be positive"
+            )
+
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.queue = None
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _observe_depth(self) -> None:
+        depth = self.queue.qsize()
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+
+    def _record(self, count: int, seconds: float, failed: bool) -> None:
+        with self._lock:
+            self.processed += count
+            self.busy_seconds += seconds
+            if failed:
+                self.failed += count
+
+    def metrics(self) -> Dict:
+        """Return the stage's configuration, counters and queue depth."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+                'max_queue_depth': self.max_depth,
+                'processed': self.processed,
+                'failed': self.failed,
+                'busy_seconds': self.busy_seconds,
+            }
+
+
+class StagedPipeline:
+    """Run items through a chain of concurrent stages."""
+
+    def __init__(self, stages: List[Stage]):
+        """
+        Create the pipeline.
+
+        Args:
+            stages: Stages in processing order.
+
+        Raises:
+            ValueError: If no stages are given.
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+
+        self.stages = stages
+        self._results: List = []
+        self._remaining: List[int] = []
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        self._results = []
+        self._remaining = [stage.workers for stage in self.stages]
+
+    def _finish_worker(self, index: int) -> bool:
+        """Count a worker of a stage as done; True for the stage's last worker."""
+        with self._lock:
+            self._remaining[index] -= 1
+            return self._remaining[index] == 0
+
+    @staticmethod
+    def _failed(stage: Stage, batch: List, error: Exception) -> List:
+        logger.error("Stage %s failed on %d item(s): %s", stage.name, len(batch), error)
+        return []
+
+    def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while (item := stage.queue.get()) is not _DONE:
+            batch, took_done = _take_batch(item, stage.queue.get_nowait, stage.batch_size)
+            if took_done:
+                # Leave the end marker for this worker's next read
+                stage.queue.put(_DONE)
+
+            start_time = time.perf_counter()
+            failed = False
+            try:
+                outputs = list(stage.handler(batch))
+            except Exception as e:
+                outputs, failed = self._failed(stage, batch, e), True
+            stage._record(len(batch), time.perf_counter() - start_time, failed)
+
+            if next_stage is None:
+                with self._lock:
+                    self._results.extend(outputs)
+            else:
+                for output in outputs:
+                    next_stage.queue.put(output)
+                    next_stage._observe_depth()
+
+        # The last worker of a stage to finish closes the next stage
+        if self._finish_worker(index) and next_stage is not None:
+            for _ in range(next_stage.workers):
+                next_stage.queue.put(_DONE)
+
+    def run(self, items: Iterable) -> List:
+        """
+        Feed items through every stage on worker threads and wait for them to drain.
+
+        Items are read lazily from the iterable, so a slow pipeline also
+        slows down the producer.
+
+        Args:
+            items: Input of the first stage.
+
+        Returns:
+            Outputs of the last stage, in completion order.
+        """
+        self._start()
+        for stage in self.stages:
+            stage.queue = queue.Queue(maxsize=stage.queue_size)
+
+        threads = [
+            threading.Thread(
+                target=self._worker, args=(index,),
+                name=f"{stage.name}-{n}", daemon=True
+            )
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        first = self.stages[0]
+        try:
+            for item in items:
+                first.queue.put(item)
+                first._observe_depth()
+        finally:
+            for _ in range(first.workers):
+                first.queue.put(_DONE)
+            for thread in threads:
+                thread.join()
+
+        return self._results
+
+    async def _async_worker(self, index: int) -> None:
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while (item := await stage.queue.get()) is not _DONE:
+            batch, took_done = _take_batch(item, stage.queue.get_nowait, stage.batch_size)
+            if took_done:
+                # Leave the end marker for this worker's next read
+                await stage.queue.put(_DONE)
+
+            start_time = time.perf_counter()
+            failed = False
+            try:
+                outputs = stage.handler(batch)
+                if inspect.isawaitable(outputs):
+                    outputs = await outputs
+                outputs = list(outputs)
+            except Exception as e:
+                outputs, failed = self._failed(stage, batch, e), True
+            stage._record(len(batch), time.perf_counter() - start_time, failed)
+
+            if next_stage is None:
+                self._results.extend(outputs)
+            else:
+                for output in outputs:
+                    await next_stage.queue.put(output)
+                    next_stage._observe_depth()
+
+        if self._finish_worker(index) and next_stage is not None:
+            for _ in range(next_stage.workers):
+                await next_stage.queue.put(_DONE)
+
+    async def run_async(self, items: Iterable) -> List:
+        """
+        Feed items through every stage as coroutines on the running event loop.
+
+        Handlers should be coroutine functions (or return awaitables) that
+        hand blocking work to executors; plain functions block the loop.
+
+        Args:
+            items: Input of the first stage, read lazily.
+
+        Returns:
+            Outputs of the last stage, in completion order.
+        """
+        self._start()
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+
+        workers = [
+            asyncio.create_task(self._async_worker(index))
+            for index, stage in enumerate(self.stages)
+            for _ in range(stage.workers)
+        ]
+
+        first = self.stages[0]
+        try:
+            for item in items:
+                await first.queue.put(item)
+                first._observe_depth()
+        finally:
+            for _ in range(first.workers):
+                await first.queue.put(_DONE)
+            await asyncio.gather(*workers)
+
+        return self._results
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Return the metrics of every stage, keyed by stage name."""
+        return {stage.name: stage.metrics() for stage in self.stages}
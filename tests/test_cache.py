@@ -0,0 +1,95 @@
+"""Tests for the cache module."""
+
+import os
+import tempfile
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import ClassificationCache
+
+
+RESULT = {'labels': ['Invoice', 'Report'], 'scores': [0.8, 0.2]}
+
+
+class TestMakeKey:
+    """Tests for ClassificationCache.make_key."""
+
+    def test_same_input_same_key(self):
+        """Should be deterministic."""
+        key1 = ClassificationCache.make_key("text", ["Invoice"])
+        key2 = ClassificationCache.make_key("text", ["Invoice"])
+        assert key1 == key2
+
+    def test_labels_change_key(self):
+        """Should depend on the candidate labels."""
+        key1 = ClassificationCache.make_key("text", ["Invoice"])
+        key2 = ClassificationCache.make_key("text", ["Invoice", "Report"])
+        assert key1 != key2
+
+    def test_model_changes_key(self):
+        """Should depend on the model producing the scores."""
+        key1 = ClassificationCache.make_key("text", ["Invoice"], "pytorch")
+        key2 = ClassificationCache.make_key("text", ["Invoice"], "onnx")
+        assert key1 != key2
+
+    def test_text_changes_key(self):
+        """Should depend on the text."""
+        key1 = ClassificationCache.make_key("Фактура", ["Invoice"])
+        key2 = ClassificationCache.make_key("Протокол", ["Invoice"])
+        assert key1 != key2
+
+
+class TestClassificationCache:
+    """Tests for the ClassificationCache class."""
+
+    def test_miss_then_hit(self):
+        """Should count a miss before and a hit after storing a result."""
+        cache = ClassificationCache(":memory:")
+
+        assert cache.get("k") is None
+        cache.put("k", RESULT)
+        assert cache.get("k") == RESULT
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+    def test_overwrite_keeps_entry_count(self):
+        """Should replace an existing entry without growing the cache."""
+        cache = ClassificationCache(":memory:")
+        cache.put("k", RESULT)
+        cache.put("k", {'labels': ['Report'], 'scores': [0.9]})
+
+        assert cache.get("k")['labels'] == ['Report']
+        assert cache.stats()['entries'] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Should evict the least recently used entry when full."""
+        cache = ClassificationCache(":memory:", max_entries=2)
+        cache.put("a", RESULT)
+        cache.put("b", RESULT)
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", RESULT)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == RESULT
+        assert cache.get("c") == RESULT
+        assert cache.stats()['entries'] == 2
+
+    def test_persists_across_instances(self):
+        """Should keep results on disk between runs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite")
+            cache = ClassificationCache(path)
+            cache.put("k", RESULT)
+            cache.close()
+
+            reopened = ClassificationCache(path)
+            assert reopened.get("k") == RESULT
+            assert reopened.stats()['entries'] == 1
+            reopened.close()
+
+    def test_invalid_size(self):
+        """Should reject a non-positive size bound."""
+        with pytest.raises(ValueError):
+            ClassificationCache(":memory:", max_entries=0)
@@ -0,0 +1,76 @@
+"""Tests for the dates module."""
+
+import os
+from datetime import datetime
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dates import extract_date, parse_pdf_date, parse_precedence
+
+
+class TestParsePrecedence:
+    """Tests for the parse_precedence function."""
+
+    def test_parses_names(self):
+        """Should split, trim and lower-case the format names."""
+        assert parse_precedence(" ISO, labeled ,") == ("iso", "labeled")
+
+    def test_unknown_name(self):
+        """Should raise ValueError for a format that does not exist."""
+        with pytest.raises(ValueError):
+            parse_precedence("labeled,us")
+
+
+class TestExtractDate:
+    """Tests for the extract_date function."""
+
+    def test_generated_header(self):
+        """Should read the date field printed by documents.py."""
+        text = "Документ: Фактура\nСъдържание: услуги...\nДата: 29-01-2024\nМесец: January"
+        assert extract_date(text) == datetime(2024, 1, 29)
+
+    def test_formats(self):
+        """Should recognize numeric, ISO and Bulgarian month-name dates."""
+        assert extract_date("извършени на 12.06.2023 г.") == datetime(2023, 6, 12)
+        assert extract_date("issued 2024-03-05") == datetime(2024, 3, 5)
+        assert extract_date("заседание на 3 Септември 2021 г.") == datetime(2021, 9, 3)
+        assert extract_date("през месец май 2023 г.") == datetime(2023, 5, 1)
+
+    def test_precedence(self):
+        """Should prefer formats earlier in the precedence over earlier text."""
+        text = "от 12.06.2023 г. ... Дата: 29-01-2024 ... 2022-02-02"
+        assert extract_date(text) == datetime(2024, 1, 29)
+        assert extract_date(text, ("iso", "labeled")) == datetime(2022, 2, 2)
+        assert extract_date(text, ("numeric",)) == datetime(2023, 6, 12)
+
+    def test_skips_impossible_and_rejected_dates(self):
+        """Should skip dates that do not exist or fail the validity check."""
+        assert extract_date("31.02.2024, 15.13.2024, 01.03.2024") == datetime(2024, 3, 1)
+        assert extract_date(
+            "01.01.1801 и 02.02.2020", valid=lambda date: date.year > 1900
+        ) == datetime(2020, 2, 2)
+
+    def test_no_date(self):
+        """Should return None when no format matches."""
+        assert extract_date("Сума: 1500 лв., номер 1234567") is None
+
+
+class TestParsePdfDate:
+    """Tests for the parse_pdf_date function."""
+
+    def test_full_date(self):
+        """Should parse a full PDF date and ignore the time zone."""
+        assert parse_pdf_date("D:20240615093000+02'00'") == datetime(2024, 6, 15, 9, 30)
+
+    def test_partial_date_and_bytes(self):
+        """Should default missing parts and accept bytes."""
+        assert parse_pdf_date(b"D:202406") == datetime(2024, 6, 1)
+
+    def test_invalid(self):
+        """Should return None for values that are not PDF dates."""
+        assert parse_pdf_date("yesterday") is None
+        assert parse_pdf_date("D:20241399") is None
+        assert parse_pdf_date(None) is None
@@ -1,6 +1,7 @@
 """Tests for the documents module."""
 
 import os
+import random
 import tempfile
 from datetime import datetime
 from unittest.mock import patch, Mock, MagicMock
@@ -16,9 +17,16 @@ from documents import (
     create_pdf,
     setup_output_directory,
     generate_sample_documents,
+    generate_bulk_documents,
+    generate_table_rows,
+    document_font,
+    plan_document,
+    sample_page_count,
+    FALLBACK_FONT,
     INVOICES,
     PROTOCOLS,
     REPORTS,
+    TABLE_HEADERS,
 )
 
 
@@ -59,6 +67,13 @@ class TestGenerateRandomDate:
             generate_random_date(10000)
 
 
+    def test_uses_given_generator(self):
+        """Should draw the same date from equally seeded generators."""
+        first = generate_random_date(2024, random.Random(7))
+        second = generate_random_date(2024, random.Random(7))
+        assert first == second
+
+
 class TestSampleDocumentContent:
     """Tests for sample document content."""
 
@@ -149,6 +164,65 @@ class TestCreatePdf:
                 mock_canvas.save.assert_called_once()
 
 
+    @patch('documents.canvas.Canvas')
+    def test_multiple_pages(self, mock_canvas_class):
+        """Should start a new page for every page after the first."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_canvas = MagicMock()
+            mock_canvas_class.return_value = mock_canvas
+
+            create_pdf("Test", "Test content", "test_doc", datetime(2024, 6, 15),
+                       pages=3, output_dir=tmpdir)
+
+            assert mock_canvas.showPage.call_count == 2
+            assert mock_canvas_class.call_args.args[0] == os.path.join(tmpdir, "test_doc.pdf")
+
+
+    @patch('documents.canvas.Canvas')
+    def test_draws_table_on_every_page(self, mock_canvas_class):
+        """Should draw the header and each row of the table on every page."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_canvas = MagicMock()
+            mock_canvas_class.return_value = mock_canvas
+            table = [["№", "Описание"], ["1", "Транспорт"], ["2", "Ремонт"]]
+
+            create_pdf("Test", "Test content", "test_doc", datetime(2024, 6, 15),
+                       pages=2, output_dir=tmpdir, table=table)
+
+            drawn = [c.args[2] for c in mock_canvas.drawString.call_args_list]
+            assert drawn.count("Транспорт") == 2
+            assert drawn.count("Описание") == 2
+
+    def test_cyrillic_text_is_extractable(self):
+        """Should embed a font whose Cyrillic text pdfplumber reads back."""
+        if document_font() == FALLBACK_FONT:
+            pytest.skip("no Cyrillic TrueType font installed")
+        pdfplumber = pytest.importorskip("pdfplumber")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            create_pdf("Фактура", "Първи абзац.\n\nВтори абзац.", "doc",
+                       datetime(2024, 6, 15), pages=2, output_dir=tmpdir)
+            with pdfplumber.open(os.path.join(tmpdir, "doc.pdf")) as pdf:
+                texts = [page.extract_text() for page in pdf.pages]
+
+        assert len(texts) == 2
+        assert "Документ: Фактура" in texts[0]
+        assert "Втори абзац." in texts[1]
+
+
+class TestGenerateTableRows:
+    """Tests for generate_table_rows function."""
+
+    def test_header_and_rows(self):
+        """Should start with the type's header and add rows of the same width."""
+        for doc_type, header in TABLE_HEADERS.items():
+            table = generate_table_rows(doc_type, random.Random(0), 4)
+            assert table[0] == header
+            assert len(table) == 5
+            assert all(len(row) == len(header) for row in table)
+            assert [row[0] for row in table[1:]] == ["1", "2", "3", "4"]
+
+
 class TestSetupOutputDirectory:
     """Tests for setup_output_directory function."""
 
@@ -221,3 +295,88 @@ class TestGenerateSampleDocuments:
 
         assert total == 0
         mock_create_pdf.assert_not_called()
+
+
+class TestSamplePageCount:
+    """Tests for sample_page_count function."""
+
+    def test_fixed(self):
+        """Should always return the minimum page count."""
+        assert sample_page_count(random.Random(0), "fixed", 3, 10) == 3
+
+    def test_distributions_stay_in_range(self):
+        """Should never leave the configured page range."""
+        rng = random.Random(0)
+        for distribution in ("uniform", "lognormal"):
+            counts = {sample_page_count(rng, distribution, 2, 6) for _ in range(500)}
+            assert min(counts) >= 2 and max(counts) <= 6
+            assert len(counts) > 1
+
+    def test_invalid_arguments(self):
+        """Should raise ValueError for unknown distributions and bad ranges."""
+        with pytest.raises(ValueError):
+            sample_page_count(random.Random(0), "normal", 1, 2)
+        with pytest.raises(ValueError):
+            sample_page_count(random.Random(0), "uniform", 5, 2)
+
+
+class TestPlanDocument:
+    """Tests for plan_document function."""
+
+    def test_deterministic(self):
+        """Should plan the same document for the same seed and index."""
+        assert plan_document(5, seed=1) == plan_document(5, seed=1)
+        assert plan_document(5, seed=1) != plan_document(6, seed=1)
+
+    def test_nearby_seeds_do_not_overlap(self):
+        """Should not reuse another seed's documents at a shifted index."""
+        shifted = [plan_document(index + 1, seed=0) for index in range(5)]
+        nearby = [plan_document(index, seed=1) for index in range(5)]
+        assert [(plan['content'], plan['date']) for plan in shifted] != [
+            (plan['content'], plan['date']) for plan in nearby
+        ]
+
+    def test_size_options(self):
+        """Should respect the page and sentence ranges."""
+        plan = plan_document(
+            0, page_distribution="uniform", min_pages=2, max_pages=4,
+            min_sentences=3, max_sentences=3
+        )
+        assert 2 <= plan['pages'] <= 4
+        assert plan['file_name'].endswith("_000000")
+        pool = {"Фактура": INVOICES, "Протокол": PROTOCOLS, "Отчет": REPORTS}[plan['doc_type']]
+        assert sum(plan['content'].count(sentence) for sentence in pool) == 3
+        assert plan['table'] is None
+
+    def test_paragraphs_and_table(self):
+        """Should group sentences into paragraphs and add the requested table rows."""
+        plan = plan_document(0, min_sentences=7, max_sentences=7, table_rows=5)
+        assert plan['content'].count("\n\n") == 2
+        assert len(plan['table']) == 6
+
+
+class TestGenerateBulkDocuments:
+    """Tests for generate_bulk_documents function."""
+
+    @patch('documents.create_pdf')
+    def test_generates_count_in_process(self, mock_create_pdf):
+        """Should create every planned document in this process with one worker."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('documents.OUTPUT_DIR', tmpdir), patch('documents.BULK_CHUNK_SIZE', 4):
+                total = generate_bulk_documents(10, seed=3, workers=1)
+
+        assert total == 10
+        names = [c.kwargs['file_name'] for c in mock_create_pdf.call_args_list]
+        assert names == [plan_document(i, seed=3)['file_name'] for i in range(10)]
+
+    def test_process_pool_matches_serial(self):
+        """Should produce the same files on a process pool as serially."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial, pooled = os.path.join(tmpdir, "serial"), os.path.join(tmpdir, "pooled")
+            with patch('documents.OUTPUT_DIR', serial):
+                generate_bulk_documents(6, seed=9, workers=1)
+            with patch('documents.OUTPUT_DIR', pooled), patch('documents.BULK_CHUNK_SIZE', 2):
+                assert generate_bulk_documents(6, seed=9, workers=2) == 6
+
+            assert sorted(os.listdir(serial)) == sorted(os.listdir(pooled))
+            assert len(os.listdir(pooled)) == 6
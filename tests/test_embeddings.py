@@ -0,0 +1,94 @@
+"""Tests for the embeddings module."""
+
+import os
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embeddings import EmbeddingClassifier
+
+
+KEYWORDS = ["фактура", "протокол", "отчет"]
+
+
+class KeywordEncoder:
+    """Fake encoder embedding texts by keyword counts."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        self.calls.append(list(texts))
+        vectors = np.array(
+            [[text.lower().count(word) + 0.01 for word in KEYWORDS] for text in texts]
+        )
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+LABELS = ["Invoice", "Protocol", "Report"]
+DESCRIPTIONS = {"Invoice": "фактура", "Protocol": "протокол", "Report": "отчет"}
+
+
+class TestEmbeddingClassifier:
+    """Tests for the EmbeddingClassifier class."""
+
+    def test_single_text_returns_dict(self):
+        """Should mirror the zero-shot pipeline output for one text."""
+        clf = EmbeddingClassifier(KeywordEncoder(), DESCRIPTIONS)
+
+        result = clf("Фактура за услуги", LABELS)
+
+        assert result['labels'][0] == "Invoice"
+        assert set(result['labels']) == set(LABELS)
+        assert sum(result['scores']) == pytest.approx(1.0)
+        assert result['scores'] == sorted(result['scores'], reverse=True)
+
+    def test_batch_returns_list_in_order(self):
+        """Should return one result per text in input order."""
+        clf = EmbeddingClassifier(KeywordEncoder(), DESCRIPTIONS)
+
+        results = clf(["Отчет за 2023", "Протокол от заседание"], LABELS)
+
+        assert [r['labels'][0] for r in results] == ["Report", "Protocol"]
+
+    def test_prototypes_are_cached(self):
+        """Should embed label prototypes only once across calls."""
+        encoder = KeywordEncoder()
+        clf = EmbeddingClassifier(encoder, DESCRIPTIONS)
+
+        clf(["Фактура"], LABELS)
+        clf(["Отчет"], LABELS)
+
+        # three prototypes plus one document batch per call
+        assert len(encoder.calls) == 5
+
+    def test_examples_take_precedence(self):
+        """Should build prototypes from example documents when given."""
+        clf = EmbeddingClassifier(
+            KeywordEncoder(),
+            {"Invoice": "фактура", "Report": "отчет"},
+            label_examples={"Invoice": ["отчет", "отчет отчет"]}
+        )
+
+        result = clf("отчет", ["Invoice", "Report"])
+        assert result['scores'][0] == pytest.approx(result['scores'][1], abs=0.01)
+
+    def test_label_name_is_default_description(self):
+        """Should embed the label name when there is no description."""
+        encoder = Mock()
+        encoder.encode.return_value = np.array([[1.0, 0.0]])
+        clf = EmbeddingClassifier(encoder)
+
+        clf.prototype("Contract")
+        assert encoder.encode.call_args.args[0] == ["Contract"]
+
+    def test_invalid_temperature(self):
+        """Should reject a non-positive temperature."""
+        with pytest.raises(ValueError):
+            EmbeddingClassifier(KeywordEncoder(), temperature=0)
@@ -0,0 +1,137 @@
+"""Tests for the labels module."""
+
+import json
+import os
+import tempfile
+from unittest.mock import Mock
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from labels import LabelRegistry, LabelSpec, load_label_specs
+
+
+DEFAULTS = [LabelSpec("Invoice", "Invoices"), LabelSpec("Report", "Reports")]
+
+
+def _write_labels(path, entries):
+    """Write a labels file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False)
+
+
+class TestLabelSpec:
+    """Tests for the LabelSpec class."""
+
+    def test_defaults(self):
+        """Should default the directory to the plural and the description to the name."""
+        spec = LabelSpec("Contract")
+        assert spec.directory == "Contracts"
+        assert spec.description == "Contract"
+
+    def test_empty_name(self):
+        """Should reject an empty name."""
+        with pytest.raises(ValueError):
+            LabelSpec("")
+
+
+class TestLoadLabelSpecs:
+    """Tests for load_label_specs function."""
+
+    def test_loads_labels(self):
+        """Should read labels in file order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "labels.json")
+            _write_labels(path, [
+                {"name": "Payslip", "directory": "Payslips", "description": "Фиш за заплата"},
+                {"name": "Delivery note"},
+            ])
+
+            specs = load_label_specs(path)
+
+        assert [spec.name for spec in specs] == ["Payslip", "Delivery note"]
+        assert specs[0].description == "Фиш за заплата"
+
+    @pytest.mark.parametrize("entries", [[], {"name": "x"}, [{"directory": "X"}],
+                                         [{"name": "A"}, {"name": "A"}]])
+    def test_invalid_files(self, entries):
+        """Should reject empty, malformed and duplicate label lists."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "labels.json")
+            _write_labels(path, entries)
+            with pytest.raises(ValueError):
+                load_label_specs(path)
+
+
+class TestLabelRegistry:
+    """Tests for the LabelRegistry class."""
+
+    def test_views(self):
+        """Should derive labels, directories and the mapping from the specs."""
+        registry = LabelRegistry(DEFAULTS)
+
+        assert registry.names == ["Invoice", "Report"]
+        assert registry.directories == ["Invoices", "Reports"]
+        assert registry.label_to_dir == {"Invoice": "Invoices", "Report": "Reports"}
+        assert registry.directory_for("Memo") == "Memos"
+
+    def test_reload_updates_views_in_place(self):
+        """Should update the exposed list and dicts when the file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "labels.json")
+            _write_labels(path, [{"name": "Invoice"}])
+            registry = LabelRegistry.from_file(path, DEFAULTS)
+            names = registry.names
+
+            assert names == ["Invoice"]
+            assert registry.reload() is False  # unchanged file
+
+            _write_labels(path, [{"name": "Invoice"}, {"name": "Contract"}])
+            os.utime(path, (0, 12345))
+            assert registry.reload() is True
+
+        assert names == ["Invoice", "Contract"]
+        assert registry.label_to_dir["Contract"] == "Contracts"
+
+    def test_invalid_file_keeps_current_labels(self):
+        """Should keep the previous labels when the file is broken."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "labels.json")
+            with open(path, 'w') as f:
+                f.write("not json")
+
+            registry = LabelRegistry.from_file(path, DEFAULTS)
+
+        assert registry.names == ["Invoice", "Report"]
+
+    def test_hypotheses_are_cached(self):
+        """Should format hypotheses once per template."""
+        registry = LabelRegistry(DEFAULTS)
+
+        first = registry.hypotheses("This example is {}.")
+        assert first == ["This example is Invoice.", "This example is Report."]
+        assert registry.hypotheses("This example is {}.") is first
+
+    def test_encodings_cached_until_reload(self):
+        """Should tokenize hypotheses once and again after the labels change."""
+        backend = Mock()
+        backend.encode_batch.return_value = ["enc1", "enc2"]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "labels.json")
+            _write_labels(path, [{"name": "Invoice"}, {"name": "Report"}])
+            registry = LabelRegistry.from_file(path, DEFAULTS)
+
+            assert registry.hypothesis_encodings(backend, "{}") == ["enc1", "enc2"]
+            registry.hypothesis_encodings(backend, "{}")
+            assert backend.encode_batch.call_count == 1
+
+            _write_labels(path, [{"name": "Memo"}, {"name": "Report"}])
+            os.utime(path, (0, 12345))
+            registry.reload()
+            registry.hypothesis_encodings(backend, "{}")
+
+        assert backend.encode_batch.call_count == 2
+        assert backend.encode_batch.call_args.args[0] == ["Memo", "Report"]
@@ -0,0 +1,97 @@
+"""Tests for the metrics module."""
+
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Counter, Histogram, MetricsRegistry, start_metrics_server
+
+
+class TestCounter:
+    """Tests for Counter."""
+
+    def test_counts_per_label(self):
+        """Should keep a separate count for every label value."""
+        counter = Counter("docs_total", "Documents.", ["label"])
+        counter.inc(label="Invoice")
+        counter.inc(2, label="Invoice")
+        counter.inc(label="Report")
+
+        assert counter.value(label="Invoice") == 3
+        assert counter.value(label="Protocol") == 0
+        assert 'docs_total{label="Invoice"} 3' in counter.render()
+
+    def test_rejects_wrong_labels_and_decrements(self):
+        """Should raise ValueError for missing labels or negative increments."""
+        counter = Counter("docs_total", "Documents.", ["label"])
+        with pytest.raises(ValueError):
+            counter.inc()
+        with pytest.raises(ValueError):
+            counter.inc(-1, label="Invoice")
+
+    def test_unlabelled_counter_renders_zero(self):
+        """Should expose an unlabelled counter before its first increment."""
+        assert "skipped_total 0" in Counter("skipped_total", "Skipped.").render()
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_cumulative_buckets(self):
+        """Should render cumulative bucket counts, sum and count."""
+        histogram = Histogram("extract_seconds", "Extraction.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+
+        lines = histogram.render()
+        assert 'extract_seconds_bucket{le="0.1"} 1' in lines
+        assert 'extract_seconds_bucket{le="1"} 3' in lines
+        assert 'extract_seconds_bucket{le="+Inf"} 4' in lines
+        assert "extract_seconds_sum 4.25" in lines
+        assert "extract_seconds_count 4" in lines
+
+    def test_time_observes_block(self):
+        """Should record one observation per timed block."""
+        histogram = Histogram("move_seconds", "Moves.")
+        with histogram.time():
+            pass
+        assert histogram.count == 1
+
+    def test_rejects_unsorted_buckets(self):
+        """Should raise ValueError for buckets that are not increasing."""
+        with pytest.raises(ValueError):
+            Histogram("bad_seconds", "Bad.", buckets=(1.0, 0.5))
+
+
+class TestMetricsServer:
+    """Tests for start_metrics_server."""
+
+    def test_serves_registry(self):
+        """Should serve the rendered registry at /metrics."""
+        registry = MetricsRegistry()
+        registry.counter("served_total", "Served.").inc()
+        server = start_metrics_server(0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(url + "/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + "/other", timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "# TYPE served_total counter" in body
+        assert "served_total 1" in body
+
+    def test_duplicate_metric_rejected(self):
+        """Should refuse to register two metrics with the same name."""
+        registry = MetricsRegistry()
+        registry.counter("dup_total", "Dup.")
+        with pytest.raises(ValueError):
+            registry.histogram("dup_total", "Dup.")
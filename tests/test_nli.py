@@ -0,0 +1,146 @@
+"""Tests for the nli module."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+from transformers import BertConfig, BertForSequenceClassification, PreTrainedTokenizerFast
+from transformers import pipeline
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from labels import LabelRegistry, LabelSpec
+from nli import NLIClassifier
+
+WORDS = (
+    "фактура протокол отчет invoice protocol report this example is a an the "
+    "document за от и сума дата среща продажби"
+).split()
+TEMPLATE = "This example is {}."
+
+
+def _build_pipeline():
+    """Build a tiny randomly initialised BERT NLI pipeline without downloads."""
+    vocab = {token: i for i, token in enumerate(
+        ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "."] + WORDS
+    )}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.normalizer = normalizers.Lowercase()
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]",
+        pair="[CLS] $A [SEP] $B:1 [SEP]:1",
+        special_tokens=[("[CLS]", vocab["[CLS]"]), ("[SEP]", vocab["[SEP]"])],
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, pad_token="[PAD]", unk_token="[UNK]",
+        cls_token="[CLS]", sep_token="[SEP]", model_max_length=32,
+    )
+    tokenizer.model_input_names = ["input_ids", "token_type_ids", "attention_mask"]
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=16, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=32, max_position_embeddings=64,
+        num_labels=3,
+        id2label={0: "contradiction", 1: "neutral", 2: "entailment"},
+        label2id={"contradiction": 0, "neutral": 1, "entailment": 2},
+    )
+    model = BertForSequenceClassification(config).eval()
+    with torch.no_grad():
+        model.classifier.weight.mul_(5000)
+    return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer, device=-1)
+
+
+@pytest.fixture(scope="module")
+def zero_shot():
+    """Shared tiny zero-shot pipeline."""
+    return _build_pipeline()
+
+
+@pytest.fixture
+def registry():
+    """Registry with the default sorter labels."""
+    return LabelRegistry([LabelSpec("Invoice"), LabelSpec("Protocol"), LabelSpec("Report")])
+
+
+def _assert_same(expected, actual):
+    assert actual['labels'] == expected['labels']
+    assert actual['scores'] == pytest.approx(expected['scores'], abs=1e-5)
+
+
+class TestNLIClassifier:
+    """Tests for NLIClassifier."""
+
+    def test_single_text_matches_pipeline(self, zero_shot, registry):
+        """Should give the pipeline's scores for a single text."""
+        clf = NLIClassifier(zero_shot, registry, TEMPLATE)
+        text = "фактура за продажби"
+
+        expected = zero_shot(text, registry.names, hypothesis_template=TEMPLATE)
+        _assert_same(expected, clf(text, registry.names))
+
+    def test_batch_matches_pipeline(self, zero_shot, registry):
+        """Should give the pipeline's scores for every text of a batch."""
+        clf = NLIClassifier(zero_shot, registry, TEMPLATE)
+        texts = ["фактура за продажби", "протокол от среща", "отчет"]
+
+        expected = zero_shot(texts, registry.names, hypothesis_template=TEMPLATE)
+        actual = clf(texts, registry.names, batch_size=4)
+
+        assert [result['sequence'] for result in actual] == texts
+        for want, got in zip(expected, actual):
+            _assert_same(want, got)
+
+    def test_long_text_truncated_like_pipeline(self, zero_shot, registry):
+        """Should truncate documents longer than the model limit."""
+        clf = NLIClassifier(zero_shot, registry, TEMPLATE)
+        text = " ".join(["отчет за продажби"] * 30)
+
+        expected = zero_shot(text, registry.names, hypothesis_template=TEMPLATE)
+        _assert_same(expected, clf(text, registry.names))
+
+    def test_hypotheses_encoded_once(self, zero_shot, registry):
+        """Should tokenize the label hypotheses once across calls."""
+        clf = NLIClassifier(zero_shot, registry, TEMPLATE)
+
+        with patch.object(
+            registry, 'hypotheses', wraps=registry.hypotheses
+        ) as hypotheses:
+            clf(["фактура"], registry.names)
+            clf(["протокол", "отчет"], registry.names)
+
+        assert hypotheses.call_count == 1
+
+    def test_template_override(self, zero_shot, registry):
+        """Should use a template passed at call time."""
+        clf = NLIClassifier(zero_shot, registry, TEMPLATE)
+        text = "протокол от среща"
+
+        expected = zero_shot(text, registry.names, hypothesis_template="the document is {}.")
+        actual = clf(text, registry.names, hypothesis_template="the document is {}.")
+        _assert_same(expected, actual)
+
+    def test_other_label_set(self, zero_shot, registry):
+        """Should classify against labels outside the registry."""
+        clf = NLIClassifier(zero_shot, registry, TEMPLATE)
+        labels = ["Report", "Invoice"]
+
+        expected = zero_shot("отчет", labels, hypothesis_template=TEMPLATE)
+        _assert_same(expected, clf("отчет", labels))
+
+    def test_empty_input(self, zero_shot, registry):
+        """Should return an empty list for no texts."""
+        assert NLIClassifier(zero_shot, registry)([], registry.names) == []
+
+    def test_rejects_slow_tokenizer(self, registry):
+        """Should raise ValueError for a pipeline without a fast tokenizer."""
+        with pytest.raises(ValueError):
+            NLIClassifier(object(), registry)
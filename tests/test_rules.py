@@ -0,0 +1,120 @@
+"""Tests for the rules module."""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rules import DEFAULT_RULES, KeywordRule, RulePreClassifier, load_rules
+
+
+LABELS = ["Invoice", "Protocol", "Report"]
+
+
+class TestKeywordRule:
+    """Tests for the KeywordRule class."""
+
+    def test_invalid_pattern(self):
+        """Should raise ValueError for an invalid regex."""
+        with pytest.raises(ValueError):
+            KeywordRule("bad", "Invoice", "(")
+
+    def test_invalid_score(self):
+        """Should raise ValueError for a score outside (0, 1]."""
+        with pytest.raises(ValueError):
+            KeywordRule("bad", "Invoice", "x", score=1.5)
+
+
+class TestRulePreClassifier:
+    """Tests for the RulePreClassifier class."""
+
+    def test_default_rules_match_generated_headers(self):
+        """Should classify the markers documents.py prints."""
+        clf = RulePreClassifier(DEFAULT_RULES)
+
+        assert clf.classify("Документ: Фактура\nСума", LABELS)['labels'][0] == "Invoice"
+        assert clf.classify("Документ: Протокол", LABELS)['labels'][0] == "Protocol"
+        assert clf.classify("Годишен отчет за 2023", LABELS)['labels'][0] == "Report"
+
+    def test_result_shape(self):
+        """Should return every candidate label with scores summing to 1."""
+        clf = RulePreClassifier(DEFAULT_RULES)
+
+        result = clf.classify("Фактура", LABELS)
+
+        assert result['labels'] == ["Invoice", "Protocol", "Report"]
+        assert sum(result['scores']) == pytest.approx(1.0)
+        assert result['rule'] == "invoice-keyword"
+
+    def test_no_match_returns_none(self):
+        """Should defer to the model when no rule matches."""
+        clf = RulePreClassifier(DEFAULT_RULES)
+        assert clf.classify("Договор за наем", LABELS) is None
+
+    def test_ambiguous_match_returns_none(self):
+        """Should defer to the model when several labels match."""
+        clf = RulePreClassifier(DEFAULT_RULES)
+        assert clf.classify("Протокол и отчет", LABELS) is None
+
+    def test_only_scans_the_head(self):
+        """Should ignore markers beyond scan_chars."""
+        clf = RulePreClassifier(DEFAULT_RULES, scan_chars=10)
+        assert clf.classify("x" * 20 + " Фактура", LABELS) is None
+
+    def test_low_score_rules_are_ignored(self):
+        """Should not short-circuit on rules below the threshold."""
+        clf = RulePreClassifier(
+            [KeywordRule("weak", "Invoice", "сума", score=0.6)], threshold=0.9
+        )
+        assert clf.classify("Сума за плащане", LABELS) is None
+
+    def test_unknown_labels_are_ignored(self):
+        """Should skip rules whose label is not a candidate."""
+        clf = RulePreClassifier([KeywordRule("contract", "Contract", "договор")])
+        assert clf.classify("Договор", LABELS) is None
+
+    def test_hit_counters(self):
+        """Should count checks and hits per rule."""
+        clf = RulePreClassifier(DEFAULT_RULES)
+        clf.classify("Фактура", LABELS)
+        clf.classify("Фактура 2", LABELS)
+        clf.classify("нищо", LABELS)
+
+        stats = clf.stats()
+        assert stats['checked'] == 3
+        assert stats['short_circuited'] == 2
+        assert stats['rule_hits']['invoice-keyword'] == 2
+        assert stats['rule_hits']['report-keyword'] == 0
+
+
+class TestLoadRules:
+    """Tests for load_rules function."""
+
+    def test_loads_rules(self):
+        """Should compile rules from a JSON file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "rules.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([
+                    {"name": "inv", "label": "Invoice", "pattern": "^Фактура"},
+                    {"name": "rep", "label": "Report", "pattern": "отчет", "score": 0.8},
+                ], f)
+
+            rules = load_rules(path)
+
+        assert [rule.name for rule in rules] == ["inv", "rep"]
+        assert rules[1].score == 0.8
+
+    def test_invalid_file(self):
+        """Should raise ValueError for malformed rules."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "rules.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([{"label": "Invoice"}], f)
+
+            with pytest.raises(ValueError):
+                load_rules(path)
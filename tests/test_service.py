@@ -0,0 +1,179 @@
+"""Tests for the service module."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import Mock, MagicMock, patch
+
+# Mock transformers before importing sorter
+sys.modules['transformers'] = MagicMock()
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service import SorterService
+
+
+def _write_pdfs(directory, names):
+    """Create placeholder PDF files in directory."""
+    for name in names:
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write("pdf")
+
+
+def _classifier():
+    """Classifier mock labelling every text an Invoice."""
+    classifier = Mock()
+    classifier.side_effect = lambda texts, labels, **kwargs: [
+        {'labels': ['Invoice'], 'scores': [0.9]} for _ in texts
+    ]
+    return classifier
+
+
+async def _process(service, file_names=None):
+    service._open_executors()
+    try:
+        return await service.process_files(file_names)
+    finally:
+        service._close_executors()
+
+
+class TestProcessFiles:
+    """Tests for SorterService.process_files."""
+
+    @patch('sorter.file_document')
+    @patch('sorter.extract_text_from_pdf')
+    def test_files_are_extracted_classified_and_moved(self, mock_extract, mock_file):
+        """Should file every document with text, batching the classifier calls."""
+        mock_extract.side_effect = lambda path: "" if path.endswith("empty.pdf") else "text"
+        mock_file.return_value = True
+        classifier = _classifier()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf", "b.pdf", "c.pdf", "empty.pdf", "notes.txt"])
+            with patch('sorter.INPUT_DIR', tmpdir), patch('sorter.BATCH_SIZE', 2):
+                processed = asyncio.run(_process(SorterService(classifier)))
+
+        assert processed == 3
+        assert sum(len(c.args[0]) for c in classifier.call_args_list) == 3
+        filed = sorted(os.path.basename(c.args[0]) for c in mock_file.call_args_list)
+        assert filed == ["a.pdf", "b.pdf", "c.pdf"]
+
+    @patch('sorter.file_document')
+    @patch('sorter.extract_text_from_pdf')
+    def test_moves_run_off_the_event_loop(self, mock_extract, mock_file):
+        """Should run file moves in a worker thread."""
+        mock_extract.return_value = "text"
+        threads = []
+        mock_file.side_effect = lambda *args: threads.append(threading.current_thread()) or True
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir):
+                asyncio.run(_process(SorterService(_classifier())))
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    @patch('sorter.file_document')
+    @patch('sorter.extract_text_from_pdf')
+    def test_shutdown_stops_intake_but_drains_in_flight(self, mock_extract, mock_file):
+        """Should file documents already extracted and leave the rest waiting."""
+        mock_file.return_value = True
+        service = SorterService(_classifier())
+        extracted = []
+        loops = []
+
+        def extract(path):
+            extracted.append(path)
+            loops[0].call_soon_threadsafe(service.request_shutdown)
+            return "text"
+
+        mock_extract.side_effect = extract
+
+        async def run():
+            loops.append(asyncio.get_running_loop())
+            return await _process(service)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, [f"{n}.pdf" for n in range(20)])
+            with patch('sorter.INPUT_DIR', tmpdir), patch('sorter.QUEUE_SIZE', 1):
+                processed = asyncio.run(run())
+
+        assert processed == len(extracted)
+        assert 1 <= processed < 20
+        assert mock_file.call_count == processed
+
+    def test_empty_directory(self):
+        """Should return 0 without starting any stage when nothing is waiting."""
+        classifier = Mock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('sorter.INPUT_DIR', tmpdir):
+                assert asyncio.run(_process(SorterService(classifier))) == 0
+        classifier.assert_not_called()
+
+
+class TestRun:
+    """Tests for SorterService.run."""
+
+    @patch('sorter.reload_labels')
+    @patch('sorter.file_document')
+    @patch('sorter.extract_text_from_pdf')
+    def test_runs_until_shutdown(self, mock_extract, mock_file, mock_reload):
+        """Should process waiting files, then stop cleanly on shutdown."""
+        mock_extract.return_value = "text"
+        mock_file.return_value = True
+        service = SorterService(_classifier())
+
+        async def run():
+            task = asyncio.create_task(service.run())
+            while service.processed < 2:
+                await asyncio.sleep(0.01)
+            service.request_shutdown()
+            await asyncio.wait_for(task, 5)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf", "b.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.WATCH_MODE', "poll"), \
+                    patch('sorter.CHECK_INTERVAL', 3600):
+                asyncio.run(run())
+
+        assert service.processed == 2
+        assert service.stopping
+
+    def test_events_mode_rescans_periodically(self):
+        """Should rescan the whole directory every RESCAN_INTERVAL in events mode."""
+        service = SorterService(Mock())
+        scans = []
+
+        async def process_files(file_names=None):
+            scans.append(file_names)
+            if len(scans) >= 3:
+                service.request_shutdown()
+            return 0
+
+        service.process_files = process_files
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.WATCH_MODE', "events"), \
+                    patch('sorter.RESCAN_INTERVAL', 0.01), \
+                    patch('sorter.reload_labels'):
+                asyncio.run(asyncio.wait_for(service.run(), 5))
+
+        assert scans == [None, None, None]
+
+    def test_shutdown_before_start(self):
+        """Should accept a shutdown request before run() and exit without a cycle."""
+        classifier = Mock()
+        service = SorterService(classifier)
+        service.request_shutdown()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir), patch('sorter.WATCH_MODE', "poll"):
+                asyncio.run(asyncio.wait_for(service.run(), 5))
+
+            assert os.path.exists(os.path.join(tmpdir, "a.pdf"))
+        classifier.assert_not_called()
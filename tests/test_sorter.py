@@ -1,7 +1,12 @@
 """Tests for the sorter module."""
 
+import errno
+import fcntl
+import json
 import os
+import struct
 import tempfile
+import time
 import shutil
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
@@ -15,16 +20,72 @@ sys.modules['transformers'] = MagicMock()
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sorter import (
+    load_classifier,
+    load_label_examples,
+    iter_pdf_pages,
     extract_text_from_pdf,
     classify_document,
+    classify_texts,
+    shape_text,
+    aggregate_chunk_results,
+    iter_extracted_texts,
+    get_extract_executor,
+    shutdown_extract_executor,
+    process_files,
+    list_input_files,
+    claim_file,
+    release_claims,
+    lock_claim_directory,
+    rename_no_replace,
+    parse_inotify_events,
+    InotifyWatcher,
+    IN_CLOSE_WRITE,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    watch_input_directory,
     get_week_of_month,
+    pdf_creation_date,
+    read_pdf_metadata,
+    file_by_metadata,
+    resolve_document_date,
     move_file_to_correct_directory,
+    setup_directory_structure,
+    quarantine_file,
+    reload_labels,
     display_sorting_progress,
     LABEL_TO_DIR,
+    LABEL_REGISTRY,
+    DOCUMENTS_FILED,
+    DUPLICATE_RENAMES,
+    EMPTY_TEXT_SKIPPED,
+    DOCUMENT_DATES,
     CANDIDATE_LABELS,
 )
 
 
+def _write_pdfs(directory, names):
+    """Create placeholder PDF files in directory."""
+    for name in names:
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write("pdf")
+
+
+def _done_future(result):
+    """Return a completed future holding result."""
+    from concurrent.futures import Future
+
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _hold_claim_lock(directory):
+    """Lock a claim directory as a running worker would; close the fd to unlock."""
+    fd = os.open(os.path.join(directory, ".lock"), os.O_RDWR | os.O_CREAT)
+    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return fd
+
+
 class TestGetWeekOfMonth:
     """Tests for get_week_of_month function."""
 
@@ -59,6 +120,283 @@ class TestGetWeekOfMonth:
         assert get_week_of_month(datetime(2024, 1, 31)) <= 5
 
 
+class TestLoadClassifier:
+    """Tests for load_classifier function."""
+
+    @patch('sorter.AutoModelForSequenceClassification')
+    @patch('sorter.AutoTokenizer')
+    @patch('sorter.pipeline')
+    def test_default_engine(self, mock_pipeline, mock_tokenizer, mock_model):
+        """Should build the zero-shot pipeline on the configured model."""
+        with patch('sorter.MODEL_NAME', "valhalla/distilbart-mnli-12-1"):
+            assert load_classifier("pytorch") is mock_pipeline.return_value
+
+        mock_model.from_pretrained.assert_called_once_with(
+            "valhalla/distilbart-mnli-12-1", local_files_only=False
+        )
+        assert mock_pipeline.call_args.args == ("zero-shot-classification",)
+        assert mock_pipeline.call_args.kwargs['model'] is mock_model.from_pretrained.return_value
+
+    @patch('sorter.AutoModelForSequenceClassification')
+    @patch('sorter.AutoTokenizer')
+    @patch('sorter.pipeline')
+    def test_offline_mode(self, mock_pipeline, mock_tokenizer, mock_model):
+        """Should only load local files in offline mode."""
+        with patch('sorter.MODEL_NAME', "/models/minilm"), patch('sorter.OFFLINE', True):
+            load_classifier("pytorch")
+
+        mock_tokenizer.from_pretrained.assert_called_once_with(
+            "/models/minilm", local_files_only=True
+        )
+        mock_model.from_pretrained.assert_called_once_with(
+            "/models/minilm", local_files_only=True
+        )
+
+    @patch('sorter.pipeline')
+    def test_quantized_engine(self, mock_pipeline):
+        """Should replace the model with its dynamically quantized version."""
+        mock_torch = MagicMock()
+        with patch.dict(sys.modules, {'torch': mock_torch}):
+            clf = load_classifier("quantized")
+
+        mock_torch.quantization.quantize_dynamic.assert_called_once()
+        assert clf.model is mock_torch.quantization.quantize_dynamic.return_value
+
+    @patch('sorter.AutoTokenizer')
+    @patch('sorter.pipeline')
+    def test_onnx_engine(self, mock_pipeline, mock_tokenizer):
+        """Should wrap an ONNX Runtime model in the pipeline."""
+        mock_optimum = MagicMock()
+        ort_model = mock_optimum.ORTModelForSequenceClassification.from_pretrained
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(sys.modules, {
+                'optimum': mock_optimum, 'optimum.onnxruntime': mock_optimum
+            }), patch('sorter.ONNX_CACHE_DIR', tmpdir):
+                load_classifier("onnx")
+
+        assert mock_pipeline.call_args.kwargs['model'] is ort_model.return_value
+
+    @patch('sorter.AutoTokenizer')
+    @patch('sorter.pipeline')
+    def test_onnx_export_is_saved_and_reused(self, mock_pipeline, mock_tokenizer):
+        """Should export on the first start only and load the saved export afterwards."""
+        mock_optimum = MagicMock()
+        ort_model = mock_optimum.ORTModelForSequenceClassification.from_pretrained
+
+        def save_pretrained(directory):
+            os.makedirs(directory, exist_ok=True)
+            open(os.path.join(directory, "model.onnx"), 'wb').close()
+
+        ort_model.return_value.save_pretrained.side_effect = save_pretrained
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(sys.modules, {
+                'optimum': mock_optimum, 'optimum.onnxruntime': mock_optimum
+            }), patch('sorter.ONNX_CACHE_DIR', tmpdir), \
+                    patch('sorter.MODEL_NAME', "valhalla/distilbart-mnli-12-1"):
+                load_classifier("onnx")
+                load_classifier("onnx")
+
+            export_dir = os.path.join(tmpdir, "valhalla--distilbart-mnli-12-1")
+            assert os.listdir(tmpdir) == ["valhalla--distilbart-mnli-12-1"]
+
+        assert ort_model.call_args_list[0].kwargs['export'] is True
+        assert ort_model.call_args_list[1].args == (export_dir,)
+        assert 'export' not in ort_model.call_args_list[1].kwargs
+
+    @patch('sorter.AutoTokenizer')
+    @patch('sorter.pipeline')
+    def test_onnx_model_directory_loads_without_export(self, mock_pipeline, mock_tokenizer):
+        """Should load a directory that already holds model.onnx as it is."""
+        mock_optimum = MagicMock()
+        ort_model = mock_optimum.ORTModelForSequenceClassification.from_pretrained
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            open(os.path.join(tmpdir, "model.onnx"), 'wb').close()
+            with patch.dict(sys.modules, {
+                'optimum': mock_optimum, 'optimum.onnxruntime': mock_optimum
+            }), patch('sorter.MODEL_NAME', tmpdir):
+                load_classifier("onnx")
+
+        ort_model.assert_called_once_with(tmpdir, local_files_only=True)
+        mock_tokenizer.from_pretrained.assert_called_once_with(tmpdir, local_files_only=True)
+
+    @patch('sorter.NLIClassifier')
+    @patch('sorter.pipeline')
+    def test_wraps_fast_tokenizer_pipeline(self, mock_pipeline, mock_nli):
+        """Should reuse hypothesis encodings when the tokenizer supports it."""
+        mock_nli.supports.return_value = True
+        with patch('sorter.HYPOTHESIS_TEMPLATE', "Този документ е {}."):
+            clf = load_classifier("pytorch")
+
+        assert clf is mock_nli.return_value
+        mock_nli.assert_called_once_with(
+            mock_pipeline.return_value, LABEL_REGISTRY, "Този документ е {}."
+        )
+
+    @patch('sorter.NLIClassifier')
+    @patch('sorter.pipeline')
+    def test_hypothesis_cache_disabled(self, mock_pipeline, mock_nli):
+        """Should return the plain pipeline when the hypothesis cache is off."""
+        mock_nli.supports.return_value = True
+        with patch('sorter.HYPOTHESIS_CACHE', False):
+            assert load_classifier("pytorch") is mock_pipeline.return_value
+
+        mock_nli.assert_not_called()
+
+    def test_embedding_engine(self):
+        """Should build an embedding classifier on a sentence encoder."""
+        from embeddings import EmbeddingClassifier
+
+        mock_st = MagicMock()
+        with patch.dict(sys.modules, {'sentence_transformers': mock_st}), \
+                patch('sorter.PROTOTYPE_DIR', ""):
+            clf = load_classifier("embedding")
+
+        assert isinstance(clf, EmbeddingClassifier)
+        assert clf.encoder is mock_st.SentenceTransformer.return_value
+
+    def test_unknown_engine(self):
+        """Should raise ValueError for an unknown engine."""
+        with pytest.raises(ValueError):
+            load_classifier("tensorrt")
+
+
+class TestLoadLabelExamples:
+    """Tests for load_label_examples function."""
+
+    def test_reads_text_examples_per_label(self):
+        """Should read examples from per-label sub-directories."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "Invoice"))
+            os.makedirs(os.path.join(tmpdir, "Report"))
+            with open(os.path.join(tmpdir, "Invoice", "a.txt"), 'w', encoding='utf-8') as f:
+                f.write("Фактура 1\n")
+            with open(os.path.join(tmpdir, "Invoice", "ignored.doc"), 'w') as f:
+                f.write("x")
+
+            examples = load_label_examples(tmpdir)
+
+        assert examples == {"Invoice": ["Фактура 1"]}
+
+
+class TestIterPdfPages:
+    """Tests for iter_pdf_pages function."""
+
+    @patch('sorter.pdfplumber.open')
+    def test_pages_are_extracted_lazily(self, mock_pdfplumber):
+        """Should only lay out a page when it is requested."""
+        pages = [Mock(), Mock()]
+        pages[0].extract_text.return_value = "Page 1"
+        pages[1].extract_text.return_value = None
+
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf.__enter__ = Mock(return_value=mock_pdf)
+        mock_pdf.__exit__ = Mock(return_value=False)
+
+        mock_pdfplumber.return_value = mock_pdf
+
+        generator = iter_pdf_pages("test.pdf")
+        assert next(generator) == "Page 1"
+        pages[1].extract_text.assert_not_called()
+        assert next(generator) == ""
+
+    @patch('sorter.pdfplumber.open')
+    def test_closing_early_closes_document(self, mock_pdfplumber):
+        """Should close the PDF when the consumer stops early."""
+        page = Mock()
+        page.extract_text.return_value = "text"
+
+        mock_pdf = MagicMock()
+        mock_pdf.pages = [page, page, page]
+        mock_pdf.__enter__ = Mock(return_value=mock_pdf)
+        mock_pdf.__exit__ = Mock(return_value=False)
+
+        mock_pdfplumber.return_value = mock_pdf
+
+        generator = iter_pdf_pages("test.pdf")
+        next(generator)
+        generator.close()
+
+        mock_pdf.__exit__.assert_called_once()
+        assert page.extract_text.call_count == 1
+
+    @patch('sorter.pdfplumber.open')
+    def test_pages_are_closed_after_extraction(self, mock_pdfplumber):
+        """Should close each page once its text is extracted."""
+        pages = [Mock(), Mock()]
+        pages[0].extract_text.return_value = "Page 1"
+        pages[1].extract_text.return_value = "Page 2"
+
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf.__enter__ = Mock(return_value=mock_pdf)
+        mock_pdf.__exit__ = Mock(return_value=False)
+
+        mock_pdfplumber.return_value = mock_pdf
+
+        generator = iter_pdf_pages("test.pdf")
+        assert next(generator) == "Page 1"
+        pages[0].close.assert_called_once()
+        pages[1].close.assert_not_called()
+        assert list(generator) == ["Page 2"]
+        pages[1].close.assert_called_once()
+
+    def test_missing_file_raises(self):
+        """Should propagate errors to the consumer."""
+        with pytest.raises(FileNotFoundError):
+            next(iter_pdf_pages("/nonexistent/path/file.pdf"))
+
+
+class TestExtractionBackends:
+    """Tests for the pluggable extraction backends."""
+
+    @pytest.fixture
+    def sample_pdf(self, tmp_path):
+        """Create a two-page PDF with known text."""
+        from reportlab.pdfgen import canvas
+
+        file_path = str(tmp_path / "sample.pdf")
+        c = canvas.Canvas(file_path)
+        c.drawString(100, 750, "Invoice number 42")
+        c.showPage()
+        c.drawString(100, 750, "Total 1500")
+        c.save()
+        return file_path
+
+    @pytest.mark.parametrize("backend", ["pdfplumber", "pdfminer", "pypdfium2"])
+    def test_backends_extract_each_page(self, backend, sample_pdf):
+        """Should yield the text of each page with every backend."""
+        if backend == "pypdfium2":
+            pytest.importorskip("pypdfium2")
+
+        pages = list(iter_pdf_pages(sample_pdf, backend))
+
+        assert len(pages) == 2
+        assert "Invoice number 42" in pages[0]
+        assert "Total 1500" in pages[1]
+
+    def test_pdfminer_keeps_word_and_line_breaks(self, tmp_path):
+        """Should separate text drawn by separate operators instead of fusing it."""
+        from reportlab.pdfgen import canvas
+
+        file_path = str(tmp_path / "lines.pdf")
+        c = canvas.Canvas(file_path)
+        c.drawString(100, 750, "Total:")
+        c.drawString(140, 750, "1500")
+        c.drawString(100, 730, "Invoice")
+        c.save()
+
+        assert list(iter_pdf_pages(file_path, "pdfminer")) == ["Total: 1500\nInvoice"]
+
+    def test_unknown_backend(self, sample_pdf):
+        """Should reject unknown backends and isolate the error."""
+        with pytest.raises(ValueError):
+            next(iter_pdf_pages(sample_pdf, "nope"))
+        assert extract_text_from_pdf(sample_pdf, "nope") == ""
+
+
 class TestExtractTextFromPdf:
     """Tests for extract_text_from_pdf function."""
 
@@ -117,6 +455,46 @@ class TestExtractTextFromPdf:
         result = extract_text_from_pdf("test.pdf")
         assert result == ""
 
+    @patch('sorter.pdfplumber.open')
+    def test_page_limit_stops_early(self, mock_pdfplumber):
+        """Should not parse pages beyond MAX_EXTRACT_PAGES."""
+        pages = [Mock() for _ in range(5)]
+        for i, page in enumerate(pages):
+            page.extract_text.return_value = f"Page {i}"
+
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf.__enter__ = Mock(return_value=mock_pdf)
+        mock_pdf.__exit__ = Mock(return_value=False)
+
+        mock_pdfplumber.return_value = mock_pdf
+
+        with patch('sorter.MAX_EXTRACT_PAGES', 2):
+            result = extract_text_from_pdf("test.pdf")
+
+        assert result == "Page 0Page 1"
+        pages[2].extract_text.assert_not_called()
+
+    @patch('sorter.pdfplumber.open')
+    def test_char_budget_stops_early(self, mock_pdfplumber):
+        """Should stop and truncate once MAX_EXTRACT_CHARS is reached."""
+        pages = [Mock() for _ in range(3)]
+        for page in pages:
+            page.extract_text.return_value = "abcdef"
+
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf.__enter__ = Mock(return_value=mock_pdf)
+        mock_pdf.__exit__ = Mock(return_value=False)
+
+        mock_pdfplumber.return_value = mock_pdf
+
+        with patch('sorter.MAX_EXTRACT_CHARS', 8):
+            result = extract_text_from_pdf("test.pdf")
+
+        assert result == "abcdefab"
+        pages[2].extract_text.assert_not_called()
+
     @patch('sorter.pdfplumber.open')
     def test_exception_handling(self, mock_pdfplumber):
         """Should return empty string on exception."""
@@ -126,6 +504,57 @@ class TestExtractTextFromPdf:
         assert result == ""
 
 
+class TestIterExtractedTexts:
+    """Tests for iter_extracted_texts function."""
+
+    @patch('sorter.extract_text_from_pdf')
+    def test_serial_extraction(self, mock_extract):
+        """Should extract files in order when running single-process."""
+        mock_extract.side_effect = lambda path: "text of " + path
+
+        with patch('sorter.EXTRACT_WORKERS', 1):
+            results = list(iter_extracted_texts(["a.pdf", "b.pdf"]))
+
+        assert results == [("a.pdf", "text of a.pdf"), ("b.pdf", "text of b.pdf")]
+
+    def test_process_pool_isolates_errors(self):
+        """Should extract in worker processes and isolate per-file failures."""
+        from reportlab.pdfgen import canvas
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            good_file = os.path.join(tmpdir, "good.pdf")
+            c = canvas.Canvas(good_file)
+            c.drawString(100, 750, "Invoice 42")
+            c.save()
+            missing_file = os.path.join(tmpdir, "missing.pdf")
+
+            with patch('sorter.EXTRACT_WORKERS', 2):
+                try:
+                    results = dict(iter_extracted_texts([good_file, missing_file]))
+                finally:
+                    shutdown_extract_executor()
+
+        assert "Invoice 42" in results[good_file]
+        assert results[missing_file] == ""
+
+    @patch('sorter.ProcessPoolExecutor')
+    def test_process_pool_is_reused_across_cycles(self, mock_pool_class):
+        """Should start the process pool once and keep it until shut down."""
+        mock_pool = mock_pool_class.return_value
+        mock_pool.submit.side_effect = lambda fn, path: _done_future(("text", 0.1))
+
+        with patch('sorter.EXTRACT_WORKERS', 2), patch('sorter._extract_executor', None):
+            for _ in range(3):
+                assert dict(iter_extracted_texts(["a.pdf", "b.pdf"])) == {
+                    "a.pdf": "text", "b.pdf": "text"
+                }
+            assert get_extract_executor() is mock_pool
+            shutdown_extract_executor()
+
+        mock_pool_class.assert_called_once_with(max_workers=2)
+        mock_pool.shutdown.assert_called_once_with(wait=True)
+
+
 class TestClassifyDocument:
     """Tests for classify_document function."""
 
@@ -162,6 +591,765 @@ class TestClassifyDocument:
         assert result is None
 
 
+class TestShapeText:
+    """Tests for shape_text function."""
+
+    TEXT = " ".join(f"w{i}" for i in range(10))
+
+    def test_full_strategy_keeps_text(self):
+        """Should return the text unchanged by default."""
+        with patch('sorter.INPUT_STRATEGY', "full"), patch('sorter.MAX_INPUT_TOKENS', 4):
+            assert shape_text(self.TEXT) == [self.TEXT]
+
+    def test_short_text_is_untouched(self):
+        """Should not reshape texts within the token budget."""
+        with patch('sorter.INPUT_STRATEGY', "head"), patch('sorter.MAX_INPUT_TOKENS', 50):
+            assert shape_text(self.TEXT) == [self.TEXT]
+
+    def test_head(self):
+        """Should keep the first MAX_INPUT_TOKENS words."""
+        with patch('sorter.INPUT_STRATEGY', "head"), patch('sorter.MAX_INPUT_TOKENS', 3):
+            assert shape_text(self.TEXT) == ["w0 w1 w2"]
+
+    def test_head_tail(self):
+        """Should keep words from the beginning and the end."""
+        with patch('sorter.INPUT_STRATEGY', "head_tail"), patch('sorter.MAX_INPUT_TOKENS', 4):
+            assert shape_text(self.TEXT) == ["w0 w1 w8 w9"]
+
+    def test_chunks_are_capped(self):
+        """Should split into chunks and keep at most MAX_CHUNKS of them."""
+        with patch('sorter.INPUT_STRATEGY', "chunks"), \
+                patch('sorter.MAX_INPUT_TOKENS', 3), patch('sorter.MAX_CHUNKS', 2):
+            assert shape_text(self.TEXT) == ["w0 w1 w2", "w3 w4 w5"]
+
+
+class TestAggregateChunkResults:
+    """Tests for aggregate_chunk_results function."""
+
+    def test_mean_scores_ranked(self):
+        """Should average scores per label and rank them."""
+        result = aggregate_chunk_results([
+            {'labels': ['Invoice', 'Report'], 'scores': [0.6, 0.4]},
+            {'labels': ['Report', 'Invoice'], 'scores': [0.9, 0.1]},
+        ])
+
+        assert result['labels'] == ['Report', 'Invoice']
+        assert result['scores'] == pytest.approx([0.65, 0.35])
+
+
+class TestClassifyTexts:
+    """Tests for classify_texts function."""
+
+    def test_empty_input(self):
+        """Should not call the classifier for an empty batch."""
+        mock_classifier = Mock()
+        assert classify_texts([], mock_classifier) == []
+        mock_classifier.assert_not_called()
+
+    def test_batch_results_in_order(self):
+        """Should return one result per text in input order."""
+        mock_classifier = Mock()
+        mock_classifier.return_value = [
+            {'labels': ['Invoice'], 'scores': [0.9]},
+            {'labels': ['Report'], 'scores': [0.8]},
+        ]
+
+        results = classify_texts(["a", "b"], mock_classifier)
+
+        assert [r['labels'][0] for r in results] == ["Invoice", "Report"]
+        args, kwargs = mock_classifier.call_args
+        assert args[0] == ["a", "b"]
+        assert 'batch_size' in kwargs
+
+    def test_single_dict_result_is_wrapped(self):
+        """Should wrap a bare dict result into a list."""
+        mock_classifier = Mock()
+        mock_classifier.return_value = {'labels': ['Protocol'], 'scores': [0.7]}
+
+        results = classify_texts(["a"], mock_classifier)
+        assert results == [{'labels': ['Protocol'], 'scores': [0.7]}]
+
+    def test_cache_skips_classifier_for_known_texts(self):
+        """Should only send uncached texts to the classifier."""
+        from cache import ClassificationCache
+
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Invoice'], 'scores': [0.9]} for _ in texts
+        ]
+
+        with patch('sorter._classification_cache', ClassificationCache(":memory:")):
+            classify_texts(["a"], mock_classifier)
+            results = classify_texts(["a", "b"], mock_classifier)
+
+        assert [r['labels'][0] for r in results] == ["Invoice", "Invoice"]
+        assert mock_classifier.call_args_list[1].args[0] == ["b"]
+
+    def test_chunked_texts_are_aggregated(self):
+        """Should classify every chunk and return one result per text."""
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Invoice', 'Report'], 'scores': [0.7, 0.3]} for _ in texts
+        ]
+
+        with patch('sorter.INPUT_STRATEGY', "chunks"), patch('sorter.MAX_INPUT_TOKENS', 2):
+            results = classify_texts(["a b c d", "e"], mock_classifier)
+
+        assert mock_classifier.call_args.args[0] == ["a b", "c d", "e"]
+        assert len(results) == 2
+        assert results[0]['labels'][0] == 'Invoice'
+        assert results[0]['scores'][0] == pytest.approx(0.7)
+
+    def test_rules_short_circuit_the_model(self):
+        """Should only send texts no rule decides to the classifier."""
+        from rules import DEFAULT_RULES, RulePreClassifier
+
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Report'], 'scores': [0.6]} for _ in texts
+        ]
+
+        with patch('sorter._rule_classifier', RulePreClassifier(DEFAULT_RULES)):
+            results = classify_texts(["Фактура No 1", "неясен текст"], mock_classifier)
+
+        assert [r['labels'][0] for r in results] == ["Invoice", "Report"]
+        assert mock_classifier.call_args.args[0] == ["неясен текст"]
+
+    def test_exception_returns_none_per_text(self):
+        """Should return None for every text when the batch fails."""
+        mock_classifier = Mock()
+        mock_classifier.side_effect = Exception("Model error")
+
+        assert classify_texts(["a", "b"], mock_classifier) == [None, None]
+
+
+class TestProcessFiles:
+    """Tests for process_files function."""
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_batches_classifier_calls(self, mock_extract, mock_move):
+        """Should send texts to the classifier in BATCH_SIZE groups."""
+        mock_extract.side_effect = lambda path: "text " + os.path.basename(path)
+        mock_move.return_value = "target"
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Invoice'], 'scores': [0.9]} for _ in texts
+        ]
+        filed = DOCUMENTS_FILED.value(label="Invoice")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf", "b.pdf", "c.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir), patch('sorter.BATCH_SIZE', 2):
+                processed = process_files(mock_classifier)
+
+        assert processed == 3
+        assert DOCUMENTS_FILED.value(label="Invoice") == filed + 3
+        batch_lengths = [len(c.args[0]) for c in mock_classifier.call_args_list]
+        assert sorted(batch_lengths) == [1, 2]
+        assert mock_move.call_count == 3
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_skips_files_without_text(self, mock_extract, mock_move):
+        """Should not classify files that yield no text."""
+        mock_extract.return_value = ""
+        mock_classifier = Mock()
+        skipped = EMPTY_TEXT_SKIPPED.value()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir):
+                processed = process_files(mock_classifier)
+
+        assert processed == 0
+        assert EMPTY_TEXT_SKIPPED.value() == skipped + 1
+        mock_classifier.assert_not_called()
+        mock_move.assert_not_called()
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_explicit_file_names(self, mock_extract, mock_move):
+        """Should only process the given files that still exist."""
+        mock_extract.return_value = "text"
+        mock_move.return_value = "target"
+        mock_classifier = Mock()
+        mock_classifier.return_value = {'labels': ['Invoice'], 'scores': [0.9]}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf", "b.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir):
+                processed = process_files(
+                    mock_classifier, ["a.pdf", "gone.pdf", "notes.txt"]
+                )
+
+        assert processed == 1
+        mock_extract.assert_called_once_with(os.path.join(tmpdir, "a.pdf"))
+
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_low_confidence_is_quarantined(self, mock_extract, mock_move):
+        """Should send documents below MIN_CONFIDENCE to the review directory."""
+        mock_extract.return_value = "text"
+        mock_move.return_value = "target"
+        mock_classifier = Mock()
+        mock_classifier.return_value = {
+            'labels': ['Invoice', 'Protocol', 'Report'],
+            'scores': [0.4, 0.35, 0.25]
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            review_dir = os.path.join(tmpdir, "review")
+            _write_pdfs(tmpdir, ["a.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.QUARANTINE_DIR', review_dir), \
+                    patch('sorter.MIN_CONFIDENCE', 0.5):
+                processed = process_files(mock_classifier)
+
+            assert processed == 1
+            assert os.path.exists(os.path.join(review_dir, "a.pdf"))
+            mock_move.assert_not_called()
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_pipelined_stages(self, mock_extract, mock_move):
+        """Should extract, classify and move every file through the staged pipeline."""
+        mock_extract.side_effect = lambda path: "" if path.endswith("empty.pdf") else "text"
+        mock_move.return_value = "target"
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Invoice'], 'scores': [0.9]} for _ in texts
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf", "b.pdf", "c.pdf", "empty.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.PIPELINE_ENABLED', True), \
+                    patch('sorter.MOVE_WORKERS', 3), \
+                    patch('sorter.BATCH_SIZE', 2):
+                processed = process_files(mock_classifier)
+
+        assert processed == 3
+        assert sum(len(c.args[0]) for c in mock_classifier.call_args_list) == 3
+        assert all(len(c.args[0]) <= 2 for c in mock_classifier.call_args_list)
+        moved = sorted(os.path.basename(c.args[0]) for c in mock_move.call_args_list)
+        assert moved == ["a.pdf", "b.pdf", "c.pdf"]
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_files_under_date_in_text(self, mock_extract, mock_move):
+        """Should file each document under the date printed in it, in both modes."""
+        mock_extract.side_effect = lambda path: (
+            "Документ: Фактура\nДата: 29-01-2024" if path.endswith("a.pdf") else "Без дата"
+        )
+        mock_move.return_value = "target"
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Invoice'], 'scores': [0.9]} for _ in texts
+        ]
+
+        for pipelined in (False, True):
+            mock_move.reset_mock()
+            with tempfile.TemporaryDirectory() as tmpdir:
+                _write_pdfs(tmpdir, ["a.pdf", "b.pdf"])
+                os.utime(os.path.join(tmpdir, "b.pdf"), (0, datetime(2023, 5, 6).timestamp()))
+                with patch('sorter.INPUT_DIR', tmpdir), \
+                        patch('sorter.PIPELINE_ENABLED', pipelined):
+                    assert process_files(mock_classifier) == 2
+
+            dates = {os.path.basename(c.args[0]): c.args[2] for c in mock_move.call_args_list}
+            assert dates == {"a.pdf": datetime(2024, 1, 29), "b.pdf": datetime(2023, 5, 6)}
+
+
+class TestResolveDocumentDate:
+    """Tests for resolve_document_date and pdf_creation_date."""
+
+    def test_text_date(self):
+        """Should take the date from the text and count its source."""
+        before = DOCUMENT_DATES.value(source="text")
+        date = resolve_document_date("missing.pdf", "Протокол от 15.09.2023 г.")
+        assert date == datetime(2023, 9, 15)
+        assert DOCUMENT_DATES.value(source="text") == before + 1
+
+    def test_scan_limit_and_implausible_years(self):
+        """Should ignore dates beyond DATE_SCAN_CHARS and before DATE_MIN_YEAR."""
+        with patch('sorter.pdf_creation_date', return_value=datetime(2022, 2, 2)):
+            with patch('sorter.DATE_SCAN_CHARS', 10):
+                assert resolve_document_date("a.pdf", "x" * 20 + "01.03.2024") == \
+                    datetime(2022, 2, 2)
+            assert resolve_document_date("a.pdf", "01.01.1901 и 01.03.2024") == \
+                datetime(2024, 3, 1)
+
+    @patch('sorter.pdf_creation_date')
+    def test_metadata_then_mtime(self, mock_metadata):
+        """Should fall back to the PDF creation date, then the modification time."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.pdf")
+            _write_pdfs(tmpdir, ["a.pdf"])
+            os.utime(path, (0, datetime(2021, 7, 8, 9, 0).timestamp()))
+
+            mock_metadata.return_value = datetime(2022, 2, 2)
+            assert resolve_document_date(path, "no date") == datetime(2022, 2, 2)
+
+            mock_metadata.return_value = None
+            assert resolve_document_date(path, "no date") == datetime(2021, 7, 8, 9, 0)
+
+    def test_pdf_creation_date(self):
+        """Should read CreationDate from a real PDF and ignore unreadable files."""
+        from reportlab.pdfgen import canvas
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.pdf")
+            pdf = canvas.Canvas(path, invariant=1)  # creation date 2000-01-01
+            pdf.drawString(100, 750, "text")
+            pdf.save()
+            _write_pdfs(tmpdir, ["broken.pdf"])
+
+            assert pdf_creation_date(path) == datetime(2000, 1, 1)
+            assert pdf_creation_date(os.path.join(tmpdir, "broken.pdf")) is None
+
+
+def _write_tagged_pdf(path, title="", subject="", keywords=()):
+    """Create a one-page PDF with the given document information."""
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(path, invariant=1)  # creation date 2000-01-01
+    pdf.setTitle(title)
+    pdf.setSubject(subject)
+    pdf.setKeywords(list(keywords))
+    pdf.drawString(100, 750, "text")
+    pdf.save()
+
+
+class TestReadPdfMetadata:
+    """Tests for read_pdf_metadata function."""
+
+    def test_reads_fields(self):
+        """Should return the descriptive fields and the creation date as text."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.pdf")
+            _write_tagged_pdf(path, "Фактура от 15.06.2024", "услуги", ["фактура", "2024"])
+            metadata = read_pdf_metadata(path)
+
+        assert metadata['Title'] == "Фактура от 15.06.2024"
+        assert metadata['Subject'] == "услуги"
+        assert "фактура" in metadata['Keywords']
+        assert metadata['CreationDate'].startswith("D:2000")
+
+    def test_unreadable_file(self):
+        """Should return an empty dict for files that are not PDFs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf"])
+            assert read_pdf_metadata(os.path.join(tmpdir, "a.pdf")) == {}
+
+
+class TestFileByMetadata:
+    """Tests for file_by_metadata and the metadata fast path of process_files."""
+
+    def test_disabled(self):
+        """Should leave every file for extraction when the fast path is off."""
+        with patch('sorter.METADATA_RULES_ENABLED', False), \
+                patch('sorter._metadata_rule_classifier', None):
+            assert file_by_metadata(["a.pdf"]) == (0, ["a.pdf"])
+
+    @patch('sorter.move_file_to_correct_directory')
+    @patch('sorter.extract_text_from_pdf')
+    def test_tagged_documents_skip_extraction(self, mock_extract, mock_move):
+        """Should file tagged PDFs by metadata and extract only the others."""
+        mock_extract.return_value = "Протокол"
+        mock_move.return_value = "target"
+        mock_classifier = Mock()
+        mock_classifier.side_effect = lambda texts, labels, **kwargs: [
+            {'labels': ['Protocol'], 'scores': [0.9]} for _ in texts
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_tagged_pdf(os.path.join(tmpdir, "tagged.pdf"), "Фактура от 15.06.2024")
+            _write_tagged_pdf(os.path.join(tmpdir, "keywords.pdf"), keywords=["Отчет"])
+            _write_tagged_pdf(os.path.join(tmpdir, "plain.pdf"), "Scan 0001")
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.METADATA_RULES_ENABLED', True), \
+                    patch('sorter._metadata_rule_classifier', None):
+                processed = process_files(mock_classifier)
+
+        assert processed == 3
+        mock_extract.assert_called_once_with(os.path.join(tmpdir, "plain.pdf"))
+        filed = {os.path.basename(c.args[0]): c.args[1:] for c in mock_move.call_args_list}
+        assert filed["tagged.pdf"] == ("Invoice", datetime(2024, 6, 15))
+        assert filed["keywords.pdf"] == ("Report", datetime(2000, 1, 1))
+        assert filed["plain.pdf"][0] == "Protocol"
+
+
+class TestClaimFiles:
+    """Tests for list_input_files, claim_file and release_claims with claiming on."""
+
+    def test_workers_claim_disjoint_files(self):
+        """Should hand every file to exactly one of several concurrent workers."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        names = [f"{n}.pdf" for n in range(50)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, names)
+
+            def claim_all(worker_id):
+                claimed = []
+                for name in names:
+                    with patch('sorter.WORKER_ID', worker_id):
+                        path = claim_file(os.path.join(tmpdir, name))
+                    if path is not None:
+                        claimed.append(os.path.basename(path))
+                return claimed
+
+            with patch('sorter.INPUT_DIR', tmpdir):
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    claims = list(executor.map(claim_all, ["w1", "w2", "w3", "w4"]))
+
+            all_claims = [name for claimed in claims for name in claimed]
+            assert sorted(all_claims) == sorted(names)
+            assert not [f for f in os.listdir(tmpdir) if f.endswith('.pdf')]
+
+    def test_list_returns_claimed_paths(self):
+        """Should move listed files into the worker's processing directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_pdfs(tmpdir, ["a.pdf", "b.pdf"])
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.CLAIM_FILES', True), \
+                    patch('sorter.WORKER_ID', "host-1"):
+                paths = list_input_files()
+
+            claim_dir = os.path.join(tmpdir, "processing", "host-1")
+            assert sorted(paths) == [
+                os.path.join(claim_dir, "a.pdf"), os.path.join(claim_dir, "b.pdf")
+            ]
+            assert all(os.path.exists(path) for path in paths)
+
+    def test_full_scan_releases_unfinished_claims(self):
+        """Should retry files this worker claimed but never filed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim_dir = os.path.join(tmpdir, "processing", "host-1")
+            other_dir = os.path.join(tmpdir, "processing", "host-2")
+            os.makedirs(claim_dir)
+            os.makedirs(other_dir)
+            _write_pdfs(claim_dir, ["stuck.pdf"])
+            _write_pdfs(other_dir, ["theirs.pdf"])
+
+            other_lock = _hold_claim_lock(other_dir)
+            try:
+                with patch('sorter.INPUT_DIR', tmpdir), \
+                        patch('sorter.CLAIM_FILES', True), \
+                        patch('sorter.WORKER_ID', "host-1"):
+                    paths = list_input_files()
+            finally:
+                os.close(other_lock)
+
+            assert paths == [os.path.join(claim_dir, "stuck.pdf")]
+            assert os.path.exists(os.path.join(other_dir, "theirs.pdf"))
+
+    def test_full_scan_recovers_stopped_workers_claims(self):
+        """Should release claims of workers whose lock is no longer held."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            other_dir = os.path.join(tmpdir, "processing", "host-2")
+            os.makedirs(other_dir)
+            _write_pdfs(other_dir, ["orphan.pdf"])
+
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.CLAIM_FILES', True), \
+                    patch('sorter.WORKER_ID', "host-1"):
+                paths = list_input_files()
+
+            assert paths == [os.path.join(tmpdir, "processing", "host-1", "orphan.pdf")]
+            assert os.listdir(other_dir) == [".lock"]
+
+    def test_lock_refuses_second_worker_with_same_id(self):
+        """Should fail fast when a running worker holds the same claim directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim_dir = os.path.join(tmpdir, "processing", "host-1")
+            os.makedirs(claim_dir)
+            first_lock = _hold_claim_lock(claim_dir)
+            try:
+                with patch('sorter.INPUT_DIR', tmpdir), \
+                        patch('sorter.WORKER_ID', "host-1"), \
+                        patch('sorter._claim_lock', None), \
+                        patch('sorter._CLAIM_LOCK_WAIT', 0):
+                    with pytest.raises(RuntimeError, match="host-1"):
+                        lock_claim_directory()
+            finally:
+                os.close(first_lock)
+
+    def test_release_claims(self):
+        """Should move claimed files back to the input directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim_dir = os.path.join(tmpdir, "processing", "host-1")
+            os.makedirs(claim_dir)
+            _write_pdfs(claim_dir, ["a.pdf"])
+
+            with patch('sorter.INPUT_DIR', tmpdir), patch('sorter.WORKER_ID', "host-1"):
+                assert release_claims() == 1
+
+            assert os.path.exists(os.path.join(tmpdir, "a.pdf"))
+
+    def test_claim_never_replaces_unfiled_document(self):
+        """Should keep both documents when a claimed name is dropped again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim_dir = os.path.join(tmpdir, "processing", "host-1")
+            os.makedirs(claim_dir)
+            with open(os.path.join(claim_dir, "scan.pdf"), 'w') as f:
+                f.write("first")
+            with open(os.path.join(tmpdir, "scan.pdf"), 'w') as f:
+                f.write("second")
+
+            with patch('sorter.INPUT_DIR', tmpdir), patch('sorter.WORKER_ID', "host-1"):
+                claimed = claim_file(os.path.join(tmpdir, "scan.pdf"))
+
+            assert claimed == os.path.join(claim_dir, "scan_1.pdf")
+            with open(os.path.join(claim_dir, "scan.pdf")) as f:
+                assert f.read() == "first"
+            with open(claimed) as f:
+                assert f.read() == "second"
+
+    def test_release_never_replaces_waiting_document(self):
+        """Should release under a new name when the name is waiting again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim_dir = os.path.join(tmpdir, "processing", "host-1")
+            os.makedirs(claim_dir)
+            with open(os.path.join(claim_dir, "scan.pdf"), 'w') as f:
+                f.write("first")
+            with open(os.path.join(tmpdir, "scan.pdf"), 'w') as f:
+                f.write("second")
+
+            with patch('sorter.INPUT_DIR', tmpdir), \
+                    patch('sorter.CLAIM_FILES', True), \
+                    patch('sorter.WORKER_ID', "host-1"):
+                paths = list_input_files()
+
+            contents = set()
+            for path in paths:
+                with open(path) as f:
+                    contents.add(f.read())
+            assert len(paths) == 2
+            assert contents == {"first", "second"}
+
+    @patch('sorter.extract_text_from_pdf')
+    def test_process_files_files_claimed_documents(self, mock_extract):
+        """Should file documents from the claim directory into the archive."""
+        mock_extract.return_value = "text"
+        mock_classifier = Mock()
+        mock_classifier.return_value = {'labels': ['Invoice'], 'scores': [0.9]}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_dir = os.path.join(tmpdir, "in")
+            os.makedirs(input_dir)
+            _write_pdfs(input_dir, ["a.pdf"])
+            with patch('sorter.INPUT_DIR', input_dir), \
+                    patch('sorter.OUTPUT_DIR', os.path.join(tmpdir, "out")), \
+                    patch('sorter.CLAIM_FILES', True), \
+                    patch('sorter.WORKER_ID', "host-1"):
+                assert process_files(mock_classifier) == 1
+
+            mock_extract.assert_called_once_with(
+                os.path.join(input_dir, "processing", "host-1", "a.pdf")
+            )
+            assert os.listdir(os.path.join(input_dir, "processing", "host-1")) == []
+
+
+class TestRenameNoReplace:
+    """Tests for rename_no_replace function."""
+
+    @pytest.mark.parametrize("renameat2", [True, False])
+    def test_refuses_existing_target(self, renameat2):
+        """Should raise FileExistsError and leave both files in place."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "a.pdf")
+            target = os.path.join(tmpdir, "b.pdf")
+            for path in (source, target):
+                with open(path, 'w') as f:
+                    f.write(path)
+
+            with patch('sorter._renameat2', None if renameat2 else False):
+                with pytest.raises(FileExistsError):
+                    rename_no_replace(source, target)
+
+            with open(target) as f:
+                assert f.read() == target
+            assert os.path.exists(source)
+
+    @pytest.mark.parametrize("renameat2", [True, False])
+    def test_renames(self, renameat2):
+        """Should rename when the target is free."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "a.pdf")
+            target = os.path.join(tmpdir, "b.pdf")
+            with open(source, 'w') as f:
+                f.write("a")
+
+            with patch('sorter._renameat2', None if renameat2 else False):
+                rename_no_replace(source, target)
+
+            assert not os.path.exists(source)
+            with open(target) as f:
+                assert f.read() == "a"
+
+    def test_without_hard_links(self):
+        """Should fall back to a checked rename where links are refused."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "a.pdf")
+            taken = os.path.join(tmpdir, "b.pdf")
+            for path in (source, taken):
+                with open(path, 'w') as f:
+                    f.write("x")
+
+            with patch('sorter._renameat2', False), \
+                    patch('sorter.os.link', side_effect=PermissionError(errno.EPERM, "denied")):
+                with pytest.raises(FileExistsError):
+                    rename_no_replace(source, taken)
+                rename_no_replace(source, os.path.join(tmpdir, "c.pdf"))
+
+            assert sorted(os.listdir(tmpdir)) == ["b.pdf", "c.pdf"]
+
+
+class TestQuarantineFile:
+    """Tests for quarantine_file function."""
+
+    def test_writes_scores_next_to_file(self):
+        """Should move the file and save its scores alongside."""
+        result = {'labels': ['Report', 'Invoice'], 'scores': [0.55, 0.45]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_file = os.path.join(tmpdir, "doc.pdf")
+            with open(source_file, 'w') as f:
+                f.write("test")
+            review_dir = os.path.join(tmpdir, "review")
+
+            with patch('sorter.QUARANTINE_DIR', review_dir):
+                target = quarantine_file(source_file, result)
+
+            assert target == os.path.join(review_dir, "doc.pdf")
+            assert not os.path.exists(source_file)
+            with open(target + ".scores.json", encoding='utf-8') as f:
+                saved = json.load(f)
+            assert saved['labels'] == ['Report', 'Invoice']
+            assert saved['scores'] == [0.55, 0.45]
+
+    def test_failed_move_returns_none(self):
+        """Should return None when the file cannot be moved."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('sorter.QUARANTINE_DIR', tmpdir):
+                result = quarantine_file(
+                    "/nonexistent/doc.pdf", {'labels': ['Report'], 'scores': [0.1]}
+                )
+        assert result is None
+
+
+class TestParseInotifyEvents:
+    """Tests for parse_inotify_events function."""
+
+    def test_decodes_padded_names(self):
+        """Should decode names and strip their NUL padding."""
+        buffer = b""
+        for name in ["a.pdf".encode(), "Фактура.pdf".encode()]:
+            padded = name.ljust(32, b"\0")
+            buffer += struct.pack("iIII", 1, IN_CLOSE_WRITE, 0, len(padded)) + padded
+
+        assert parse_inotify_events(buffer) == [
+            (IN_CLOSE_WRITE, "a.pdf"), (IN_CLOSE_WRITE, "Фактура.pdf")
+        ]
+
+    def test_keeps_mask_of_nameless_events(self):
+        """Should report events without a file name, such as a queue overflow."""
+        buffer = struct.pack("iIII", -1, IN_Q_OVERFLOW, 0, 0)
+        buffer += struct.pack("iIII", 1, IN_MOVED_TO, 0, 8) + b"b.pdf\0\0\0"
+        assert parse_inotify_events(buffer) == [(IN_Q_OVERFLOW, ""), (IN_MOVED_TO, "b.pdf")]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestInotifyWatcher:
+    """Tests for the InotifyWatcher class."""
+
+    def test_reports_written_and_moved_files(self):
+        """Should report files closed after writing and files moved in."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watched = os.path.join(tmpdir, "in")
+            os.makedirs(watched)
+            watcher = InotifyWatcher(watched)
+            try:
+                _write_pdfs(watched, ["written.pdf"])
+                _write_pdfs(tmpdir, ["moved.pdf"])
+                os.rename(
+                    os.path.join(tmpdir, "moved.pdf"),
+                    os.path.join(watched, "moved.pdf")
+                )
+
+                names = []
+                while len(names) < 2:
+                    new_names, overflowed = watcher.read_events()
+                    assert not overflowed
+                    names.extend(new_names)
+            finally:
+                watcher.close()
+
+        assert names == ["written.pdf", "moved.pdf"]
+
+    def test_read_times_out(self):
+        """Should return no names when nothing lands before the timeout."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = InotifyWatcher(tmpdir)
+            try:
+                assert watcher.read_events(timeout=0.01) == ([], False)
+            finally:
+                watcher.close()
+
+    def test_missing_directory_raises(self):
+        """Should raise OSError when the directory cannot be watched."""
+        with pytest.raises(OSError):
+            InotifyWatcher("/nonexistent/path")
+
+
+class TestWatchInputDirectory:
+    """Tests for watch_input_directory function."""
+
+    @patch('sorter.reload_labels')
+    @patch('sorter.process_files')
+    @patch('sorter.InotifyWatcher')
+    def test_overflow_triggers_full_scan(self, mock_watcher_class, mock_process, mock_reload):
+        """Should rescan the whole directory after an inotify queue overflow."""
+        mock_process.return_value = 0
+        mock_watcher_class.return_value.read_events.side_effect = [
+            (["a.pdf"], False), ([], True), KeyboardInterrupt
+        ]
+        classifier = Mock()
+
+        with patch('sorter.RESCAN_INTERVAL', 0), pytest.raises(KeyboardInterrupt):
+            watch_input_directory(classifier)
+
+        calls = [c.args for c in mock_process.call_args_list]
+        assert calls == [(classifier,), (classifier, ["a.pdf"]), (classifier, None)]
+        mock_watcher_class.return_value.close.assert_called_once()
+
+    @patch('sorter.reload_labels')
+    @patch('sorter.process_files')
+    @patch('sorter.InotifyWatcher')
+    def test_periodic_rescan(self, mock_watcher_class, mock_process, mock_reload):
+        """Should rescan the directory every RESCAN_INTERVAL without events."""
+        mock_process.return_value = 0
+        timeouts = []
+
+        def read_events(timeout):
+            timeouts.append(timeout)
+            if len(timeouts) > 1:
+                raise KeyboardInterrupt
+            time.sleep(timeout)
+            return [], False
+
+        mock_watcher_class.return_value.read_events.side_effect = read_events
+        classifier = Mock()
+
+        with patch('sorter.RESCAN_INTERVAL', 0.01), pytest.raises(KeyboardInterrupt):
+            watch_input_directory(classifier)
+
+        assert 0 <= timeouts[0] <= 0.01
+        assert [c.args for c in mock_process.call_args_list] == [(classifier,), (classifier, None)]
+
+
 class TestMoveFileToCorrectDirectory:
     """Tests for move_file_to_correct_directory function."""
 
@@ -211,6 +1399,7 @@ class TestMoveFileToCorrectDirectory:
             with open(source_file, 'w') as f:
                 f.write("new")
 
+            renames = DUPLICATE_RENAMES.value()
             with patch('sorter.OUTPUT_DIR', tmpdir):
                 test_date = datetime(2024, 1, 1)
                 result = move_file_to_correct_directory(
@@ -219,6 +1408,152 @@ class TestMoveFileToCorrectDirectory:
 
                 assert result is not None
                 assert "_1.pdf" in result
+            assert DUPLICATE_RENAMES.value() == renames + 1
+
+    def test_concurrent_duplicates_get_distinct_names(self):
+        """Should never let concurrent moves of the same name overwrite each other."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sources = []
+            for n in range(8):
+                os.makedirs(os.path.join(tmpdir, f"in{n}"))
+                source_file = os.path.join(tmpdir, f"in{n}", "test.pdf")
+                with open(source_file, 'w') as f:
+                    f.write(str(n))
+                sources.append(source_file)
+
+            with patch('sorter.OUTPUT_DIR', os.path.join(tmpdir, "out")):
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    results = list(executor.map(
+                        lambda path: move_file_to_correct_directory(
+                            path, "Invoice", datetime(2024, 1, 1)
+                        ),
+                        sources
+                    ))
+
+            assert len(set(results)) == 8
+            contents = set()
+            for result in results:
+                with open(result) as f:
+                    contents.add(f.read())
+            assert contents == {str(n) for n in range(8)}
+
+
+    def test_copies_across_filesystems(self):
+        """Should copy under a hidden name when the archive is on another filesystem."""
+        link = os.link
+
+        def cross_device_link(source, target):
+            if os.path.basename(source) == "test.pdf":
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            return link(source, target)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_file = os.path.join(tmpdir, "test.pdf")
+            with open(source_file, 'w') as f:
+                f.write("test")
+
+            with patch('sorter.OUTPUT_DIR', tmpdir), \
+                    patch('sorter.os.link', side_effect=cross_device_link):
+                result = move_file_to_correct_directory(
+                    source_file, "Invoice", datetime(2024, 1, 1)
+                )
+
+            assert result is not None
+            assert not os.path.exists(source_file)
+            assert os.listdir(os.path.dirname(result)) == ["test.pdf"]
+            with open(result) as f:
+                assert f.read() == "test"
+
+    @pytest.mark.parametrize("renameat2", [True, False])
+    def test_moves_files_that_may_not_be_linked(self, renameat2):
+        """Should file documents when hard links are refused or unsupported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target_dir = os.path.join(tmpdir, "Invoices", "2024", "Month_1", "Week_1")
+            os.makedirs(target_dir)
+            with open(os.path.join(target_dir, "test.pdf"), 'w') as f:
+                f.write("existing")
+            source_file = os.path.join(tmpdir, "test.pdf")
+            with open(source_file, 'w') as f:
+                f.write("new")
+
+            with patch('sorter.OUTPUT_DIR', tmpdir), \
+                    patch('sorter._renameat2', None if renameat2 else False), \
+                    patch('sorter.os.link', side_effect=PermissionError(errno.EPERM, "denied")):
+                result = move_file_to_correct_directory(
+                    source_file, "Invoice", datetime(2024, 1, 1)
+                )
+
+            assert result == os.path.join(target_dir, "test_1.pdf")
+            assert not os.path.exists(source_file)
+            assert sorted(os.listdir(target_dir)) == ["test.pdf", "test_1.pdf"]
+            with open(result) as f:
+                assert f.read() == "new"
+
+    def test_failed_move_leaves_no_empty_file(self):
+        """Should leave nothing under the archive name when the move fails."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_file = os.path.join(tmpdir, "test.pdf")
+            with open(source_file, 'w') as f:
+                f.write("test")
+
+            with patch('sorter.OUTPUT_DIR', tmpdir), \
+                    patch('sorter.os.link', side_effect=OSError(errno.EIO, "I/O error")):
+                result = move_file_to_correct_directory(
+                    source_file, "Invoice", datetime(2024, 1, 1)
+                )
+
+            assert result is None
+            assert os.path.exists(source_file)
+            assert os.listdir(os.path.join(tmpdir, "Invoices", "2024", "Month_1", "Week_1")) == []
+
+    def test_recreates_directory_removed_after_caching(self):
+        """Should recreate a cached directory that was deleted externally."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('sorter.OUTPUT_DIR', tmpdir):
+                test_date = datetime(2024, 2, 1)
+                for attempt in range(3):
+                    source_file = os.path.join(tmpdir, f"test{attempt}.pdf")
+                    with open(source_file, 'w') as f:
+                        f.write("test")
+                    result = move_file_to_correct_directory(
+                        source_file, "Report", test_date
+                    )
+                    if attempt == 0:
+                        shutil.rmtree(os.path.join(tmpdir, "Reports"))
+
+                assert result is not None
+                assert os.path.exists(result)
+
+
+class TestSetupDirectoryStructure:
+    """Tests for setup_directory_structure function."""
+
+    def test_lazy_mode_creates_only_roots(self):
+        """Should only create the input and output roots in lazy mode."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_dir = os.path.join(tmpdir, "in")
+            output_dir = os.path.join(tmpdir, "out")
+            with patch('sorter.INPUT_DIR', input_dir), \
+                    patch('sorter.OUTPUT_DIR', output_dir), \
+                    patch('sorter.LAZY_DIRECTORIES', True):
+                setup_directory_structure()
+
+            assert os.path.isdir(input_dir)
+            assert os.listdir(output_dir) == []
+
+    def test_eager_mode_creates_full_tree(self):
+        """Should pre-create every type/year/month/week folder."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('sorter.INPUT_DIR', os.path.join(tmpdir, "in")), \
+                    patch('sorter.OUTPUT_DIR', tmpdir), \
+                    patch('sorter.LAZY_DIRECTORIES', False):
+                setup_directory_structure()
+
+            assert os.path.isdir(
+                os.path.join(tmpdir, "Reports", "2030", "Month_12", "Week_5")
+            )
 
 
 class TestLabelToDir:
@@ -237,6 +1572,40 @@ class TestLabelToDir:
         assert LABEL_TO_DIR["Report"] == "Reports"
 
 
+class TestReloadLabels:
+    """Tests for reload_labels function."""
+
+    def test_reload_drives_labels_and_directories(self):
+        """Should feed reloaded labels to the classifier and archive."""
+        from labels import LabelRegistry, LabelSpec
+
+        registry = LabelRegistry([LabelSpec("Invoice", "Invoices")])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "labels.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([{"name": "Payslip", "directory": "Payslips"}], f)
+            registry.path = path
+
+            with patch('sorter.LABEL_REGISTRY', registry), \
+                    patch('sorter.LAZY_DIRECTORIES', True), \
+                    patch('sorter.OUTPUT_DIR', tmpdir):
+                assert reload_labels() is True
+
+                source_file = os.path.join(tmpdir, "slip.pdf")
+                with open(source_file, 'w') as f:
+                    f.write("test")
+                result = move_file_to_correct_directory(
+                    source_file, "Payslip", datetime(2024, 3, 1)
+                )
+
+        assert registry.names == ["Payslip"]
+        assert os.sep + "Payslips" + os.sep in result
+
+    def test_no_labels_file(self):
+        """Should do nothing without a labels file."""
+        assert reload_labels() is False
+
+
 class TestCandidateLabels:
     """Tests for candidate labels configuration."""
 
@@ -0,0 +1,121 @@
+"""Tests for the stages module."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stages import Stage, StagedPipeline
+
+
+class TestStage:
+    """Tests for Stage."""
+
+    def test_rejects_non_positive_sizes(self):
+        """Should raise ValueError for zero workers, queue size or batch size."""
+        with pytest.raises(ValueError):
+            Stage("extract", list, workers=0)
+        with pytest.raises(ValueError):
+            Stage("extract", list, queue_size=0)
+        with pytest.raises(ValueError):
+            Stage("extract", list, batch_size=0)
+
+
+class TestStagedPipeline:
+    """Tests for StagedPipeline."""
+
+    def test_items_pass_through_every_stage(self):
+        """Should apply the stages in order and return the last stage's outputs."""
+        pipeline = StagedPipeline([
+            Stage("double", lambda items: [item * 2 for item in items], workers=3),
+            Stage("drop_odd", lambda items: [i for i in items if i % 4 == 0], workers=2),
+            Stage("format", lambda items: [f"#{item}" for item in items]),
+        ])
+
+        results = pipeline.run(range(10))
+
+        assert sorted(results) == sorted(f"#{i * 2}" for i in range(10) if i % 2 == 0)
+        metrics = pipeline.metrics()
+        assert metrics['double']['processed'] == 10
+        assert metrics['drop_odd']['processed'] == 10
+        assert metrics['format']['processed'] == 5
+        assert metrics['double']['workers'] == 3
+
+    def test_batches_queued_items(self):
+        """Should hand queued items to the handler in groups of at most batch_size."""
+        batches = []
+
+        def collect(items):
+            batches.append(list(items))
+            return items
+
+        pipeline = StagedPipeline([
+            Stage("source", lambda items: items, queue_size=10),
+            Stage("batch", collect, queue_size=10, batch_size=3),
+        ])
+        results = pipeline.run(range(7))
+
+        assert sorted(results) == list(range(7))
+        assert all(1 <= len(batch) <= 3 for batch in batches)
+
+    def test_bounded_queue_applies_backpressure(self):
+        """Should never queue more items than queue_size in front of a slow stage."""
+        def slow(items):
+            time.sleep(0.01)
+            return items
+
+        pipeline = StagedPipeline([
+            Stage("fast", lambda items: items, queue_size=2),
+            Stage("slow", slow, queue_size=2),
+        ])
+
+        assert len(pipeline.run(range(20))) == 20
+        for stats in pipeline.metrics().values():
+            assert stats['max_queue_depth'] <= 2
+            assert stats['queue_depth'] == 0
+        assert pipeline.metrics()['slow']['max_queue_depth'] == 2
+
+    def test_handler_errors_are_counted(self):
+        """Should drop a failing batch, count it, and keep processing."""
+        def fragile(items):
+            if 3 in items:
+                raise RuntimeError("boom")
+            return items
+
+        pipeline = StagedPipeline([Stage("fragile", fragile)])
+
+        assert sorted(pipeline.run(range(5))) == [0, 1, 2, 4]
+        assert pipeline.metrics()['fragile']['failed'] == 1
+
+    def test_run_async_awaits_coroutine_handlers(self):
+        """Should run coroutine handlers on the event loop with the same batching."""
+        batches = []
+
+        async def double(items):
+            await asyncio.sleep(0)
+            return [item * 2 for item in items]
+
+        def collect(items):
+            batches.append(list(items))
+            return items
+
+        pipeline = StagedPipeline([
+            Stage("double", double, workers=2, queue_size=2),
+            Stage("collect", collect, batch_size=3),
+        ])
+
+        results = asyncio.run(pipeline.run_async(range(8)))
+
+        assert sorted(results) == [i * 2 for i in range(8)]
+        assert all(1 <= len(batch) <= 3 for batch in batches)
+        assert pipeline.metrics()['double']['processed'] == 8
+        assert pipeline.metrics()['double']['max_queue_depth'] <= 2
+
+    def test_requires_a_stage(self):
+        """Should raise ValueError for an empty pipeline."""
+        with pytest.raises(ValueError):
+            StagedPipeline([])